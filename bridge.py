@@ -11,9 +11,36 @@
 import uvicorn
 import json
 import asyncio
+import logging
+from collections import deque
 from datetime import datetime
-from typing import Dict, List
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple, Union
 import os
+import platform
+import signal
+import socket
+import subprocess
+import time
+
+from core.listeners import read_proc_listeners
+from core.project_rules import DEFAULT_PORT, detect_project
+from core.port_scanner import DEV_SERVER_PORTS, scan_ports
+from core.process_attribution import ServerAttributor
+from core.project_manager import SCAN_RESULT_TTL, default_config_dir, load_saved_projects
+from core.queue_logging import SAMPLED, setup_queue_logging
+from core.server_discovery import ServerDiscovery, ServerEvent, active_discovery
+from core.single_flight import AsyncSingleFlight
+
+# Log records are queued and written by a background thread so stdout
+# (redirected to logs/bridge.log by BridgeController) never blocks the event loop.
+# In a windowed bundle there is no stdout - fall back to the service manager's handlers.
+logger = logging.getLogger(__name__)
+log_stats = setup_queue_logging(
+    logger.name,
+    handlers=[logging.StreamHandler(sys.stdout)] if sys.stdout else None,
+    level=getattr(logging, os.getenv("BRIDGE_LOG_LEVEL", "INFO").upper(), logging.INFO),
+    sample_rate=int(os.getenv("BRIDGE_LOG_SAMPLE_RATE", "100"))
+)
 
 app = FastAPI(title="HighlightAssist Bridge")
 
@@ -33,44 +60,211 @@
 connection_info: Dict[WebSocket, dict] = {}
 
 
+# Same compact encoding Starlette's send_json uses, shared by every frame
+_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+class Frame:
+    """A JSON message encoded once; the same text is sent to every recipient"""
+
+    __slots__ = ("type", "request_id", "text")
+
+    def __init__(self, message: dict):
+        self.type = message.get("type")
+        self.request_id = message.get("requestId")
+        self.text = _encode(message)
+
+
+def envelope(message_type: str, fields: Optional[dict] = None, request_id=None) -> Frame:
+    """Build and encode a standard bridge message: type, fields, requestId, timestamp"""
+    message = {"type": message_type}
+    if fields:
+        message.update(fields)
+    if request_id is not None:
+        message["requestId"] = request_id
+    message["timestamp"] = datetime.now().isoformat()
+    return Frame(message)
+
+
+def as_frame(message: Union[dict, Frame]) -> Frame:
+    return message if isinstance(message, Frame) else Frame(message)
+
+
+# Outbound messages buffered per connection before the slow-consumer policy kicks in
+OUTBOUND_QUEUE_SIZE = int(os.getenv("BRIDGE_OUTBOUND_QUEUE_SIZE", "256"))
+
+# What to do when a client's outbound queue is full:
+#   drop_oldest - discard the oldest queued message
+#   coalesce    - replace a queued message of the same type/requestId, else drop oldest
+#   disconnect  - evict the client
+SLOW_CONSUMER_POLICY = os.getenv("BRIDGE_SLOW_CONSUMER_POLICY", "drop_oldest")
+
+# Seconds a single send may stall before the connection is considered dead
+SEND_TIMEOUT = float(os.getenv("BRIDGE_SEND_TIMEOUT", "5.0"))
+
+
+class ClientConnection:
+    """A connected client with its own bounded outbound queue and writer task.
+
+    Senders only enqueue, so a stalled client never delays anyone else; the
+    writer task drains the queue onto the socket at the client's own pace.
+    """
+
+    def __init__(self, websocket: WebSocket, metadata: dict, on_dead: Callable[[WebSocket], None]):
+        self.websocket = websocket
+        self.metadata = metadata
+        self._on_dead = on_dead
+        self._queue: Deque[Frame] = deque()
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.closed = False
+        self._writer = asyncio.create_task(self._write_loop())
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, frame: Frame) -> bool:
+        """Queue a frame for delivery. Returns False if the client was evicted."""
+        if self.closed:
+            return False
+        
+        if len(self._queue) >= OUTBOUND_QUEUE_SIZE:
+            if SLOW_CONSUMER_POLICY == "disconnect":
+                logger.warning('Slow consumer evicted', extra={'fields': {'queued': len(self._queue)}})
+                self.abort()
+                return False
+            if not (SLOW_CONSUMER_POLICY == "coalesce" and self._coalesce(frame)):
+                self._queue.popleft()
+                self.metadata["messages_dropped"] += 1
+                self._queue.append(frame)
+        else:
+            self._queue.append(frame)
+        
+        self._idle.clear()
+        self._ready.set()
+        return True
+
+    def _coalesce(self, frame: Frame) -> bool:
+        """Replace the newest queued frame with the same type/requestId in place"""
+        for index in range(len(self._queue) - 1, -1, -1):
+            queued = self._queue[index]
+            if queued.type == frame.type and queued.request_id == frame.request_id:
+                self._queue[index] = frame
+                self.metadata["messages_dropped"] += 1
+                return True
+        return False
+
+    async def _write_loop(self):
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                while self._queue:
+                    frame = self._queue.popleft()
+                    await asyncio.wait_for(self.websocket.send_text(frame.text), SEND_TIMEOUT)
+                    self.metadata["messages_sent"] += 1
+                self._idle.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning('Evicting dead connection: %r', e)
+            self.abort()
+
+    async def drain(self, timeout: float = SEND_TIMEOUT):
+        """Wait until everything queued so far has been written"""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def stop(self):
+        """Stop delivering queued messages"""
+        self.closed = True
+        self._queue.clear()
+        self._idle.set()
+        if self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+    def abort(self):
+        """Stop delivering, drop the connection from the manager and close it"""
+        if self.closed:
+            return
+        self.stop()
+        self._on_dead(self.websocket)
+        asyncio.ensure_future(self._close_socket())
+
+    async def _close_socket(self):
+        try:
+            await self.websocket.close()
+        except Exception:
+            pass
+
+
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.clients: Dict[WebSocket, ClientConnection] = {}
         self.connection_metadata: Dict[WebSocket, dict] = {}
 
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.clients)
+
     async def connect(self, websocket: WebSocket, client_info: dict = None):
         await websocket.accept()
-        self.active_connections.append(websocket)
-        self.connection_metadata[websocket] = {
+        metadata = {
             "connected_at": datetime.now().isoformat(),
             "client_info": client_info or {},
             "messages_sent": 0,
-            "messages_received": 0
+            "messages_received": 0,
+            "messages_dropped": 0
         }
-        print(f"✅ WebSocket connected. Total connections: {len(self.active_connections)}")
+        self.connection_metadata[websocket] = metadata
+        self.clients[websocket] = ClientConnection(websocket, metadata, self.disconnect)
+        logger.info('WebSocket connected', extra={'fields': {'connections': len(self.clients)}})
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        if websocket in self.connection_metadata:
-            metadata = self.connection_metadata.pop(websocket)
-            print(f"👋 WebSocket disconnected. Messages: {metadata['messages_received']} in, {metadata['messages_sent']} out")
-        print(f"📊 Active connections: {len(self.active_connections)}")
-
-    async def send_personal_message(self, message: dict, websocket: WebSocket):
-        if websocket in self.connection_metadata:
-            self.connection_metadata[websocket]["messages_sent"] += 1
-        await websocket.send_json(message)
-
-    async def broadcast(self, message: dict):
-        """Send message to all connected clients"""
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-                if connection in self.connection_metadata:
-                    self.connection_metadata[connection]["messages_sent"] += 1
-            except Exception as e:
-                print(f"❌ Error broadcasting to connection: {e}")
+        client = self.clients.pop(websocket, None)
+        if client is None:
+            return
+        client.stop()
+        metadata = self.connection_metadata.pop(websocket, None) or {}
+        logger.info('WebSocket disconnected', extra={'fields': {
+            'messages_in': metadata.get('messages_received', 0),
+            'messages_out': metadata.get('messages_sent', 0),
+            'messages_dropped': metadata.get('messages_dropped', 0),
+            'connections': len(self.clients)
+        }})
+
+    async def send_personal_message(self, message: Union[dict, Frame], websocket: WebSocket):
+        client = self.clients.get(websocket)
+        if client:
+            client.enqueue(as_frame(message))
+
+    async def broadcast(self, message: Union[dict, Frame]):
+        """Send message to all connected clients.
+
+        The message is encoded once and the same frame is queued for every
+        client; each client's writer delivers concurrently, so latency tracks
+        the slowest healthy client.
+        """
+        frame = as_frame(message)
+        for client in list(self.clients.values()):
+            client.enqueue(frame)
+
+    async def close(self, websocket: WebSocket):
+        """Flush pending messages to a client, then close its socket"""
+        client = self.clients.get(websocket)
+        if client:
+            await client.drain()
+            client.abort()
+
+    async def close_all(self):
+        clients = list(self.clients.values())
+        await asyncio.gather(*(client.drain() for client in clients))
+        for client in clients:
+            client.abort()
 
 
 manager = ConnectionManager()
@@ -119,142 +313,425 @@ async def stats():
     """Get statistics about active connections"""
     try:
         connections = []
-        for ws, metadata in manager.connection_metadata.items():
+        for ws, client in manager.clients.items():
+            metadata = client.metadata
             connections.append({
                 "connected_at": metadata["connected_at"],
                 "messages_sent": metadata["messages_sent"],
                 "messages_received": metadata["messages_received"],
+                "messages_dropped": metadata["messages_dropped"],
+                "queued": client.queued,
                 "client_info": metadata.get("client_info", {})
             })
         
         return {
             "total_connections": len(manager.active_connections),
-            "connections": connections
+            "connections": connections,
+            "logging": log_stats.snapshot()
         }
     except Exception as e:
         return {"error": str(e)}
 
 
+# Concurrent /scan-servers requests share one scan
+_scan_flight = AsyncSingleFlight()
+
+
+async def _scan_running_servers() -> Tuple[List[int], List[dict]]:
+    """(ports checked, servers found) - the same ports the server events watch"""
+    watched = sorted(_watched_ports())
+    
+    # On Linux only ports with a LISTEN socket need probing
+    ports = watched
+    listeners = read_proc_listeners()
+    if listeners is not None:
+        listening = {listener.port for listener in listeners}
+        ports = [port for port in watched if port in listening]
+    
+    # All ports are probed concurrently on the event loop within one deadline
+    return watched, await scan_ports(ports)
+
+
 @app.get("/scan-servers")
 async def scan_servers():
     """Scan for running localhost development servers"""
-    import socket
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    
-    # Common dev server ports
-    ports_to_scan = [
-        3000, 3001, 3002,  # React, Node, Next.js
-        4200, 4201,         # Angular
-        5000, 5001,         # Flask, Python
-        5173, 5174, 5175,   # Vite
-        8000, 8001, 8080, 8081, 8888,  # Django, general web
-        9000, 9001          # PHP, other
-    ]
-    
-    running_servers = []
-    
-    def check_port(port):
-        """Check if a port is listening"""
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(0.5)
-                result = sock.connect_ex(('127.0.0.1', port))
-                if result == 0:
-                    # Port is open, try to identify server type
-                    try:
-                        import urllib.request
-                        
-                        req = urllib.request.Request(f'http://localhost:{port}')
-                        req.add_header('User-Agent', 'HighlightAssist/2.0')
-                        
-                        with urllib.request.urlopen(req, timeout=1.0) as response:
-                            content = response.read().decode('utf-8', errors='ignore')[:2000]
-                            
-                            # Detect framework from headers
-                            server_header = response.headers.get('server', '').lower()
-                            content_type = response.headers.get('content-type', '').lower()
-                            
-                            framework = 'Unknown'
-                            if 'vite' in server_header or 'vite' in content.lower():
-                                framework = 'Vite'
-                            elif 'webpack' in server_header or 'webpack' in content.lower():
-                                framework = 'Webpack Dev Server'
-                            elif port in [3000, 3001, 3002]:
-                                if 'react' in content.lower():
-                                    framework = 'React'
-                                else:
-                                    framework = 'Node.js'
-                            elif port in [4200, 4201]:
-                                framework = 'Angular'
-                            elif port in [5000, 5001]:
-                                framework = 'Flask/Python'
-                            elif port in [8000, 8001]:
-                                if 'django' in content.lower():
-                                    framework = 'Django'
-                                else:
-                                    framework = 'Python Server'
-                            elif 'html' in content_type:
-                                framework = 'Web Server'
-                            
-                            return {
-                                'port': port,
-                                'status': 'running',
-                                'framework': framework,
-                                'url': f'http://localhost:{port}',
-                                'title': f'{framework} - Port {port}'
-                            }
-                    except Exception as e:
-                        # Server running but couldn't get details
-                        return {
-                            'port': port,
-                            'status': 'running',
-                            'framework': 'Unknown',
-                            'url': f'http://localhost:{port}',
-                            'title': f'Server - Port {port}'
-                        }
-        except:
-            pass
-        return None
-    
-    # Scan ports in parallel
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = {executor.submit(check_port, port): port for port in ports_to_scan}
-        for future in as_completed(futures):
-            result = future.result()
-            if result:
-                running_servers.append(result)
+    # Running inside the service manager: share its discovery (coalesced refresh)
+    discovery = active_discovery()
+    if discovery is not None:
+        snapshot = await _scan_flight.do(
+            'discovery', lambda: asyncio.to_thread(discovery.refresh, SCAN_RESULT_TTL), SCAN_RESULT_TTL
+        )
+        return {
+            'servers': [server.to_dict() for server in snapshot.servers],
+            'total': len(snapshot.servers),
+            'scanned_ports': len(snapshot.watched_ports),
+            'timestamp': datetime.now().isoformat()
+        }
     
-    # Sort by port number
-    running_servers.sort(key=lambda x: x['port'])
+    # Standalone bridge: probe and fingerprint the ports directly
+    watched, running_servers = await _scan_flight.do('ports', _scan_running_servers, SCAN_RESULT_TTL)
     
     return {
         'servers': running_servers,
         'total': len(running_servers),
-        'scanned_ports': len(ports_to_scan),
+        'scanned_ports': len(watched),
         'timestamp': datetime.now().isoformat()
     }
 
 
+# Maximum number of messages processed concurrently for a single connection.
+# Further messages wait in the socket until a slot frees up (backpressure).
+MAX_IN_FLIGHT = int(os.getenv("BRIDGE_MAX_IN_FLIGHT", "8"))
+
+MessageHandler = Callable[[WebSocket, dict], Awaitable[None]]
+
+# Registry of WebSocket message handlers keyed by message "type"
+message_handlers: Dict[str, MessageHandler] = {}
+
+
+def message_handler(message_type: str):
+    """Register a coroutine as the handler for a WebSocket message type"""
+    def decorator(func: MessageHandler) -> MessageHandler:
+        message_handlers[message_type] = func
+        return func
+    return decorator
+
+
+async def reply(websocket: WebSocket, request: dict, message_type: str, fields: Optional[dict] = None):
+    """Send a response to the sender of ``request``.
+
+    Each message is handled in its own task, so responses can arrive out of
+    order. The request's ``requestId`` is echoed back so clients can match them.
+    """
+    frame = envelope(message_type, fields, request_id=request.get("requestId"))
+    await manager.send_personal_message(frame, websocket)
+
+
+@message_handler("ai_request")
+async def handle_ai_request(websocket: WebSocket, data: dict):
+    """Log AI requests with full details for AI monitoring"""
+    context = data.get('context') or {}
+    fields = {
+        'command': data.get('command', 'No command'),
+        'tag': context.get('tag', 'N/A'),
+        'classes': context.get('classes', 'N/A'),
+        'id': context.get('id', 'N/A'),
+        'text': (context.get('text') or 'N/A')[:100],  # First 100 chars
+        'sent_at': data.get('timestamp', 'N/A')
+    }
+    if context.get('attributes'):
+        fields['attributes'] = context.get('attributes')
+    logger.info('AI request', extra={'fields': fields})
+
+
+@message_handler("ping")
+async def handle_ping(websocket: WebSocket, data: dict):
+    await reply(websocket, data, "pong")
+
+
+@message_handler("element_analysis")
+async def handle_element_analysis(websocket: WebSocket, data: dict):
+    """Element analysis request from extension"""
+    logger.debug('Element analysis', extra={'fields': {'selector': data.get('selector', 'unknown')}})
+    
+    # Echo back for now (future: forward to AI service)
+    await reply(websocket, data, "analysis_received", {
+        "status": "ok",
+        "message": "Analysis received, processing..."
+    })
+    
+    # Simulate AI processing (replace with actual AI integration)
+    await asyncio.sleep(0.5)
+    
+    # Send enhanced analysis back
+    await reply(websocket, data, "analysis_complete", {
+        "enhancedAnalysis": {
+            "aiSuggestions": [
+                "Consider using semantic HTML5 elements",
+                "Add ARIA labels for better screen reader support"
+            ],
+            "codeExamples": [
+                "<!-- Use <nav> instead of <div class='navigation'> -->"
+            ]
+        }
+    })
+
+
+@message_handler("get_instances")
+async def handle_get_instances(websocket: WebSocket, data: dict):
+    """Request for available dev server instances"""
+    instances = []
+    ports_file = os.path.join(os.path.dirname(__file__), '.highlight-ports.json')
+    
+    if os.path.exists(ports_file):
+        with open(ports_file, 'r') as f:
+            config = json.load(f)
+            instances = config.get('instances', [])
+    
+    await reply(websocket, data, "instances", {
+        "instances": instances
+    })
+
+
+@message_handler("execute_command")
+async def handle_execute_command(websocket: WebSocket, data: dict):
+    """Execute command in specified directory"""
+    command_data = data.get('data', {})
+    command = command_data.get('command', '')
+    cwd = command_data.get('cwd', '')
+    port = command_data.get('port', 3000)
+    
+    logger.info('Command execution requested', extra={'fields': {'command': command, 'cwd': cwd, 'port': port}})
+    
+    try:
+        is_windows = platform.system() == 'Windows'
+        
+        if is_windows:
+            # Windows: Start detached process without visible window
+            # Use CREATE_NEW_CONSOLE + DETACHED_PROCESS flags
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startupinfo.wShowWindow = subprocess.SW_HIDE
+            
+            # Start detached process (no command window)
+            process = subprocess.Popen(
+                command,
+                cwd=cwd,
+                shell=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.PIPE,
+                startupinfo=startupinfo,
+                creationflags=subprocess.CREATE_NEW_CONSOLE | subprocess.DETACHED_PROCESS,
+                text=True
+            )
+        else:
+            # Linux/macOS: Use nohup for detached background process
+            process = subprocess.Popen(
+                command,
+                cwd=cwd,
+                shell=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.PIPE,
+                preexec_fn=os.setpgrp if hasattr(os, 'setpgrp') else None,
+                text=True
+            )
+        
+        logger.info('Background process started (no command window)', extra={'fields': {'pid': process.pid}})
+        
+        await reply(websocket, data, "command_started", {
+            "pid": process.pid,
+            "port": port,
+            "message": "Server started in background (no command window)"
+        })
+        
+    except Exception as e:
+        logger.error('Command execution failed: %s', e)
+        await reply(websocket, data, "command_error", {
+            "error": str(e)
+        })
+
+
+def _kill_process(pid: int):
+    """Stop a process tree (blocking - run in a worker thread)"""
+    if platform.system() == 'Windows':
+        # Windows: Use taskkill to stop process tree
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], 
+                     capture_output=True, 
+                     check=False)
+        logger.info('Process %s stopped (Windows taskkill)', pid)
+    else:
+        # Linux/macOS: Send SIGTERM then SIGKILL
+        try:
+            os.kill(pid, signal.SIGTERM)
+            # Wait briefly, then force kill if needed
+            time.sleep(0.5)
+            os.kill(pid, signal.SIGKILL)
+            logger.info('Process %s stopped (Unix kill)', pid)
+        except ProcessLookupError:
+            logger.warning('Process %s already terminated', pid)
+
+
+@message_handler("stop_server")
+async def handle_stop_server(websocket: WebSocket, data: dict):
+    """Stop a running server process"""
+    stop_data = data.get('data', {})
+    pid = stop_data.get('pid')
+    port = stop_data.get('port')
+    
+    logger.info('Stop server requested', extra={'fields': {'pid': pid, 'port': port}})
+    
+    try:
+        await asyncio.to_thread(_kill_process, pid)
+        
+        await reply(websocket, data, "server_stopped", {
+            "pid": pid,
+            "port": port,
+            "success": True
+        })
+        
+    except Exception as e:
+        logger.error('Failed to stop server: %s', e)
+        await reply(websocket, data, "server_stopped", {
+            "pid": pid,
+            "port": port,
+            "success": False,
+            "error": str(e)
+        })
+
+
+@message_handler("shutdown")
+async def handle_shutdown(websocket: WebSocket, data: dict):
+    """Shutdown request from extension (bridge only)"""
+    logger.warning('Bridge shutdown requested via WebSocket')
+    
+    await reply(websocket, data, "shutdown_ack", {
+        "message": "Bridge shutting down"
+    })
+    
+    # Flush pending replies, close all connections and exit
+    await manager.close_all()
+    
+    # Exit the bridge process
+    sys.exit(0)
+
+
+def _request_service_manager_shutdown() -> str:
+    """Send shutdown command to service manager via TCP (blocking)"""
+    # Connect to service manager TCP control port
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(2)
+    try:
+        sock.connect(('localhost', 5054))
+        
+        # Send shutdown command
+        command = json.dumps({'action': 'shutdown'}) + '\n'
+        sock.sendall(command.encode('utf-8'))
+        
+        # Receive response
+        return sock.recv(1024).decode('utf-8')
+    finally:
+        sock.close()
+
+
+@message_handler("shutdown_service_manager")
+async def handle_shutdown_service_manager(websocket: WebSocket, data: dict):
+    """Shutdown the entire service manager (not just bridge)"""
+    logger.warning('Service manager shutdown requested via WebSocket')
+    
+    await reply(websocket, data, "shutdown_ack", {
+        "message": "Service manager shutting down"
+    })
+    
+    try:
+        response = await asyncio.to_thread(_request_service_manager_shutdown)
+        # The service manager will stop both itself and the bridge
+        logger.info('Shutdown command sent to service manager', extra={'fields': {'response': response}})
+        
+    except Exception as e:
+        logger.error('Failed to shutdown service manager: %s', e)
+        # If TCP fails, just exit the bridge
+        sys.exit(0)
+
+
+def _detect_project(project_path: str) -> dict:
+    """Detect project type, start command and port from folder contents (blocking)"""
+    # One directory listing evaluated against the shared rule table
+    detection = detect_project(project_path)
+    
+    if detection.manifest.error:
+        raise ValueError(f'Invalid package.json: {detection.manifest.error}')
+    
+    return {
+        "projectType": detection.project_type,
+        "command": detection.command,
+        "port": detection.dev_port or DEFAULT_PORT,
+        "venv": detection.venv
+    }
+
+
+@message_handler("auto_detect_project")
+async def handle_auto_detect_project(websocket: WebSocket, data: dict):
+    """Auto-detect project type from folder path"""
+    detect_data = data.get('data', {})
+    project_path = detect_data.get('path', '')
+    
+    logger.debug('Auto-detect project', extra={'fields': {'path': project_path}})
+    
+    try:
+        # Filesystem probing runs off the event loop
+        detected = await asyncio.to_thread(_detect_project, project_path)
+        
+        logger.info('Project detected', extra={'fields': {'path': project_path, **detected}})
+        
+        await reply(websocket, data, "project_detected", {
+            "data": detected
+        })
+        
+    except Exception as e:
+        logger.error('Auto-detect failed: %s', e)
+        await reply(websocket, data, "error", {
+            "message": f"Failed to detect project type: {str(e)}"
+        })
+
+
+@message_handler("broadcast")
+async def handle_broadcast(websocket: WebSocket, data: dict):
+    """Broadcast to all connected clients"""
+    await manager.broadcast(envelope("broadcast_message", {"data": data.get("data"), "from": "bridge"}))
+
+
+async def handle_unknown(websocket: WebSocket, data: dict):
+    await reply(websocket, data, "error", {
+        "message": f"Unknown message type: {data.get('type', 'unknown')}"
+    })
+
+
+async def dispatch_message(websocket: WebSocket, data: dict, slots: asyncio.Semaphore):
+    """Run the registered handler for one message, then release its in-flight slot"""
+    try:
+        handler = message_handlers.get(data.get("type", "unknown"), handle_unknown)
+        await handler(websocket, data)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.exception('Error handling %s message', data.get('type', 'unknown'))
+        try:
+            await reply(websocket, data, "error", {
+                "message": f"Failed to handle {data.get('type', 'unknown')}: {str(e)}"
+            })
+        except:
+            pass
+    finally:
+        slots.release()
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """Main WebSocket endpoint for browser extension with comprehensive error handling"""
+    """Main WebSocket endpoint for browser extension with comprehensive error handling.
+
+    Messages are dispatched to ``message_handlers`` as independent tasks so a
+    slow handler never delays later messages (up to MAX_IN_FLIGHT at once).
+    """
     try:
         await manager.connect(websocket)
     except Exception as e:
-        print(f"❌ Error connecting WebSocket: {e}")
+        logger.error('Error connecting WebSocket: %s', e)
         return
     
+    slots = asyncio.Semaphore(MAX_IN_FLIGHT)
+    in_flight: Set[asyncio.Task] = set()
+    
     try:
         # Send welcome message
         try:
-            await manager.send_personal_message({
-                "type": "connection",
+            await manager.send_personal_message(envelope("connection", {
                 "status": "connected",
-                "message": "Connected to HighlightAssist Bridge",
-                "timestamp": datetime.now().isoformat()
-            }, websocket)
+                "message": "Connected to HighlightAssist Bridge"
+            }), websocket)
         except Exception as e:
-            print(f"⚠️  Error sending welcome message: {e}")
+            logger.warning('Error sending welcome message: %s', e)
         
         while True:
             try:
@@ -264,14 +741,14 @@ async def websocket_endpoint(websocket: WebSocket):
                 if websocket in manager.connection_metadata:
                     manager.connection_metadata[websocket]["messages_received"] += 1
                 
-                message_type = data.get("type", "unknown")
-                print(f"📨 Received message: {message_type}")
+                # Per-message noise: sampled at INFO, complete at DEBUG
+                logger.info('Received message', extra={**SAMPLED, 'fields': {'type': data.get("type", "unknown")}})
                 
             except WebSocketDisconnect:
-                print("👋 WebSocket disconnected normally")
+                logger.debug('WebSocket disconnected normally')
                 break
             except json.JSONDecodeError as e:
-                print(f"⚠️  Invalid JSON received: {e}")
+                logger.warning('Invalid JSON received: %s', e)
                 try:
                     await manager.send_personal_message({
                         "type": "error",
@@ -282,392 +759,90 @@ async def websocket_endpoint(websocket: WebSocket):
                     pass
                 continue
             except Exception as e:
-                print(f"❌ Error receiving message: {e}")
+                logger.error('Error receiving message: %s', e)
                 break
             
-            # Log AI requests with full details for AI monitoring
-            if message_type == "ai_request":
-                print(f"🤖 AI Command: {data.get('command', 'No command')}")
-                print(f"📋 Element Context:")
-                context = data.get('context', {})
-                if context:
-                    print(f"   Tag: {context.get('tag', 'N/A')}")
-                    print(f"   Classes: {context.get('classes', 'N/A')}")
-                    print(f"   ID: {context.get('id', 'N/A')}")
-                    print(f"   Text: {context.get('text', 'N/A')[:100]}...")  # First 100 chars
-                    if context.get('attributes'):
-                        print(f"   Attributes: {context.get('attributes')}")
-                print(f"⏰ Timestamp: {data.get('timestamp', 'N/A')}")
-                print("-" * 60)
-            
-            # Process different message types
-            if message_type == "ping":
-                await manager.send_personal_message({
-                    "type": "pong",
-                    "timestamp": datetime.now().isoformat()
-                }, websocket)
-            
-            elif message_type == "element_analysis":
-                # Element analysis request from extension
-                print(f"🔍 Element analysis: {data.get('selector', 'unknown')}")
-                
-                # Echo back for now (future: forward to AI service)
-                await manager.send_personal_message({
-                    "type": "analysis_received",
-                    "status": "ok",
-                    "message": "Analysis received, processing...",
-                    "requestId": data.get("requestId"),
-                    "timestamp": datetime.now().isoformat()
-                }, websocket)
-                
-                # Simulate AI processing (replace with actual AI integration)
-                await asyncio.sleep(0.5)
-                
-                # Send enhanced analysis back
-                await manager.send_personal_message({
-                    "type": "analysis_complete",
-                    "requestId": data.get("requestId"),
-                    "enhancedAnalysis": {
-                        "aiSuggestions": [
-                            "Consider using semantic HTML5 elements",
-                            "Add ARIA labels for better screen reader support"
-                        ],
-                        "codeExamples": [
-                            "<!-- Use <nav> instead of <div class='navigation'> -->"
-                        ]
-                    },
-                    "timestamp": datetime.now().isoformat()
-                }, websocket)
-            
-            elif message_type == "get_instances":
-                # Request for available dev server instances
-                instances = []
-                ports_file = os.path.join(os.path.dirname(__file__), '.highlight-ports.json')
-                
-                if os.path.exists(ports_file):
-                    with open(ports_file, 'r') as f:
-                        config = json.load(f)
-                        instances = config.get('instances', [])
-                
-                await manager.send_personal_message({
-                    "type": "instances",
-                    "instances": instances,
-                    "timestamp": datetime.now().isoformat()
-                }, websocket)
-            
-            elif message_type == "execute_command":
-                # Execute command in specified directory
-                print(f"🚀 Command execution request received")
-                command_data = data.get('data', {})
-                command = command_data.get('command', '')
-                cwd = command_data.get('cwd', '')
-                port = command_data.get('port', 3000)
-                
-                print(f"   Command: {command}")
-                print(f"   Working Directory: {cwd}")
-                print(f"   Expected Port: {port}")
-                
-                try:
-                    import subprocess
-                    import platform
-                    
-                    is_windows = platform.system() == 'Windows'
-                    
-                    if is_windows:
-                        # Windows: Start detached process without visible window
-                        # Use CREATE_NEW_CONSOLE + DETACHED_PROCESS flags
-                        startupinfo = subprocess.STARTUPINFO()
-                        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                        startupinfo.wShowWindow = subprocess.SW_HIDE
-                        
-                        # Start detached process (no command window)
-                        process = subprocess.Popen(
-                            command,
-                            cwd=cwd,
-                            shell=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            stdin=subprocess.PIPE,
-                            startupinfo=startupinfo,
-                            creationflags=subprocess.CREATE_NEW_CONSOLE | subprocess.DETACHED_PROCESS,
-                            text=True
-                        )
-                    else:
-                        # Linux/macOS: Use nohup for detached background process
-                        process = subprocess.Popen(
-                            command,
-                            cwd=cwd,
-                            shell=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            stdin=subprocess.PIPE,
-                            preexec_fn=os.setpgrp if hasattr(os, 'setpgrp') else None,
-                            text=True
-                        )
-                    
-                    print(f"✅ Background process started with PID: {process.pid}")
-                    print(f"   No command window will appear - runs silently in background")
-                    
-                    await manager.send_personal_message({
-                        "type": "command_started",
-                        "pid": process.pid,
-                        "port": port,
-                        "message": "Server started in background (no command window)",
-                        "timestamp": datetime.now().isoformat()
-                    }, websocket)
-                    
-                except Exception as e:
-                    print(f"❌ Command execution failed: {e}")
-                    await manager.send_personal_message({
-                        "type": "command_error",
-                        "error": str(e),
-                        "timestamp": datetime.now().isoformat()
-                    }, websocket)
-            
-            elif message_type == "stop_server":
-                # Stop a running server process
-                print(f"🛑 Stop server request received")
-                stop_data = data.get('data', {})
-                pid = stop_data.get('pid')
-                port = stop_data.get('port')
-                
-                print(f"   PID: {pid}")
-                print(f"   Port: {port}")
-                
-                try:
-                    import subprocess
-                    import platform
-                    import signal
-                    
-                    is_windows = platform.system() == 'Windows'
-                    
-                    if is_windows:
-                        # Windows: Use taskkill to stop process tree
-                        subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], 
-                                     capture_output=True, 
-                                     check=False)
-                        print(f"✅ Process {pid} stopped (Windows taskkill)")
-                    else:
-                        # Linux/macOS: Send SIGTERM then SIGKILL
-                        try:
-                            os.kill(pid, signal.SIGTERM)
-                            # Wait briefly, then force kill if needed
-                            import time
-                            time.sleep(0.5)
-                            os.kill(pid, signal.SIGKILL)
-                            print(f"✅ Process {pid} stopped (Unix kill)")
-                        except ProcessLookupError:
-                            print(f"⚠️ Process {pid} already terminated")
-                    
-                    await manager.send_personal_message({
-                        "type": "server_stopped",
-                        "pid": pid,
-                        "port": port,
-                        "success": True,
-                        "timestamp": datetime.now().isoformat()
-                    }, websocket)
-                    
-                except Exception as e:
-                    print(f"❌ Failed to stop server: {e}")
-                    await manager.send_personal_message({
-                        "type": "server_stopped",
-                        "pid": pid,
-                        "port": port,
-                        "success": False,
-                        "error": str(e),
-                        "timestamp": datetime.now().isoformat()
-                    }, websocket)
-            
-            elif message_type == "shutdown":
-                # Shutdown request from extension (bridge only)
-                print("🛑 Bridge shutdown requested via WebSocket")
-                
-                await manager.send_personal_message({
-                    "type": "shutdown_ack",
-                    "message": "Bridge shutting down",
-                    "timestamp": datetime.now().isoformat()
-                }, websocket)
-                
-                # Close all connections and exit
-                for connection in manager.active_connections.copy():
-                    try:
-                        await connection.close()
-                    except:
-                        pass
-                
-                # Exit the bridge process
-                import sys
-                sys.exit(0)
-            
-            elif message_type == "shutdown_service_manager":
-                # Shutdown the entire service manager (not just bridge)
-                print("🛑 Service manager shutdown requested via WebSocket")
-                
-                await manager.send_personal_message({
-                    "type": "shutdown_ack",
-                    "message": "Service manager shutting down",
-                    "timestamp": datetime.now().isoformat()
-                }, websocket)
-                
-                # Send shutdown command to service manager via TCP
-                try:
-                    import socket
-                    import json
-                    
-                    # Connect to service manager TCP control port
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(2)
-                    sock.connect(('localhost', 5054))
-                    
-                    # Send shutdown command
-                    command = json.dumps({'action': 'shutdown'}) + '\n'
-                    sock.sendall(command.encode('utf-8'))
-                    
-                    # Receive response
-                    response = sock.recv(1024).decode('utf-8')
-                    print(f"Service manager response: {response}")
-                    
-                    sock.close()
-                    
-                    # The service manager will stop both itself and the bridge
-                    print("✅ Shutdown command sent to service manager")
-                    
-                except Exception as e:
-                    print(f"❌ Failed to shutdown service manager: {e}")
-                    # If TCP fails, just exit the bridge
-                    import sys
-                    sys.exit(0)
-            
-            elif message_type == "auto_detect_project":
-                # Auto-detect project type from folder path
-                print(f"🔍 Auto-detect project request received")
-                detect_data = data.get('data', {})
-                project_path = detect_data.get('path', '')
-                
-                print(f"   Scanning: {project_path}")
-                
-                try:
-                    import os
-                    import json
-                    
-                    detected_type = "Unknown"
-                    detected_command = "npm run dev"
-                    detected_port = 3000
-                    detected_venv = None
-                    
-                    # Check for package.json (Node.js project)
-                    package_json = os.path.join(project_path, 'package.json')
-                    if os.path.exists(package_json):
-                        with open(package_json, 'r') as f:
-                            pkg = json.load(f)
-                            scripts = pkg.get('scripts', {})
-                            
-                            if 'dev' in scripts:
-                                detected_command = 'npm run dev'
-                                detected_type = 'Node.js (npm)'
-                                # Detect Vite (port 5173)
-                                if 'vite' in scripts.get('dev', '').lower():
-                                    detected_port = 5173
-                                    detected_type = 'Vite'
-                            elif 'start' in scripts:
-                                detected_command = 'npm start'
-                                detected_type = 'Node.js (npm)'
-                            
-                            # Check if using yarn/pnpm
-                            if os.path.exists(os.path.join(project_path, 'yarn.lock')):
-                                detected_command = detected_command.replace('npm', 'yarn')
-                                detected_type = detected_type.replace('npm', 'yarn')
-                            elif os.path.exists(os.path.join(project_path, 'pnpm-lock.yaml')):
-                                detected_command = detected_command.replace('npm', 'pnpm')
-                                detected_type = detected_type.replace('npm', 'pnpm')
-                    
-                    # Check for Python virtual environment
-                    venv_paths = ['.venv', 'venv', 'env']
-                    for venv_name in venv_paths:
-                        venv_path = os.path.join(project_path, venv_name)
-                        if os.path.isdir(venv_path):
-                            detected_venv = venv_name
-                            break
-                    
-                    # Check for Python project files
-                    if os.path.exists(os.path.join(project_path, 'manage.py')):
-                        # Django project
-                        detected_type = 'Django'
-                        if detected_venv:
-                            if platform.system() == 'Windows':
-                                detected_command = f'{detected_venv}\\Scripts\\python.exe manage.py runserver'
-                            else:
-                                detected_command = f'{detected_venv}/bin/python manage.py runserver'
-                        else:
-                            detected_command = 'python manage.py runserver'
-                        detected_port = 8000
-                    
-                    elif os.path.exists(os.path.join(project_path, 'app.py')) or \
-                         os.path.exists(os.path.join(project_path, 'main.py')):
-                        # Flask/FastAPI project
-                        detected_type = 'Python (Flask/FastAPI)'
-                        main_file = 'app.py' if os.path.exists(os.path.join(project_path, 'app.py')) else 'main.py'
-                        
-                        if detected_venv:
-                            if platform.system() == 'Windows':
-                                detected_command = f'{detected_venv}\\Scripts\\python.exe {main_file}'
-                            else:
-                                detected_command = f'{detected_venv}/bin/python {main_file}'
-                        else:
-                            detected_command = f'python {main_file}'
-                        detected_port = 5000
-                    
-                    print(f"✅ Detected: {detected_type}")
-                    print(f"   Command: {detected_command}")
-                    print(f"   Port: {detected_port}")
-                    if detected_venv:
-                        print(f"   Virtual Env: {detected_venv}")
-                    
-                    await manager.send_personal_message({
-                        "type": "project_detected",
-                        "data": {
-                            "projectType": detected_type,
-                            "command": detected_command,
-                            "port": detected_port,
-                            "venv": detected_venv
-                        },
-                        "timestamp": datetime.now().isoformat()
-                    }, websocket)
-                    
-                except Exception as e:
-                    print(f"❌ Auto-detect failed: {e}")
-                    await manager.send_personal_message({
-                        "type": "error",
-                        "message": f"Failed to detect project type: {str(e)}",
-                        "timestamp": datetime.now().isoformat()
-                    }, websocket)
-            
-            elif message_type == "broadcast":
-                # Broadcast to all connected clients
-                await manager.broadcast({
-                    "type": "broadcast_message",
-                    "data": data.get("data"),
-                    "from": "bridge",
-                    "timestamp": datetime.now().isoformat()
-                })
-            
-            else:
-                # Unknown message type
-                await manager.send_personal_message({
-                    "type": "error",
-                    "message": f"Unknown message type: {message_type}",
-                    "timestamp": datetime.now().isoformat()
-                }, websocket)
+            # Wait for a free slot, then process the message concurrently
+            await slots.acquire()
+            task = asyncio.create_task(dispatch_message(websocket, data, slots))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
     
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
-        print("🔌 Client disconnected normally")
+        logger.debug('Client disconnected normally')
     
     except Exception as e:
-        print(f"❌ WebSocket error: {e}")
+        logger.error('WebSocket error: %s', e)
+    
+    finally:
+        # Nobody is left to receive replies for unfinished messages
+        for task in in_flight:
+            task.cancel()
         manager.disconnect(websocket)
 
 
+# Dev server up/down events are forwarded to every connected client. Inside
+# the service manager we subscribe to its discovery; a standalone bridge runs
+# its own watcher over the saved projects. That watcher only feeds events and
+# isn't shared, so /scan-servers keeps fingerprinting ports itself.
+_owned_discovery: Optional[ServerDiscovery] = None
+_unsubscribe_server_events: Optional[Callable[[], None]] = None
+_saved_projects_cache = (None, [])
+
+
+def _saved_projects() -> List[dict]:
+    """Saved projects, re-read only when projects.json changes"""
+    global _saved_projects_cache
+    projects_file = default_config_dir() / 'projects.json'
+    try:
+        mtime = projects_file.stat().st_mtime_ns
+    except OSError:
+        return []
+    if mtime != _saved_projects_cache[0]:
+        _saved_projects_cache = (mtime, load_saved_projects(projects_file))
+    return _saved_projects_cache[1]
+
+
+def _watched_ports() -> Set[int]:
+    ports = set(DEV_SERVER_PORTS)
+    ports.update(p['dev_port'] for p in _saved_projects() if isinstance(p.get('dev_port'), int))
+    return ports
+
+
+@app.on_event("startup")
+async def start_server_events():
+    global _owned_discovery, _unsubscribe_server_events
+    loop = asyncio.get_running_loop()
+    
+    discovery = active_discovery()
+    if discovery is None:
+        attributor = ServerAttributor()
+        discovery = _owned_discovery = ServerDiscovery(
+            lambda ports: attributor.running_servers(ports, _saved_projects()),
+            _watched_ports,
+            lambda: 60
+        )
+        discovery.start(share=False)
+    
+    def forward(event: ServerEvent):
+        # Called on the discovery thread: encode there, enqueue on the loop
+        frame = envelope(event.kind, event.server.to_dict())
+        asyncio.run_coroutine_threadsafe(manager.broadcast(frame), loop)
+    
+    _unsubscribe_server_events = discovery.subscribe(forward)
+
+
+@app.on_event("shutdown")
+async def stop_server_events():
+    global _owned_discovery, _unsubscribe_server_events
+    if _unsubscribe_server_events:
+        _unsubscribe_server_events()
+        _unsubscribe_server_events = None
+    if _owned_discovery:
+        await asyncio.to_thread(_owned_discovery.stop)
+        _owned_discovery = None
+
+
 @app.post("/shutdown")
 async def shutdown(token: str = None):
     """Graceful shutdown endpoint"""
@@ -676,19 +851,11 @@ async def shutdown(token: str = None):
     if token != expected_token:
         return {"status": "error", "message": "Invalid token"}
     
-    print("🛑 Shutdown requested, closing all connections...")
+    logger.warning('Shutdown requested, closing all connections...')
     
-    # Close all WebSocket connections
-    for connection in manager.active_connections.copy():
-        try:
-            await manager.send_personal_message({
-                "type": "server_shutdown",
-                "message": "Server is shutting down",
-                "timestamp": datetime.now().isoformat()
-            }, connection)
-            await connection.close()
-        except Exception as e:
-            print(f"Error closing connection: {e}")
+    # Notify every client, flush their queues, then close all WebSocket connections
+    await manager.broadcast(envelope("server_shutdown", {"message": "Server is shutting down"}))
+    await manager.close_all()
     
     return {"status": "ok", "message": "Shutdown initiated"}
 
@@ -0,0 +1,146 @@
+"""Fan-out of status events to Server-Sent Events clients.
+
+Components publish events (bridge state, discovered servers, project
+catalog changes) to an ``EventBroadcaster``; each connected /events client
+holds a ``Subscription`` with its own bounded queue, so a slow client never
+blocks a publisher. Recent events are kept in a ring buffer so a client
+reconnecting with ``Last-Event-ID`` gets exactly what it missed.
+
+Event ids are ``<boot>-<seq>``: an id from before a restart (or one that
+has fallen out of the buffer) can't be resumed, and the client is told to
+resync from a full status instead.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Deque, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Events kept for Last-Event-ID resume
+HISTORY_SIZE = 256
+
+# Events a client may fall behind by before its stream is closed (it then
+# reconnects and resumes from the history)
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class Event(NamedTuple):
+    id: str
+    type: str
+    data: dict
+
+    def encode(self) -> bytes:
+        """The event as an SSE frame"""
+        return f'id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data)}\n\n'.encode()
+
+
+class Subscription:
+    """One client's queue of pending events"""
+
+    _CLOSED = object()
+
+    def __init__(self, start_id: str):
+        self.start_id = start_id  # Last event published before subscribing
+        self._queue: queue.Queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+        self.closed = False
+
+    def put(self, event: Event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            if not self.overflowed:
+                logger.info('Event stream client fell behind; closing its stream')
+            self.overflowed = True
+            self.close()
+
+    def get(self, timeout: float) -> Optional[Event]:
+        """Next event, or None after ``timeout`` seconds (or once closed)"""
+        if self.closed:
+            return None
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return None if item is self._CLOSED else item
+
+    def close(self):
+        self.closed = True
+        try:
+            self._queue.put_nowait(self._CLOSED)  # Wake a waiting get()
+        except queue.Full:
+            pass
+
+
+class EventBroadcaster:
+    """Publishes events to every subscription; thread-safe."""
+
+    def __init__(self, history: int = HISTORY_SIZE):
+        self.boot = f'{int(time.time()):x}{os.getpid():x}'
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._history: Deque[Event] = deque(maxlen=history)
+        self._subscribers: Set[Subscription] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: dict) -> Event:
+        """Send an event to every subscriber (never blocks)."""
+        with self._lock:
+            self._seq += 1
+            event = Event(f'{self.boot}-{self._seq}', event_type, data)
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.put(event)
+        return event
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Tuple[Subscription, Optional[List[Event]]]:
+        """Start receiving events.
+
+        Args:
+            last_event_id: Id of the last event the client saw, if resuming
+
+        Returns:
+            (subscription, missed events); missed is None if the client must
+            resync (new client, or the id can't be resumed)
+        """
+        with self._lock:
+            subscription = Subscription(f'{self.boot}-{self._seq}')
+            missed = self._missed_since(last_event_id) if last_event_id else None
+            self._subscribers.add(subscription)
+        return subscription, missed
+
+    def _missed_since(self, last_event_id: str) -> Optional[List[Event]]:
+        boot, _, seq = last_event_id.strip().rpartition('-')
+        if boot != self.boot or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if seq > self._seq:
+            return None
+        oldest = self._seq - len(self._history) + 1
+        if seq + 1 < oldest:
+            return None  # Fell out of the history
+        return list(self._history)[seq + 1 - oldest:]
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+        subscription.close()
+
+    def close(self):
+        """End every subscription (their streams finish)."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+        for subscription in subscribers:
+            subscription.close()
@@ -2,37 +2,250 @@
 HighlightAssist Health Check Server
 Separate from bridge for reliable status monitoring
 Runs on port 5056 - lightweight HTTP server
+
+Connections are served by two bounded thread pools: a fast lane for
+liveness and cached reads (/ping, /health, /projects, ...) and a slow lane
+for requests that scan or start processes (SLOW_PATHS). A slow request
+never occupies a fast-lane worker, so /ping stays instant while scans run.
 """
 import logging
 from http.server import HTTPServer, BaseHTTPRequestHandler
+import io
 import json
+import queue
+import select
+import selectors
+import socket
 import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from core.event_stream import Event, EventBroadcaster
+from core.health_snapshot import StatusSnapshot, etag_matches
 
 logger = logging.getLogger(__name__)
 
+# A streaming client that stops reading for this long is treated as gone
+STREAM_WRITE_TIMEOUT = 30.0
+
+# How often a streaming scan checks whether its client hung up
+DISCONNECT_POLL_INTERVAL = 0.25
+
+# Requests that can take seconds (directory walks, port scans, starting the
+# bridge) run on the slow lane
+SLOW_PATHS = frozenset({'/projects/scan', '/projects/scan/stream', '/command', '/scan-servers'})
+
+# Worker threads per lane, and connections allowed to wait for one; beyond
+# that a connection is answered 503 right away instead of queueing
+FAST_WORKERS = 8
+FAST_MAX_PENDING = 64
+SLOW_WORKERS = 4
+SLOW_MAX_PENDING = 8
+
+# A new connection must send its request line and headers within this. The
+# head is read by the keep-alive selector, never by a worker, and a lane is
+# only picked once it is complete (or MAX_REQUEST_HEAD bytes long).
+REQUEST_HEAD_TIMEOUT = 5.0
+MAX_REQUEST_HEAD = 16 * 1024
+
+# Keep-alive: an idle connection is closed after this long without a new
+# request; reading or writing one request may take at most REQUEST_TIMEOUT
+KEEPALIVE_TIMEOUT = 15.0
+REQUEST_TIMEOUT = 10.0
+
+# Open connections (busy or idle) at most; beyond that the oldest idle one
+# is closed, or the new one refused with 503 if none is idle
+MAX_CONNECTIONS = 128
+
+# Largest request body accepted (POST /command is a few bytes of JSON)
+MAX_BODY_SIZE = 64 * 1024
+
+# /health fields that change on every build without a state change
+HEALTH_VOLATILE_FIELDS = ('timestamp', 'uptime_seconds')
+
+# /events: a comment line is sent this often so proxies and clients can tell
+# an idle stream from a dead one; clients are told to reconnect after
+# EVENTS_RETRY_MS. Streams each hold a worker of their own lane.
+EVENTS_HEARTBEAT_INTERVAL = 15.0
+EVENTS_RETRY_MS = 3000
+EVENT_STREAM_WORKERS = 32
+
+
+def build_health_status(manager) -> dict:
+    """Full /health status of the service manager's components"""
+    if not manager:
+        # Fallback if manager not available
+        return {
+            'service_manager': 'initializing',
+            'version': '2.0.0',
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    # Check bridge status
+    bridge_status = {
+        'status': 'running' if manager.bridge.is_running else 'stopped',
+        'port': manager.bridge.port,
+        'pid': manager.bridge.pid,
+        'uptime_seconds': manager.bridge.get_uptime() if hasattr(manager.bridge, 'get_uptime') else 0
+    }
+    
+    # Check TCP server status
+    tcp_status = {
+        'status': 'running' if manager.server._running else 'stopped',
+        'port': manager.server.port
+    }
+    
+    # Check dashboard status
+    dashboard_status = None
+    if hasattr(manager, 'dashboard') and manager.dashboard:
+        dashboard_url = manager.dashboard.get_dashboard_url()
+        dashboard_status = {
+            'url': dashboard_url,
+            'port': manager.dashboard.port if hasattr(manager.dashboard, 'port') else 9999,
+            'status': 'running' if dashboard_url else 'stopped'
+        }
+    
+    # Get server list from project manager
+    servers = []
+    if hasattr(manager, 'project_manager') and manager.project_manager:
+        try:
+            # Get detected servers (fast - from cache)
+            detected = manager.project_manager.get_detected_servers()
+            servers = detected if detected else []
+        except Exception as e:
+            logger.debug(f'Could not get servers: {e}')
+    
+    return {
+        'service_manager': 'running',
+        'version': '2.0.0',
+        'timestamp': datetime.now().isoformat(),
+        'bridge': bridge_status,
+        'tcp_server': tcp_status,
+        'dashboard': dashboard_status,
+        'servers': servers,  # Extension can display these
+        'uptime_seconds': (datetime.now() - manager.start_time).total_seconds() if hasattr(manager, 'start_time') else 0
+    }
+
 
 class HealthCheckHandler(BaseHTTPRequestHandler):
-    """Simple HTTP handler for health checks"""
+    """Simple HTTP handler for health checks
+    
+    Speaks HTTP/1.1 with persistent connections: every response carries a
+    Content-Length, and once a request is answered an idle connection is
+    handed back to the server to wait for the next one (see LanedHTTPServer).
+    """
+    
+    protocol_version = 'HTTP/1.1'
+    timeout = REQUEST_TIMEOUT
     
     # Class-level reference to service manager
     service_manager = None
     
+    # Cached /health status and the /events feed (set by HealthCheckServer)
+    health_snapshot: Optional[StatusSnapshot] = None
+    events: Optional[EventBroadcaster] = None
+    
+    # Set when the connection stays open for another request; ``unread`` is
+    # what was already received of it
+    idle = False
+    unread = b''
+    
     def log_message(self, format, *args):
         """Suppress request logging (too verbose)"""
         pass
     
+    def setup(self):
+        super().setup()
+        # The server already read the request head (and maybe more) off the socket
+        unread = self.server.pop_unread(self.request)
+        if unread:
+            self.rfile = io.BufferedReader(_Unread(unread, self.rfile.detach()))
+    
+    def handle(self):
+        """Serve one request, then return the connection to the server as idle
+        (or let it close) together with any bytes of the next request"""
+        self.handle_one_request()
+        if not self.close_connection:
+            self.unread = self._buffered()
+            self.idle = self.unread is not None
+    
+    def _buffered(self) -> Optional[bytes]:
+        """Whatever the client has already sent of its next request, without
+        waiting for more; None if the connection failed"""
+        try:
+            self.connection.settimeout(0)
+            return self.rfile.read1(MAX_REQUEST_HEAD)
+        except OSError:
+            self.close_connection = True
+            return None
+        finally:
+            try:
+                self.connection.settimeout(self.timeout)
+            except OSError:
+                pass
+
+    def end_headers(self):
+        if not self.close_connection:
+            self.send_header('Keep-Alive', f'timeout={int(KEEPALIVE_TIMEOUT)}')
+        super().end_headers()
+    
+    def send_json(self, data, status: int = 200):
+        """Send ``data`` as a JSON response"""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_error(self, code, message=None, explain=None):
+        """JSON error response with a Content-Length, so the connection can be reused"""
+        short, _ = self.responses.get(code, ('Error', ''))
+        message = message or short
+        self.log_error('code %d, message %s', code, message)
+        body = json.dumps({'error': message, 'status': code}).encode()
+        
+        self.send_response(code, short)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        if self.command != 'HEAD' and code >= 200 and code not in (204, 304):
+            self.wfile.write(body)
+    
+    def _read_body(self) -> bytes:
+        """Request body (the connection is closed if it can't be read fully)"""
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_SIZE:
+            self.close_connection = True
+            raise ValueError('Request body too large or malformed')
+        return self.rfile.read(length)
+    
     def do_GET(self):
         """Handle GET requests"""
         try:
-            if self.path == '/health':
+            url = urlsplit(self.path)
+            if url.path == '/health':
                 self.send_health_response()
-            elif self.path == '/ping':
+            elif url.path == '/ping':
                 self.send_ping_response()
-            elif self.path == '/projects':
+            elif url.path == '/projects':
                 self.send_projects_response()
-            elif self.path == '/projects/scan':
+            elif url.path == '/projects/scan':
                 self.send_projects_scan_response()
+            elif url.path == '/projects/scan/stream':
+                self.send_projects_scan_stream(parse_qs(url.query))
+            elif url.path == '/projects/search':
+                self.send_projects_search_response(parse_qs(url.query))
+            elif url.path == '/events':
+                self.send_events_stream(parse_qs(url.query))
             else:
                 self.send_error(404, "Not Found")
         except Exception as e:
@@ -41,6 +254,12 @@ def do_GET(self):
     
     def do_POST(self):
         """Handle POST requests for commands"""
+        try:
+            self.body = self._read_body()
+        except ValueError as e:
+            self.send_error(413, str(e))
+            return
+        
         try:
             if self.path == '/command':
                 self.handle_command()
@@ -55,10 +274,7 @@ def do_POST(self):
     def handle_command(self):
         """Handle bridge control commands via HTTP"""
         try:
-            # Read request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
+            data = json.loads(self.body.decode())
             
             action = data.get('action')
             if not action:
@@ -87,12 +303,11 @@ def handle_command(self):
                 self.send_error(400, f"Unknown action: {action}")
                 return
             
+            if action != 'status':
+                self.health_snapshot.invalidate()
+            
             # Send response
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(result).encode())
+            self.send_json(result)
             
         except json.JSONDecodeError:
             self.send_error(400, "Invalid JSON")
@@ -101,68 +316,27 @@ def handle_command(self):
             self.send_error(500, str(e))
     
     def send_health_response(self):
-        """Send comprehensive health status"""
+        """Send comprehensive health status
+        
+        Served from the pre-serialized snapshot; a poll whose If-None-Match
+        still matches gets a body-less 304.
+        """
         try:
-            manager = self.service_manager
+            snapshot = self.health_snapshot.get()
+            not_modified = etag_matches(self.headers.get('If-None-Match'), snapshot.etag)
             
-            if not manager:
-                # Fallback if manager not available
-                health_data = {
-                    'service_manager': 'initializing',
-                    'version': '2.0.0',
-                    'timestamp': datetime.now().isoformat()
-                }
-            else:
-                # Check bridge status
-                bridge_status = {
-                    'status': 'running' if manager.bridge.is_running else 'stopped',
-                    'port': manager.bridge.port,
-                    'pid': manager.bridge.pid,
-                    'uptime_seconds': manager.bridge.get_uptime() if hasattr(manager.bridge, 'get_uptime') else 0
-                }
-                
-                # Check TCP server status
-                tcp_status = {
-                    'status': 'running' if manager.server._running else 'stopped',
-                    'port': manager.server.port
-                }
-                
-                # Check dashboard status
-                dashboard_status = None
-                if hasattr(manager, 'dashboard') and manager.dashboard:
-                    dashboard_url = manager.dashboard.get_dashboard_url()
-                    dashboard_status = {
-                        'url': dashboard_url,
-                        'port': manager.dashboard.port if hasattr(manager.dashboard, 'port') else 9999,
-                        'status': 'running' if dashboard_url else 'stopped'
-                    }
-                
-                # Get server list from project manager
-                servers = []
-                if hasattr(manager, 'project_manager') and manager.project_manager:
-                    try:
-                        # Get detected servers (fast - from cache)
-                        detected = manager.project_manager.get_detected_servers()
-                        servers = detected if detected else []
-                    except Exception as e:
-                        logger.debug(f'Could not get servers: {e}')
-                
-                health_data = {
-                    'service_manager': 'running',
-                    'version': '2.0.0',
-                    'timestamp': datetime.now().isoformat(),
-                    'bridge': bridge_status,
-                    'tcp_server': tcp_status,
-                    'dashboard': dashboard_status,
-                    'servers': servers,  # Extension can display these
-                    'uptime_seconds': (datetime.now() - manager.start_time).total_seconds() if hasattr(manager, 'start_time') else 0
-                }
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
+            self.send_response(304 if not_modified else 200)
+            self.send_header('ETag', snapshot.etag)
+            self.send_header('Cache-Control', 'no-cache')
             self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Expose-Headers', 'ETag')
+            if not_modified:
+                self.end_headers()
+                return
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(snapshot.body)))
             self.end_headers()
-            self.wfile.write(json.dumps(health_data).encode())
+            self.wfile.write(snapshot.body)
             
         except Exception as e:
             logger.error(f'Error generating health response: {e}', exc_info=True)
@@ -173,14 +347,10 @@ def send_health_response(self):
     
     def send_ping_response(self):
         """Fast ping response for quick checks"""
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps({
+        self.send_json({
             'status': 'ok',
             'timestamp': datetime.now().isoformat()
-        }).encode())
+        })
     
     def send_projects_response(self):
         """Return list of detected/suggested projects"""
@@ -188,20 +358,20 @@ def send_projects_response(self):
             manager = self.service_manager
             if not manager or not hasattr(manager, 'project_manager'):
                 projects = []
+                scan = {'in_progress': False, 'roots_total': 0, 'roots_scanned': 0, 'projects_found': 0}
             else:
-                # Get recent projects (fast - from cache)
+                # Get recent projects (fast - from cache; filled in as a first-run scan progresses)
                 suggestions = manager.project_manager.get_suggestions(include_scan=False)
                 projects = suggestions['recent']
+                scan = manager.project_manager.scan_status()
             
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps({
+            self.send_json({
                 'projects': projects,
                 'total': len(projects),
+                'scan_in_progress': scan['in_progress'],
+                'scan': scan,
                 'timestamp': datetime.now().isoformat()
-            }).encode())
+            })
             
         except Exception as e:
             logger.error(f'Error generating projects response: {e}', exc_info=True)
@@ -220,18 +390,172 @@ def send_projects_scan_response(self):
                 projects = suggestions['detected']
                 logger.info(f'Found {len(projects)} projects')
             
+            self.send_json({
+                'projects': projects,
+                'total': len(projects),
+                'timestamp': datetime.now().isoformat()
+            })
+            
+        except Exception as e:
+            logger.error(f'Error scanning for projects: {e}', exc_info=True)
+            self.send_error(500, str(e))
+    
+    def _client_gone(self) -> bool:
+        """True once the client has closed its end of the connection"""
+        try:
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            return bool(readable) and self.connection.recv(1, socket.MSG_PEEK) == b''
+        except (OSError, ValueError):
+            return True
+    
+    def send_projects_scan_stream(self, params: dict):
+        """Stream a project scan: NDJSON by default, SSE with ?format=sse or
+        Accept: text/event-stream
+        
+        Events: scan_start {roots, total_roots}, project {root, project},
+        root_done {root, found, roots_scanned, total_roots}, scan_done
+        {total, elapsed_ms, cancelled}. The scan stops when the client
+        disconnects.
+        """
+        sse = (params.get('format', [''])[0] == 'sse'
+               or 'text/event-stream' in self.headers.get('Accept', ''))
+        manager = self.service_manager
+        project_manager = getattr(manager, 'project_manager', None) if manager else None
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream' if sse else 'application/x-ndjson')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Connection', 'close')  # The body runs until the connection closes
+        self.end_headers()
+        self.connection.settimeout(STREAM_WRITE_TIMEOUT)
+        
+        state = {'gone': False, 'next_poll': 0.0}
+        
+        def emit(kind: str, data: dict):
+            if state['gone']:
+                return
+            if sse:
+                payload = f'event: {kind}\ndata: {json.dumps(data)}\n\n'
+            else:
+                payload = json.dumps({'type': kind, **data}) + '\n'
+            try:
+                self.wfile.write(payload.encode())
+                self.wfile.flush()
+            except OSError:
+                state['gone'] = True
+        
+        def cancelled() -> bool:
+            # Polled per directory listing; only look at the socket a few times a second
+            now = time.monotonic()
+            if not state['gone'] and now >= state['next_poll']:
+                state['next_poll'] = now + DISCONNECT_POLL_INTERVAL
+                state['gone'] = self._client_gone()
+            return state['gone']
+        
+        started = time.monotonic()
+        roots = project_manager.scan_roots() if project_manager else []
+        totals = {'scanned': 0, 'found': 0}
+        emit('scan_start', {'roots': roots, 'total_roots': len(roots)})
+        
+        def on_root(root: str, projects: list):
+            totals['scanned'] += 1
+            totals['found'] += len(projects)
+            emit('root_done', {'root': root, 'found': len(projects),
+                               'roots_scanned': totals['scanned'], 'total_roots': len(roots)})
+        
+        try:
+            if project_manager:
+                project_manager.rescan_roots(
+                    roots, on_root=on_root, cancelled=cancelled,
+                    on_project=lambda root, project: emit('project', {'root': root, 'project': project})
+                )
+        except Exception as e:
+            logger.error(f'Error streaming project scan: {e}', exc_info=True)
+            emit('error', {'message': str(e)})
+        
+        if state['gone']:
+            logger.info(f"Project scan stream closed by client after {totals['scanned']}/{len(roots)} roots")
+        emit('scan_done', {'total': totals['found'], 'cancelled': state['gone'],
+                           'elapsed_ms': round((time.monotonic() - started) * 1000)})
+        self.close_connection = True
+    
+    def send_events_stream(self, params: dict):
+        """Push status changes as Server-Sent Events
+        
+        Events: status (the full /health status; sent first and whenever it
+        changes), bridge {status: started|stopped|crashed|recovered, port,
+        pid}, server_up / server_down {port, pid, name, path, framework, ...}
+        and projects {root, added, removed, recent_changed}. A heartbeat
+        comment is sent every EVENTS_HEARTBEAT_INTERVAL seconds.
+        
+        A client reconnecting with Last-Event-ID (or ?lastEventId=) gets the
+        events it missed; if those are no longer known it gets a fresh
+        status event instead.
+        """
+        last_event_id = self.headers.get('Last-Event-ID') or params.get('lastEventId', [None])[0]
+        subscription, missed = self.events.subscribe(last_event_id)
+        try:
             self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('X-Accel-Buffering', 'no')
             self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Connection', 'close')  # The body runs until the connection closes
             self.end_headers()
-            self.wfile.write(json.dumps({
+            self.connection.settimeout(STREAM_WRITE_TIMEOUT)
+            
+            if missed is None:
+                # Resync: the current status stands in for everything missed
+                first = [Event(subscription.start_id, 'status', self.health_snapshot.get().status)]
+            else:
+                first = missed
+            self.wfile.write(f'retry: {EVENTS_RETRY_MS}\n\n'.encode() + b''.join(e.encode() for e in first))
+            
+            next_heartbeat = time.monotonic() + EVENTS_HEARTBEAT_INTERVAL
+            while not subscription.closed:
+                event = subscription.get(timeout=DISCONNECT_POLL_INTERVAL * 4)
+                if event is not None:
+                    self.wfile.write(event.encode())
+                elif time.monotonic() >= next_heartbeat:
+                    self.wfile.write(b': heartbeat\n\n')
+                elif self._client_gone():
+                    break
+                else:
+                    continue
+                next_heartbeat = time.monotonic() + EVENTS_HEARTBEAT_INTERVAL
+        except OSError:
+            pass  # Client went away
+        finally:
+            self.events.unsubscribe(subscription)
+            self.close_connection = True
+    
+    def send_projects_search_response(self, params: dict):
+        """Fuzzy project search for search-as-you-type (?q=...&limit=20)"""
+        try:
+            query = params.get('q', [''])[0]
+            try:
+                limit = max(1, min(int(params.get('limit', ['20'])[0]), 200))
+            except ValueError:
+                self.send_error(400, 'limit must be an integer')
+                return
+            
+            manager = self.service_manager
+            if not manager or not hasattr(manager, 'project_manager'):
+                projects = []
+            else:
+                projects = manager.project_manager.search_projects(query, limit)
+            
+            self.send_json({
+                'query': query,
                 'projects': projects,
                 'total': len(projects),
                 'timestamp': datetime.now().isoformat()
-            }).encode())
+            })
             
         except Exception as e:
-            logger.error(f'Error scanning for projects: {e}', exc_info=True)
+            logger.error(f'Error searching projects: {e}', exc_info=True)
             self.send_error(500, str(e))
     
     def handle_scan_servers(self):
@@ -241,27 +565,337 @@ def handle_scan_servers(self):
             if not manager or not hasattr(manager, 'project_manager'):
                 servers = []
             else:
-                # Force rescan of running servers
+                # Force rescan of running servers (coalesced with concurrent requests)
                 logger.info('Rescanning running servers on localhost...')
-                manager.project_manager.scan_running_servers()  # Refresh cache
-                servers = manager.project_manager.get_detected_servers()
+                servers = manager.project_manager.scan_running_servers()
                 logger.info(f'Found {len(servers)} running servers')
             
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps({
+            self.send_json({
                 'servers': servers,
                 'total': len(servers),
                 'timestamp': datetime.now().isoformat()
-            }).encode())
+            })
             
         except Exception as e:
             logger.error(f'Error scanning servers: {e}', exc_info=True)
             self.send_error(500, str(e))
 
 
+def _request_path(head: bytes) -> str:
+    """Path from a request head"""
+    parts = head.split(b'\r\n', 1)[0].split()
+    return urlsplit(parts[1].decode('latin-1')).path if len(parts) >= 2 else ''
+
+
+def _head_complete(head: bytes) -> bool:
+    return b'\r\n\r\n' in head or len(head) >= MAX_REQUEST_HEAD
+
+
+class _Unread(io.RawIOBase):
+    """Raw stream returning ``data`` before reading on from ``raw``"""
+    
+    def __init__(self, data: bytes, raw):
+        self._data = data
+        self._raw = raw
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> Optional[int]:
+        if self._data:
+            n = min(len(buffer), len(self._data))
+            buffer[:n] = self._data[:n]
+            self._data = self._data[n:]
+            return n
+        return self._raw.readinto(buffer)
+    
+    def close(self):
+        super().close()
+        self._raw.close()
+
+
+class _Lane:
+    """Bounded worker pool: up to ``workers`` daemon threads (started as load
+    requires) and ``max_pending`` queued jobs"""
+    
+    def __init__(self, name: str, workers: int, max_pending: int):
+        self._name = name
+        self._workers = workers
+        self._capacity = workers + max_pending
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._load = 0  # Jobs queued or running
+        self._threads = 0
+        self._stopped = False
+    
+    def submit(self, fn, *args) -> bool:
+        """Queue ``fn(*args)``; False if the lane is full"""
+        with self._lock:
+            if self._stopped or self._load >= self._capacity:
+                return False
+            self._load += 1
+            if self._threads < min(self._load, self._workers):
+                self._threads += 1
+                threading.Thread(target=self._work, daemon=True, name=f'{self._name}-{self._threads}').start()
+        self._jobs.put((fn, args))
+        return True
+    
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            fn, args = job
+            try:
+                fn(*args)
+            except Exception as e:
+                logger.error(f'Health server worker error: {e}', exc_info=True)
+            finally:
+                with self._lock:
+                    self._load -= 1
+    
+    def shutdown(self):
+        """Stop the workers once they finish their current job"""
+        with self._lock:
+            self._stopped = True
+            threads = self._threads
+        for _ in range(threads):
+            self._jobs.put(None)
+
+
+class _IdleConnections:
+    """Connections waiting for a request, watched by one selector thread
+    
+    New connections and keep-alive connections between requests both wait
+    here. Whatever arrives is read into a buffer until the request head is
+    complete; the connection then goes to ``on_ready(request, address,
+    head)``. One that doesn't get there before its deadline goes to
+    ``on_close``. Waiting connections hold no worker thread.
+    """
+    
+    def __init__(self, on_ready, on_close):
+        self._on_ready = on_ready
+        self._on_close = on_close
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._commands: queue.SimpleQueue = queue.SimpleQueue()
+        # socket -> (client address, deadline, head so far); oldest first
+        self._waiting: 'OrderedDict[socket.socket, tuple]' = OrderedDict()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True, name='HealthKeepAlive')
+        self._thread.start()
+    
+    def __len__(self) -> int:
+        return len(self._waiting)
+    
+    def wait(self, request, client_address, timeout: float, head: bytes = b''):
+        """Wait (at most ``timeout`` seconds) for a request on ``request``;
+        ``head`` is what was already received of it"""
+        self._send(('wait', request, client_address, time.monotonic() + timeout, head))
+    
+    def evict_oldest(self):
+        """Close the connection that has been waiting longest"""
+        self._send(('evict',))
+    
+    def stop(self):
+        """Close every waiting connection and stop the thread"""
+        self._send(('stop',))
+    
+    def _send(self, command):
+        self._commands.put(command)
+        try:
+            self._wake_w.send(b'\0')
+        except OSError:  # Wake buffer full (thread already woken) or stopped
+            pass
+    
+    def _close(self, request):
+        self._selector.unregister(request)
+        del self._waiting[request]
+        self._on_close(request)
+    
+    def _run_commands(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except OSError:
+            pass
+        while not self._commands.empty():
+            command = self._commands.get()
+            if command[0] == 'wait':
+                _, request, client_address, deadline, head = command
+                if self._stopped:
+                    self._on_close(request)
+                    continue
+                if _head_complete(head):  # Pipelined behind the previous request
+                    self._on_ready(request, client_address, head)
+                    continue
+                try:
+                    request.setblocking(False)
+                    self._selector.register(request, selectors.EVENT_READ)
+                except (OSError, ValueError):
+                    self._on_close(request)
+                    continue
+                self._waiting[request] = (client_address, deadline, head)
+                self._receive(request)  # A new connection's request is usually there already
+            elif command[0] == 'evict':
+                if self._waiting:
+                    self._close(next(iter(self._waiting)))
+            elif command[0] == 'stop':
+                self._stopped = True
+                for request in list(self._waiting):
+                    self._close(request)
+    
+    def _receive(self, request):
+        """Read what arrived on ``request``; hand it on once the head is complete"""
+        client_address, deadline, head = self._waiting[request]
+        try:
+            data = request.recv(MAX_REQUEST_HEAD - len(head))
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b''
+        if not data:  # Closed by the client
+            self._close(request)
+            return
+        head += data
+        if not _head_complete(head):
+            self._waiting[request] = (client_address, deadline, head)
+            return
+        del self._waiting[request]
+        self._selector.unregister(request)
+        self._on_ready(request, client_address, head)
+    
+    def _run(self):
+        while not self._stopped:
+            timeout = None
+            if self._waiting:
+                deadline = min(deadline for _, deadline, _ in self._waiting.values())
+                timeout = max(0.0, deadline - time.monotonic())
+            
+            for key, _ in self._selector.select(timeout):
+                if key.fileobj is self._wake_r:
+                    self._run_commands()
+                elif key.fileobj in self._waiting:
+                    self._receive(key.fileobj)
+            
+            now = time.monotonic()
+            for request in [r for r, (_, deadline, _) in self._waiting.items() if deadline <= now]:
+                self._close(request)
+        
+        self._selector.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+
+class LanedHTTPServer(HTTPServer):
+    """HTTPServer that hands each request to a fast or a slow worker pool
+    
+    The accept loop only hands new connections to _IdleConnections. Once a
+    request head has arrived there, the connection goes to the slow lane
+    (SLOW_PATHS), the stream lane (/events) or the fast lane, whose worker
+    serves it. After the response a keep-alive connection goes back to
+    _IdleConnections to wait for its next request, so a worker never waits
+    on a client that hasn't sent a request yet.
+    """
+    
+    request_queue_size = 64
+    
+    def __init__(self, server_address, handler_class):
+        self.fast_lane = _Lane('HealthFast', FAST_WORKERS, FAST_MAX_PENDING)
+        self.slow_lane = _Lane('HealthSlow', SLOW_WORKERS, SLOW_MAX_PENDING)
+        self.stream_lane = _Lane('HealthEvents', EVENT_STREAM_WORKERS, 0)
+        self.idle_connections = _IdleConnections(self._route, self.shutdown_request)
+        # socket -> bytes already read off it, for the handler to start with
+        self._unread = {}
+        self._connections_lock = threading.Lock()
+        self.open_connections = 0
+        try:
+            super().__init__(server_address, handler_class)
+        except Exception:
+            self.fast_lane.shutdown()
+            self.slow_lane.shutdown()
+            self.stream_lane.shutdown()
+            self.idle_connections.stop()
+            raise
+    
+    def process_request(self, request, client_address):
+        # Headers and body are separate writes; without this, Nagle holds the
+        # body back until the client's delayed ACK on a reused connection
+        try:
+            request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+        with self._connections_lock:
+            self.open_connections += 1
+            over_cap = self.open_connections > MAX_CONNECTIONS
+        if over_cap:
+            if not len(self.idle_connections):
+                self._reject(request)
+                return
+            self.idle_connections.evict_oldest()
+        self.idle_connections.wait(request, client_address, REQUEST_HEAD_TIMEOUT)
+    
+    def _route(self, request, client_address, head: bytes):
+        path = _request_path(head)
+        lane = self.stream_lane if path == '/events' else self.slow_lane if path in SLOW_PATHS else self.fast_lane
+        if not lane.submit(self._serve, request, client_address, head):
+            self._reject(request)
+    
+    def _serve(self, request, client_address, head: bytes):
+        self._unread[request] = head
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+            return
+        finally:
+            self._unread.pop(request, None)
+        if handler.idle:
+            self.idle_connections.wait(request, client_address, KEEPALIVE_TIMEOUT, handler.unread)
+        else:
+            self.shutdown_request(request)
+    
+    def pop_unread(self, request) -> bytes:
+        """Bytes the server read off ``request`` before handing it to a handler"""
+        return self._unread.pop(request, b'')
+
+    def _reject(self, request):
+        """Answer 503 without reading the request (a lane or the connection cap is full)"""
+        body = json.dumps({'error': 'Server busy, retry shortly'}).encode()
+        try:
+            request.sendall(
+                b'HTTP/1.1 503 Service Unavailable\r\n'
+                b'Content-Type: application/json\r\n'
+                b'Retry-After: 1\r\n'
+                b'Connection: close\r\n'
+                b'Access-Control-Allow-Origin: *\r\n'
+                + f'Content-Length: {len(body)}\r\n\r\n'.encode() + body
+            )
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+    
+    def shutdown_request(self, request):
+        with self._connections_lock:
+            self.open_connections -= 1
+        super().shutdown_request(request)
+    
+    def handle_error(self, request, client_address):
+        logger.error(f'Error serving health request from {client_address}', exc_info=True)
+    
+    def server_close(self):
+        super().server_close()
+        self.fast_lane.shutdown()
+        self.slow_lane.shutdown()
+        self.stream_lane.shutdown()
+        self.idle_connections.stop()
+
+
 class HealthCheckServer:
     """Lightweight HTTP server for health checks"""
     
@@ -273,6 +907,13 @@ def __init__(self, port=5056, service_manager=None):
         
         # Pass service manager reference to handler
         HealthCheckHandler.service_manager = service_manager
+        self.events = HealthCheckHandler.events = EventBroadcaster()
+        HealthCheckHandler.health_snapshot = StatusSnapshot(
+            lambda: build_health_status(service_manager), volatile=HEALTH_VOLATILE_FIELDS,
+            on_change=self._status_changed
+        )
+        self._unsubscribers = []
+        self._status_watcher = None
         
         logger.info(f'Health check server initialized on port {port}')
     
@@ -284,7 +925,7 @@ def start(self):
         
         try:
             logger.info(f'Creating HTTPServer on 127.0.0.1:{self.port}...')
-            self.server = HTTPServer(('127.0.0.1', self.port), HealthCheckHandler)
+            self.server = LanedHTTPServer(('127.0.0.1', self.port), HealthCheckHandler)
             self._running = True
             
             logger.info(f'HTTPServer created successfully, starting thread...')
@@ -292,6 +933,10 @@ def start(self):
             self.thread = threading.Thread(target=self._run_server, daemon=True, name='HealthCheckServer')
             self.thread.start()
             
+            self._connect_event_sources()
+            self._status_watcher = threading.Thread(target=self._watch_status, daemon=True, name='HealthStatusWatcher')
+            self._status_watcher.start()
+            
             logger.info(f'✅ Health check server started on http://localhost:{self.port}')
             
         except OSError as e:
@@ -323,6 +968,11 @@ def stop(self):
         
         try:
             self._running = False
+            for unsubscribe in self._unsubscribers:
+                unsubscribe()
+            self._unsubscribers = []
+            HealthCheckHandler.health_snapshot.changed.set()  # Let the status watcher exit
+            self.events.close()
             if self.server:
                 self.server.shutdown()
                 self.server.server_close()
@@ -335,6 +985,73 @@ def stop(self):
         except Exception as e:
             logger.error(f'Error stopping health check server: {e}')
     
+    def invalidate_health(self):
+        """A component changed state: rebuild the /health snapshot (and tell
+        /events clients) right away"""
+        HealthCheckHandler.health_snapshot.invalidate()
+    
+    def bridge_event(self, status: str):
+        """Announce a bridge transition the status can't show (crashed, recovered)"""
+        bridge = getattr(HealthCheckHandler.service_manager, 'bridge', None)
+        self.events.publish('bridge', {
+            'status': status,
+            'port': getattr(bridge, 'port', None),
+            'pid': getattr(bridge, 'pid', None),
+            'timestamp': datetime.now().isoformat()
+        })
+        self.invalidate_health()
+    
+    def _connect_event_sources(self):
+        """Forward discovery and project catalog changes to /events"""
+        project_manager = getattr(HealthCheckHandler.service_manager, 'project_manager', None)
+        if project_manager is None:
+            return
+        
+        def on_server(event):
+            # Running servers are part of /health too
+            self.events.publish(event.kind, event.to_dict())
+            self.invalidate_health()
+        
+        def on_projects(change):
+            self.events.publish('projects', change)
+        
+        try:
+            self._unsubscribers.append(project_manager.discovery.subscribe(on_server))
+            self._unsubscribers.append(project_manager.subscribe(on_projects))
+        except Exception as e:
+            logger.error(f'Cannot subscribe to status changes: {e}', exc_info=True)
+    
+    def _status_changed(self, previous, snapshot):
+        """Publish a changed status (and a bridge start/stop) to /events"""
+        was_running = (previous.status.get('bridge') or {}).get('status') == 'running'
+        bridge = snapshot.status.get('bridge') or {}
+        running = bridge.get('status') == 'running'
+        if bridge and running != was_running:
+            self.events.publish('bridge', {
+                'status': 'started' if running else 'stopped',
+                'port': bridge.get('port'),
+                'pid': bridge.get('pid'),
+                'timestamp': snapshot.status.get('timestamp')
+            })
+        self.events.publish('status', snapshot.status)
+    
+    def _watch_status(self):
+        """While /events clients are connected, keep the status snapshot fresh
+        so changes reach them however they came about
+        
+        Announced changes (invalidate_health) go out at once; others, like
+        the bridge started from the tray, once the snapshot's TTL expires.
+        """
+        snapshot_cache = HealthCheckHandler.health_snapshot
+        while self._running:
+            snapshot_cache.changed.wait(snapshot_cache.ttl)
+            snapshot_cache.changed.clear()
+            if self._running and self.events.subscriber_count:
+                try:
+                    snapshot_cache.get()  # Publishes through _status_changed
+                except Exception as e:
+                    logger.error(f'Error building health status: {e}', exc_info=True)
+    
     @property
     def is_running(self):
         """Check if server is running"""
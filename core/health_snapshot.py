@@ -0,0 +1,125 @@
+"""Pre-serialized status snapshot for polled endpoints.
+
+Building the /health status probes the bridge port and reads several
+components, and every popup polls it every few seconds. ``StatusSnapshot``
+builds it at most once per ``ttl`` (or right after ``invalidate()``, which
+components call when their state changes) and keeps it as ready-to-send
+bytes with an ETag. Pollers that send the ETag back in If-None-Match get a
+body-less 304 until something actually changes.
+
+The ETag covers the status without its volatile fields (timestamps,
+uptimes), so a rebuild that finds nothing changed keeps the previous bytes
+and ETag. Those are only reissued with fresh volatile fields once they are
+``max_age`` old.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, NamedTuple, Optional
+
+# Rebuild (re-probe) at most this often unless invalidated
+DEFAULT_TTL = 2.0
+
+# Reissue an unchanged snapshot after this long, refreshing its timestamps
+DEFAULT_MAX_AGE = 60.0
+
+
+class Snapshot(NamedTuple):
+    status: Dict  # As built; don't modify
+    body: bytes
+    etag: str  # Quoted, ready for the ETag header
+    state: str  # Hash of the status without volatile fields
+    built_at: float  # time.monotonic()
+
+
+def _stable(value: Any, volatile: FrozenSet[str]) -> Any:
+    """``value`` with volatile keys removed at any depth"""
+    if isinstance(value, dict):
+        return {k: _stable(v, volatile) for k, v in value.items() if k not in volatile}
+    if isinstance(value, list):
+        return [_stable(v, volatile) for v in value]
+    return value
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches ``etag`` (weak comparison)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class StatusSnapshot:
+    """Status built by ``build()``, cached as JSON bytes with an ETag; thread-safe."""
+
+    def __init__(self, build: Callable[[], Dict], volatile: Iterable[str] = (),
+                 ttl: float = DEFAULT_TTL, max_age: float = DEFAULT_MAX_AGE,
+                 on_change: Optional[Callable[[Snapshot, Snapshot], None]] = None):
+        """
+        Args:
+            build: Returns the current status (JSON-serializable)
+            volatile: Keys (at any depth) that change on every build and
+                don't count as a state change, e.g. 'timestamp'
+            ttl: Seconds a snapshot is served before the status is rebuilt
+            max_age: Seconds before an unchanged snapshot is reissued
+            on_change: Called with (previous, new) when a rebuild finds the
+                state changed (not for the first build); must not block
+        """
+        self._build = build
+        self._on_change = on_change
+        self._volatile = frozenset(volatile)
+        self.ttl = ttl
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Snapshot] = None
+        self._checked_at = 0.0
+        self._dirty = True
+        self.builds = 0
+        # Set by invalidate(), for anyone waiting to push changes
+        self.changed = threading.Event()
+
+    def invalidate(self):
+        """A component changed state: rebuild on the next ``get()``."""
+        self._dirty = True
+        self.changed.set()
+
+    def get(self) -> Snapshot:
+        """Current snapshot, rebuilding it first if stale."""
+        snapshot = self._snapshot
+        if snapshot is not None and not self._dirty and time.monotonic() - self._checked_at < self.ttl:
+            return snapshot
+
+        with self._lock:
+            # Another caller may have rebuilt it while we waited
+            now = time.monotonic()
+            if self._snapshot is not None and not self._dirty and now - self._checked_at < self.ttl:
+                return self._snapshot
+            previous = self._snapshot
+
+            self._dirty = False
+            status = self._build()
+            self.builds += 1
+            state = json.dumps(_stable(status, self._volatile), sort_keys=True).encode()
+            state_hash = hashlib.sha1(state).hexdigest()[:16]
+            self._checked_at = now
+
+            if (self._snapshot is None or state_hash != self._snapshot.state
+                    or now - self._snapshot.built_at >= self.max_age):
+                body = json.dumps(status).encode()
+                etag = f'"{state_hash}-{hashlib.sha1(body).hexdigest()[:8]}"'
+                self._snapshot = Snapshot(status, body, etag, state_hash, now)
+            snapshot = self._snapshot
+        
+        if self._on_change and previous is not None and snapshot.state != previous.state:
+            self._on_change(previous, snapshot)
+        return snapshot
@@ -0,0 +1,135 @@
+"""Listening socket discovery.
+
+On Linux every listening TCP socket is read straight from /proc/net/tcp and
+/proc/net/tcp6 in one pass - no connections are opened, so checking the
+whole port range costs a few milliseconds. Elsewhere we fall back to
+concurrent connect probes against loopback.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional
+
+from core.port_scanner import open_loopback
+
+logger = logging.getLogger(__name__)
+
+PROC_NET = Path('/proc/net')
+
+TCP_LISTEN = '0A'
+
+
+class ListeningSocket(NamedTuple):
+    port: int
+    address: str
+    family: int
+    inode: int
+    uid: int
+
+
+def _decode_address(hex_address: str, family: int) -> str:
+    """Decode a /proc/net hex address (printed as host-order 32-bit words)."""
+    raw = bytes.fromhex(hex_address)
+    if sys.byteorder == 'little':
+        raw = b''.join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    return socket.inet_ntop(family, raw)
+
+
+def _is_local(address: str, family: int) -> bool:
+    """Loopback and wildcard binds are reachable as localhost."""
+    if family == socket.AF_INET:
+        return address == '0.0.0.0' or address.startswith('127.')
+    return address in ('::', '::1') or address.startswith('::ffff:127.')
+
+
+def read_proc_listeners(proc_net: Path = PROC_NET) -> Optional[List[ListeningSocket]]:
+    """Return all localhost-reachable LISTEN sockets, or None if /proc is unavailable."""
+    tables = ((proc_net / 'tcp', socket.AF_INET), (proc_net / 'tcp6', socket.AF_INET6))
+    listeners = []
+    found_table = False
+
+    for path, family in tables:
+        try:
+            with open(path, 'r', encoding='ascii') as f:
+                lines = f.readlines()[1:]  # Skip header
+        except OSError:
+            continue
+        found_table = True
+
+        for line in lines:
+            fields = line.split()
+            if len(fields) < 10 or fields[3] != TCP_LISTEN:
+                continue
+            try:
+                hex_address, hex_port = fields[1].split(':')
+                address = _decode_address(hex_address, family)
+                if not _is_local(address, family):
+                    continue
+                listeners.append(ListeningSocket(
+                    port=int(hex_port, 16),
+                    address=address,
+                    family=family,
+                    inode=int(fields[9]),
+                    uid=int(fields[7])
+                ))
+            except ValueError:
+                logger.debug(f'Unparseable {path} line: {line.strip()}')
+
+    return listeners if found_table else None
+
+
+async def _probe_ports(ports: List[int], timeout: float, concurrency: int) -> List[int]:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def probe(port: int) -> Optional[int]:
+        async with slots:
+            connection = await open_loopback(port, timeout)
+        if connection is None:
+            return None
+        connection[1].close()
+        return port
+
+    results = await asyncio.gather(*(probe(port) for port in ports))
+    return [port for port in results if port is not None]
+
+
+def probe_listening_ports(ports: Iterable[int], timeout: float = 0.3, concurrency: int = 256) -> List[int]:
+    """Connect-probe fallback: which of ``ports`` accept connections on loopback.
+
+    Blocks the caller. When called from a thread that is already running an
+    event loop, the probes run on a short-lived helper thread.
+    """
+    ports = list(ports)
+
+    def run() -> List[int]:
+        return asyncio.run(_probe_ports(ports, timeout, concurrency))
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run).result()
+
+
+def listening_ports(ports: Optional[Iterable[int]] = None) -> List[int]:
+    """Sorted localhost ports that are listening, optionally limited to ``ports``.
+
+    Uses /proc when available (no connections opened); otherwise probes
+    ``ports`` (required on that path) with connect attempts.
+    """
+    listeners = read_proc_listeners()
+    if listeners is not None:
+        open_ports = {listener.port for listener in listeners}
+        if ports is not None:
+            open_ports &= set(ports)
+        return sorted(open_ports)
+
+    if ports is None:
+        raise ValueError('ports is required when /proc/net is unavailable')
+    return sorted(probe_listening_ports(ports))
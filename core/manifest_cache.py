@@ -0,0 +1,159 @@
+"""Shared cache of parsed project manifests.
+
+``package.json`` files (multi-megabyte in some monorepos) are parsed once
+per change instead of on every scan, menu click or auto-detect request.
+Only the extracted fields are kept - name, framework, dev port and
+scripts - never the parsed document. (Lockfiles and virtualenvs are
+directory facts, see core.project_rules.)
+
+Entries are keyed by the manifest's (path, mtime_ns, size). Eviction is LRU
+within a byte budget.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Approximate bytes of extracted fields kept across all entries
+DEFAULT_BYTE_BUDGET = 4 * 1024 * 1024
+
+_EMPTY_SCRIPTS: Mapping[str, str] = MappingProxyType({})
+
+
+class ProjectManifest(NamedTuple):
+    has_package_json: bool
+    name: Optional[str] = None
+    version: str = '0.0.0'
+    description: str = ''
+    framework: str = 'Unknown'
+    dev_port: Optional[int] = None
+    scripts: Mapping[str, str] = _EMPTY_SCRIPTS  # Read-only
+    error: Optional[str] = None  # Set when package.json exists but can't be parsed
+
+
+def framework_from_deps(deps: Mapping) -> Tuple[str, Optional[int]]:
+    """(framework, default dev server port) from package.json dependencies"""
+    if 'vite' in deps:
+        return 'Vite', 5173
+    if 'react-scripts' in deps or '@vitejs/plugin-react' in deps:
+        return 'React', 3000
+    if 'next' in deps:
+        return 'Next.js', 3000
+    if 'vue' in deps:
+        return 'Vue', 8080
+    if '@angular/core' in deps:
+        return 'Angular', 4200
+    if 'svelte' in deps:
+        return 'Svelte', 5173
+    return 'Unknown', None
+
+
+def _text(value, default: str = '') -> str:
+    return value if isinstance(value, str) else default
+
+
+def _parse(manifest_path: str) -> ProjectManifest:
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            pkg = json.load(f)
+        if not isinstance(pkg, dict):
+            raise ValueError('package.json is not an object')
+    except (OSError, ValueError) as e:
+        return ProjectManifest(True, error=str(e))
+
+    deps = {}
+    for key in ('dependencies', 'devDependencies'):
+        if isinstance(pkg.get(key), dict):
+            deps.update(pkg[key])
+    framework, dev_port = framework_from_deps(deps)
+    scripts = pkg.get('scripts') if isinstance(pkg.get('scripts'), dict) else {}
+
+    return ProjectManifest(
+        True,
+        name=pkg.get('name') if isinstance(pkg.get('name'), str) else None,
+        version=_text(pkg.get('version'), '0.0.0'),
+        description=_text(pkg.get('description')),
+        framework=framework,
+        dev_port=dev_port,
+        scripts=MappingProxyType({str(k): _text(v) for k, v in scripts.items()})
+    )
+
+
+def _cost(info: ProjectManifest) -> int:
+    """Rough in-memory size of an entry's extracted fields."""
+    size = 256
+    for value in (info.name, info.version, info.description, info.error):
+        size += len(value) if value else 0
+    size += sum(len(k) + len(v) + 64 for k, v in info.scripts.items())
+    return size
+
+
+class ManifestCache:
+    """Thread-safe LRU of ProjectManifest entries within a byte budget."""
+
+    def __init__(self, byte_budget: int = DEFAULT_BYTE_BUDGET):
+        self.byte_budget = byte_budget
+        self._entries: 'OrderedDict[str, Tuple[tuple, ProjectManifest, int]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def read(self, project_dir) -> ProjectManifest:
+        """Extracted manifest fields for ``project_dir``, parsing only on change."""
+        project_dir = os.path.abspath(project_dir)
+        manifest_path = os.path.join(project_dir, 'package.json')
+        try:
+            st = os.stat(manifest_path)
+        except OSError:
+            return ProjectManifest(False)
+        key = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(project_dir)
+            if entry and entry[0] == key:
+                self._entries.move_to_end(project_dir)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        info = _parse(manifest_path)
+        cost = _cost(info)
+
+        with self._lock:
+            old = self._entries.pop(project_dir, None)
+            if old:
+                self._bytes -= old[2]
+            if cost <= self.byte_budget:
+                self._entries[project_dir] = (key, info, cost)
+                self._bytes += cost
+                while self._bytes > self.byte_budget:
+                    _, (_, _, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted
+        return info
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'byte_budget': self.byte_budget,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+# Shared by everything in this process (project manager, tray, in-process bridge)
+manifest_cache = ManifestCache()
+
+
+def read_manifest(project_dir) -> ProjectManifest:
+    """Extracted manifest fields for ``project_dir`` from the shared cache."""
+    return manifest_cache.read(project_dir)
@@ -0,0 +1,163 @@
+"""Asyncio dev server scanner.
+
+Probes every port concurrently on the event loop - no worker threads.
+IPv4 and IPv6 loopback are tried at the same time (happy eyeballs) and the
+first connection to succeed is reused for a small HTTP fingerprint request,
+so each open port costs a single TCP handshake. The whole scan is bounded
+by one overall deadline.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Common dev server ports
+DEV_SERVER_PORTS = (
+    3000, 3001, 3002, 3003,        # React, Node, Next.js
+    4200, 4201,                    # Angular
+    5000, 5001, 5002,              # Flask, Python
+    5173, 5174, 5175,              # Vite
+    8000, 8001, 8080, 8081, 8888,  # Django, general web
+    9000, 9001                     # PHP, other
+)
+
+LOOPBACK_HOSTS = ('127.0.0.1', '::1')
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+def _close(connection: Optional[Connection]):
+    if connection:
+        try:
+            connection[1].close()
+        except Exception:
+            pass
+
+
+async def open_loopback(port: int, timeout: float) -> Optional[Connection]:
+    """Connect to ``port`` on IPv4 and IPv6 loopback at once; first success wins."""
+    attempts = [asyncio.ensure_future(asyncio.open_connection(host, port)) for host in LOOPBACK_HOSTS]
+    pending = set(attempts)
+    winner = None
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    try:
+        while pending and winner is None:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is None and winner is None:
+                    winner = attempt.result()
+    finally:
+        for attempt in attempts:
+            if not attempt.done():
+                attempt.cancel()
+            elif not attempt.cancelled() and attempt.exception() is None and attempt.result() is not winner:
+                _close(attempt.result())
+
+    return winner
+
+
+def detect_framework(port: int, server_header: str, content_type: str, content: str) -> str:
+    """Guess the dev server framework from response headers, body and port"""
+    content = content.lower()
+
+    if 'vite' in server_header or 'vite' in content:
+        return 'Vite'
+    if 'webpack' in server_header or 'webpack' in content:
+        return 'Webpack Dev Server'
+    if port in (3000, 3001, 3002):
+        return 'React' if 'react' in content else 'Node.js'
+    if port in (4200, 4201):
+        return 'Angular'
+    if port in (5000, 5001):
+        return 'Flask/Python'
+    if port in (8000, 8001):
+        return 'Django' if 'django' in content else 'Python Server'
+    if 'html' in content_type:
+        return 'Web Server'
+    return 'Unknown'
+
+
+async def fingerprint(connection: Connection, port: int, max_bytes: int = 4096) -> str:
+    """Send a minimal GET over an open connection and classify the response"""
+    reader, writer = connection
+    writer.write(
+        f'GET / HTTP/1.1\r\nHost: localhost:{port}\r\n'
+        f'User-Agent: HighlightAssist/2.0\r\nAccept: text/html\r\nConnection: close\r\n\r\n'.encode('ascii')
+    )
+    await writer.drain()
+
+    data = b''
+    while len(data) < max_bytes:
+        chunk = await reader.read(max_bytes - len(data))
+        if not chunk:
+            break
+        data += chunk
+
+    head, _, body = data.partition(b'\r\n\r\n')
+    headers = {}
+    for line in head.decode('latin-1').split('\r\n')[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+
+    return detect_framework(
+        port,
+        headers.get('server', ''),
+        headers.get('content-type', ''),
+        body.decode('utf-8', errors='ignore')[:2000]
+    )
+
+
+def _server_info(port: int, framework: Optional[str]) -> dict:
+    return {
+        'port': port,
+        'status': 'running',
+        'framework': framework or 'Unknown',
+        'url': f'http://localhost:{port}',
+        'title': f'{framework} - Port {port}' if framework else f'Server - Port {port}'
+    }
+
+
+async def scan_ports(ports: Iterable[int] = DEV_SERVER_PORTS, probe_timeout: float = 0.5,
+                     deadline: float = 1.0) -> List[dict]:
+    """Scan localhost ports concurrently for running dev servers.
+
+    Args:
+        ports: Ports to probe
+        probe_timeout: Connect timeout per port (IPv4 and IPv6 raced)
+        deadline: Overall time budget; servers still fingerprinting when it
+            expires are reported with an 'Unknown' framework
+
+    Returns:
+        Running servers sorted by port
+    """
+    found: Dict[int, Optional[str]] = {}
+
+    async def probe(port: int):
+        connection = await open_loopback(port, probe_timeout)
+        if connection is None:
+            return
+        found[port] = None  # Listening - known even if fingerprinting runs out of time
+        try:
+            found[port] = await fingerprint(connection, port)
+        except Exception as e:
+            logger.debug(f'Fingerprint failed for port {port}: {e}')
+        finally:
+            _close(connection)
+
+    tasks = [asyncio.ensure_future(probe(port)) for port in ports]
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+    return [_server_info(port, found[port]) for port in sorted(found)]
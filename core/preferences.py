@@ -10,6 +10,8 @@
 import os
 import sys
 
+from core.scan_exclusions import DEFAULT_EXCLUDE_GLOBS
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +31,8 @@ class PreferencesManager:
         "scan_interval": 60,  # seconds
         "auto_scan_on_startup": True,
         "watched_directories": [],
+        # gitignore-style globs of directories never scanned (.gitignore files are honored too)
+        "scan_exclude_globs": list(DEFAULT_EXCLUDE_GLOBS),
         
         # Server management
         "default_ports": {
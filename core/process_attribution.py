@@ -0,0 +1,270 @@
+"""Attribute listening ports to the process and project that own them.
+
+A listening socket inode is mapped to its owning PID (via /proc/<pid>/fd
+on Linux, psutil elsewhere), then to that process's cwd and cmdline, then
+to the known project with the longest matching path prefix.
+
+Socket owners are cached by inode and process details by (pid, start_time),
+so once a server has been seen, attributing it again is a dictionary lookup.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from core.listeners import ListeningSocket, listening_ports, read_proc_listeners
+
+logger = logging.getLogger(__name__)
+
+# Optional dependency - only needed where /proc is unavailable
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+PROC = Path('/proc')
+
+ProcessKey = Tuple[int, float]  # (pid, start_time)
+
+
+class ProcessInfo(NamedTuple):
+    pid: int
+    start_time: float
+    cwd: Optional[str]
+    cmdline: Tuple[str, ...]
+
+
+def _normalize(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+class ServerAttributor:
+    """Maps listening sockets to processes and projects with caching."""
+
+    def __init__(self, proc_root: Path = PROC):
+        self.proc_root = proc_root
+        self._socket_owners: Dict[int, ProcessKey] = {}
+        self._processes: Dict[ProcessKey, ProcessInfo] = {}
+        self._project_matches: Dict[ProcessKey, Optional[dict]] = {}
+        self._project_paths: Tuple[str, ...] = ()
+
+    @property
+    def use_proc(self) -> bool:
+        return (self.proc_root / 'self' / 'fd').is_dir()
+
+    # --- Process lookup -------------------------------------------------
+
+    def _start_time(self, pid: int) -> Optional[float]:
+        """Process start time in clock ticks since boot (field 22 of /proc/<pid>/stat)."""
+        try:
+            stat = (self.proc_root / str(pid) / 'stat').read_text()
+            # comm (field 2) may contain spaces - fields resume after the last ')'
+            return float(stat.rsplit(')', 1)[1].split()[19])
+        except (OSError, IndexError, ValueError):
+            return None
+
+    def _scan_socket_owners(self, inodes: Dict[int, int]):
+        """Find owners of ``inodes`` ({inode: uid}) in one pass over /proc/*/fd."""
+        wanted = {f'socket:[{inode}]': inode for inode in inodes}
+        uids = set(inodes.values())
+
+        try:
+            entries = list(os.scandir(self.proc_root))
+        except OSError:
+            return
+
+        for entry in entries:
+            if not wanted:
+                break
+            if not entry.name.isdigit():
+                continue
+            try:
+                # Only the socket owner's uid can hold its fd - skip everyone else
+                if entry.stat().st_uid not in uids:
+                    continue
+                fds = os.scandir(os.path.join(entry.path, 'fd'))
+            except OSError:
+                continue
+
+            with fds:
+                for fd in fds:
+                    try:
+                        inode = wanted.pop(os.readlink(fd.path), None)
+                    except OSError:
+                        continue
+                    if inode is not None:
+                        pid = int(entry.name)
+                        start_time = self._start_time(pid)
+                        if start_time is not None:
+                            self._socket_owners[inode] = (pid, start_time)
+
+    def _load_process(self, key: ProcessKey) -> Optional[ProcessInfo]:
+        pid, start_time = key
+        if self.use_proc:
+            proc_dir = self.proc_root / str(pid)
+            try:
+                cwd = os.readlink(proc_dir / 'cwd')
+            except OSError:
+                cwd = None
+            try:
+                raw = (proc_dir / 'cmdline').read_bytes()
+                cmdline = tuple(arg.decode('utf-8', 'replace') for arg in raw.split(b'\0') if arg)
+            except OSError:
+                cmdline = ()
+        elif HAS_PSUTIL:
+            try:
+                process = psutil.Process(pid)
+                with process.oneshot():
+                    try:
+                        cwd = process.cwd()
+                    except (psutil.AccessDenied, psutil.ZombieProcess):
+                        cwd = None
+                    try:
+                        cmdline = tuple(process.cmdline())
+                    except (psutil.AccessDenied, psutil.ZombieProcess):
+                        cmdline = ()
+            except psutil.NoSuchProcess:
+                return None
+        else:
+            return None
+
+        return ProcessInfo(pid, start_time, cwd, cmdline)
+
+    def _psutil_owners(self, ports: Iterable[int]) -> Dict[int, ProcessKey]:
+        """Fallback: {port: (pid, create_time)} for listening sockets via psutil."""
+        owners = {}
+        wanted = set(ports)
+        try:
+            for conn in psutil.net_connections(kind='tcp'):
+                if conn.status == psutil.CONN_LISTEN and conn.pid and conn.laddr and conn.laddr.port in wanted:
+                    try:
+                        owners[conn.laddr.port] = (conn.pid, psutil.Process(conn.pid).create_time())
+                    except psutil.Error:
+                        continue
+        except (psutil.AccessDenied, OSError) as e:
+            logger.debug(f'psutil.net_connections unavailable: {e}')
+        return owners
+
+    # --- Project matching -----------------------------------------------
+
+    def _sync_projects(self, projects: List[dict]):
+        paths = tuple(project.get('path', '') for project in projects)
+        if paths != self._project_paths:
+            self._project_paths = paths
+            self._project_matches.clear()
+
+    @staticmethod
+    def _match_project(info: ProcessInfo, projects: List[dict]) -> Optional[dict]:
+        """Project with the longest path prefix of the process cwd (or a cmdline path)."""
+        candidates = [info.cwd] if info.cwd else []
+        candidates += [arg for arg in info.cmdline if os.path.isabs(arg)]
+
+        for candidate in candidates:
+            target = _normalize(candidate)
+            best, best_len = None, -1
+            for project in projects:
+                path = project.get('path')
+                if not path:
+                    continue
+                prefix = _normalize(path)
+                if (target == prefix or target.startswith(prefix.rstrip(os.sep) + os.sep)) and len(prefix) > best_len:
+                    best, best_len = project, len(prefix)
+            if best is not None:
+                return best
+        return None
+
+    # --- Public API -----------------------------------------------------
+
+    def attribute(self, listeners: Iterable[ListeningSocket], projects: List[dict]) -> Dict[int, dict]:
+        """Attribute listening sockets to processes and projects.
+
+        Args:
+            listeners: Listening sockets (from core.listeners.read_proc_listeners)
+            projects: Known projects, each with a 'path'
+
+        Returns:
+            {port: {'pid', 'cwd', 'cmdline', 'project'}} for every listener;
+            pid/project are None when the owner could not be determined
+        """
+        listeners = list(listeners)
+        self._sync_projects(projects)
+
+        if self.use_proc:
+            unresolved = {listener.inode: listener.uid for listener in listeners
+                          if listener.inode and listener.inode not in self._socket_owners}
+            if unresolved:
+                self._scan_socket_owners(unresolved)
+            owners = {listener.port: self._socket_owners.get(listener.inode) for listener in listeners}
+        elif HAS_PSUTIL:
+            owners = self._psutil_owners(listener.port for listener in listeners)
+            self._retain_processes(set(owners.values()))
+        else:
+            owners = {}
+
+        result = {}
+        for listener in listeners:
+            key = owners.get(listener.port)
+            info = None
+            if key is not None:
+                info = self._processes.get(key)
+                if info is None:
+                    info = self._load_process(key)
+                    if info is not None:
+                        self._processes[key] = info
+            if info is None:
+                result.setdefault(listener.port, {'pid': None, 'cwd': None, 'cmdline': (), 'project': None})
+                continue
+
+            if key not in self._project_matches:
+                self._project_matches[key] = self._match_project(info, projects)
+            result[listener.port] = {
+                'pid': info.pid,
+                'cwd': info.cwd,
+                'cmdline': info.cmdline,
+                'project': self._project_matches[key]
+            }
+
+        return result
+
+    def _prune(self, listeners: List[ListeningSocket]):
+        """Forget sockets that have closed and processes that no longer own one."""
+        live = {listener.inode for listener in listeners}
+        for inode in list(self._socket_owners):
+            if inode not in live:
+                del self._socket_owners[inode]
+
+        if self.use_proc:
+            self._retain_processes(set(self._socket_owners.values()))
+
+    def _retain_processes(self, owners: Set[ProcessKey]):
+        """Forget cached processes (and their project matches) not in ``owners``."""
+        for key in list(self._processes):
+            if key not in owners:
+                del self._processes[key]
+                self._project_matches.pop(key, None)
+
+    def running_servers(self, ports: Iterable[int], projects: List[dict]) -> Dict[int, dict]:
+        """Attribute whichever of ``ports`` are listening on localhost.
+
+        When the owning process cannot be seen (no /proc and no psutil, or
+        another user's process), falls back to the project whose configured
+        ``dev_port`` matches.
+
+        Returns:
+            {port: {'pid', 'cwd', 'cmdline', 'project'}} for listening ports
+        """
+        wanted = set(ports)
+        listeners = read_proc_listeners()
+        if listeners is None:
+            listeners = [ListeningSocket(port, '', 0, 0, -1) for port in listening_ports(wanted)]
+        else:
+            self._prune(listeners)
+
+        servers = self.attribute((listener for listener in listeners if listener.port in wanted), projects)
+        for port, server in servers.items():
+            if server['pid'] is None and server['project'] is None:
+                server['project'] = next((p for p in projects if p.get('dev_port') == port), None)
+        return servers
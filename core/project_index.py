@@ -0,0 +1,204 @@
+"""Persistent project index for incremental rescans.
+
+Remembers, per scanned directory, its (mtime, inode) and listing (whether
+it holds a project marker and which subdirectories it has), and per project
+the directory's mtime, its package.json's (mtime, size) and the analyzed
+project. A rescan stats each directory and only re-lists those whose
+(mtime, inode) changed, and only re-analyzes projects whose directory or
+package.json changed - on an unchanged tree that is a couple of stats per
+directory instead of a full walk and JSON parse. A re-listed directory's
+subdirectories are stat'ed by the listing itself, and that stat is reused
+when they are visited.
+
+A directory's mtime changes when entries are added, removed or renamed in
+it, which is exactly what invalidates its listing (and a project's
+detected type, lockfile or virtualenv).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from core.project_rules import NODE_MANIFEST
+from core.project_walker import Lister, Listing, find_project_dirs, list_dir
+from core.scan_exclusions import ExcludeMatcher
+from core.write_behind import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 4
+
+# Something modified this close to when we read it may change again within
+# the same mtime tick without the mtime moving; never trust such entries
+RACY_WINDOW_NS = 2_000_000_000
+
+Analyzer = Callable[[Path], Optional[Dict]]
+
+
+class ProjectIndex:
+    """On-disk cache of directory listings and analyzed projects."""
+
+    def __init__(self, index_file: Path):
+        self.index_file = Path(index_file)
+        self._lock = threading.Lock()
+        # path -> [[mtime_ns, st_ino], listed_ns, descend, is_project, [[subdir, st_dev, st_ino], ...], has_gitignore]
+        self._dirs: Dict[str, list] = {}
+        # project dir -> [[dir mtime_ns, package.json mtime_ns, size], analyzed_ns, project or None]
+        self._projects: Dict[str, list] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self._dirs = data.get('dirs', {})
+                self._projects = data.get('projects', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f'Ignoring unreadable project index {self.index_file}: {e}')
+
+    def save(self):
+        """Write the index if it changed (temp file + rename, never half-written)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(
+                {'version': INDEX_VERSION, 'dirs': self._dirs, 'projects': self._projects},
+                separators=(',', ':')
+            )
+            self._dirty = False
+
+        try:
+            atomic_write_text(self.index_file, data)
+        except OSError as e:
+            logger.error(f'Error saving project index: {e}')
+
+    def _lister(self, visited: Set[str]) -> Lister:
+        """Walker lister that serves unchanged directories from the index."""
+        # Stats of subdirectories taken while listing their parent in this scan
+        stats: Dict[str, os.stat_result] = {}
+
+        def lister(path: str, descend: bool) -> Listing:
+            visited.add(path)
+            st = stats.pop(path, None)
+            try:
+                st = st or os.stat(path)
+            except OSError:
+                return False, [], False
+            signature = [st.st_mtime_ns, st.st_ino]
+
+            with self._lock:
+                cached = self._dirs.get(path)
+            if (cached and cached[0] == signature and cached[1] - st.st_mtime_ns > RACY_WINDOW_NS
+                    and (cached[2] or not descend)):
+                subdirs = [(subdir, (dev, ino)) for subdir, dev, ino in cached[4]] if descend else []
+                return cached[3], subdirs, cached[5] and descend
+
+            listed_ns = time.time_ns()
+            is_project, subdirs, has_gitignore = list_dir(path, descend, stats=stats)
+            with self._lock:
+                self._dirs[path] = [
+                    signature, listed_ns, descend, is_project,
+                    [[subdir, key[0], key[1]] for subdir, key in subdirs], has_gitignore
+                ]
+                self._dirty = True
+            return is_project, subdirs, has_gitignore
+
+        return lister
+
+    def _project(self, project_dir: str, analyze: Analyzer) -> Optional[Dict]:
+        """Analyzed project for ``project_dir``, re-analyzed only if it changed."""
+        try:
+            dir_mtime = os.stat(project_dir).st_mtime_ns
+        except OSError:
+            return None
+        try:
+            st = os.stat(os.path.join(project_dir, NODE_MANIFEST))
+            signature = [dir_mtime, st.st_mtime_ns, st.st_size]
+        except OSError:
+            signature = [dir_mtime, None, None]
+        newest = max(dir_mtime, signature[1] or 0)
+
+        with self._lock:
+            cached = self._projects.get(project_dir)
+        if cached and cached[0] == signature and cached[1] - newest > RACY_WINDOW_NS:
+            return cached[2]
+
+        analyzed_ns = time.time_ns()
+        project = analyze(Path(project_dir))
+        with self._lock:
+            self._projects[project_dir] = [signature, analyzed_ns, project]
+            self._dirty = True
+        return project
+
+    def _prune(self, root: str, max_depth: int, visited: Set[str], project_dirs: Set[str]):
+        """Drop entries a walk of ``root`` would have reached but no longer did.
+
+        Entries deeper than ``max_depth`` are left alone - they may belong to
+        another (nested) root.
+        """
+        prefix = root.rstrip(os.sep) + os.sep
+        base = prefix.count(os.sep)
+
+        def reachable(path: str, limit: int) -> bool:
+            if path == root:
+                return True
+            return path.startswith(prefix) and path.count(os.sep) - base + 1 <= limit
+
+        with self._lock:
+            stale_dirs = [p for p in self._dirs if p not in visited and reachable(p, max_depth)]
+            stale_projects = [p for p in self._projects if p not in project_dirs and reachable(p, max_depth)]
+            for path in stale_dirs:
+                del self._dirs[path]
+            for path in stale_projects:
+                del self._projects[path]
+            if stale_dirs or stale_projects:
+                self._dirty = True
+
+    def scan(self, root, max_depth: int, analyze: Analyzer,
+             excludes: Optional[ExcludeMatcher] = None,
+             on_project: Optional[Callable[[Dict], None]] = None,
+             cancelled: Optional[Callable[[], bool]] = None) -> List[Dict]:
+        """Find and analyze projects under ``root``, reusing unchanged work.
+
+        Args:
+            root: Directory to scan
+            max_depth: Maximum depth to search
+            analyze: ``analyze(project_dir)`` -> project dict or None
+            excludes: Exclusion globs for this root (.gitignore files are honored too)
+            on_project: Called with each project as it is analyzed
+            cancelled: Polled during the scan; once True the scan stops early
+                and returns a partial result (the index is not pruned)
+
+        Returns:
+            Detected projects (copies - safe for callers to modify)
+        """
+        root = os.path.abspath(root)
+        visited: Set[str] = set()
+        projects = []
+
+        lister = self._lister(visited)
+        excludes = excludes or ExcludeMatcher()
+        cancelled = cancelled or (lambda: False)
+        project_dirs = find_project_dirs(root, max_depth, lister=lister, excludes=excludes, cancelled=cancelled)
+
+        for project_dir in project_dirs:
+            if cancelled():
+                return projects
+            project = self._project(project_dir, analyze)
+            if project:
+                projects.append(dict(project))
+                if on_project:
+                    on_project(projects[-1])
+
+        if not cancelled():
+            self._prune(root, max_depth, visited, set(project_dirs))
+        return projects
@@ -5,75 +5,196 @@
 import os
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, Iterable, List, Dict, Optional, Set
 from datetime import datetime
 
+from core.port_scanner import DEV_SERVER_PORTS
+from core.process_attribution import ServerAttributor
+from core.project_index import ProjectIndex
+from core.project_rules import detect_project
+from core.project_search import ProjectSearchIndex
+from core.project_store import ProjectStore, open_project_store
+from core.project_walker import is_under
+from core.project_watcher import ProjectWatcher
+from core.scan_exclusions import DEFAULT_EXCLUDE_GLOBS, ExcludeMatcher, compile_excludes
+from core.server_discovery import DiscoverySnapshot, ServerDiscovery
+from core.single_flight import SingleFlight
+from core.write_behind import WriteBehind, atomic_write_text
+
 logger = logging.getLogger(__name__)
 
+# Recent projects shown in menus and saved to projects.json
+RECENT_LIMIT = 20
+
+# Re-stamped whenever a project is re-analyzed; not a change to the recent list
+RECENT_VOLATILE_FIELDS = frozenset({'last_detected'})
+
+# Forced scans finishing less than this many seconds ago are reused
+SCAN_RESULT_TTL = 2.0
+
+# How deep below each project root projects are looked for
+SCAN_DEPTH = 2
+
+
+def _comparable(projects: List[Dict]) -> List[Dict]:
+    return [{k: v for k, v in project.items() if k not in RECENT_VOLATILE_FIELDS} for project in projects]
+
+
+def default_config_dir() -> Path:
+    """Default config directory (AppData/Local/HighlightAssist, ~/.local/share/HighlightAssist elsewhere)"""
+    return Path(os.getenv('LOCALAPPDATA', os.path.expanduser('~/.local/share'))) / 'HighlightAssist'
+
+
+def load_saved_projects(projects_file: Optional[Path] = None) -> List[Dict]:
+    """Read saved projects without a ProjectManager (e.g. from the bridge process)"""
+    projects_file = projects_file or default_config_dir() / 'projects.json'
+    try:
+        if projects_file.exists():
+            with open(projects_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                return data.get('projects', [])
+    except Exception as e:
+        logger.error(f'Error loading projects: {e}')
+    
+    return []
+
 
 class ProjectManager:
     """Manages project detection and suggestions"""
     
-    def __init__(self, config_dir: Optional[Path] = None):
+    def __init__(self, config_dir: Optional[Path] = None,
+                 watched_directories: Optional[Callable[[], List[str]]] = None,
+                 exclude_globs: Optional[Callable[[], List[str]]] = None):
         """Initialize project manager
         
         Args:
             config_dir: Directory to store project config (default: AppData/Local/HighlightAssist)
+            watched_directories: Returns extra project roots to scan and watch
+                (e.g. the watched_directories preference)
+            exclude_globs: Returns gitignore-style globs of directories never
+                scanned (e.g. the scan_exclude_globs preference)
         """
         if config_dir is None:
-            config_dir = Path(os.getenv('LOCALAPPDATA', os.path.expanduser('~/.local/share'))) / 'HighlightAssist'
+            config_dir = default_config_dir()
         
         self.config_dir = Path(config_dir)
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.projects_file = self.config_dir / 'projects.json'
+        self._writer = WriteBehind(self._write_projects, name='ProjectsWriter')
+        
+        # Directory/manifest cache that makes rescans incremental
+        self.index = ProjectIndex(self.config_dir / 'project_index.json')
+        self._index_writer = WriteBehind(self.index.save, name='ProjectIndexWriter')
+        
+        # Every known project (detected under the scan roots or opened by the
+        # user), kept live by the watcher; recent projects are a query on it
+        self.watched_directories = watched_directories or (lambda: [])
+        self.store: ProjectStore = open_project_store(self.config_dir / 'projects.db')
+        self.search_index = ProjectSearchIndex()
+        self.exclude_globs = exclude_globs or (lambda: DEFAULT_EXCLUDE_GLOBS)
+        self._excludes: Dict[str, tuple] = {}  # root -> (globs, compiled matcher)
+        self.watcher = ProjectWatcher(self.scan_roots, self.rescan_roots, max_depth=SCAN_DEPTH, excluded=self._excluded)
+        
+        # Port -> PID -> project attribution (shared by tray, dashboard and health server)
+        self._attributor = ServerAttributor()
+        self._attributor_lock = threading.Lock()
+        # Catalog snapshot for discovery refreshes; dropped whenever the store changes
+        self._known: Optional[List[Dict]] = None
+        self._known_generation = 0
+        self._known_lock = threading.Lock()
+        
+        # Background discovery; started by the service manager via start_discovery()
+        self.discovery = ServerDiscovery(self.find_running_servers, self._discovery_ports, lambda: 60)
+        
+        # Scan progress, reported by /projects; rescans run one at a time so a
+        # scan queued behind another hits the index the first one warmed
+        self._rescan_lock = threading.Lock()
+        self._scan_status_lock = threading.Lock()
+        self._scan_status = {'in_progress': False, 'roots_total': 0, 'roots_scanned': 0, 'projects_found': 0}
+        # Concurrent forced scans (/projects/scan) share one run
+        self._scan_flight = SingleFlight()
         
-        # Load saved projects
+        # Catalog change listeners (e.g. the /events stream)
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._listeners_lock = threading.Lock()
+        
+        # Load saved projects (projects.json stays the list of recent projects
+        # other processes read; the store is seeded from it)
         self.projects = self._load_projects()
+        self.store.import_recent(self.projects)
+        self.projects = self._recent()
+        for project in self.store.all():
+            self.search_index.add(project.get('path', ''), project.get('name', ''))
         
-        # Auto-scan on first run if no projects found
+        # Auto-scan on first run if no projects found (in the background, so
+        # the service can open its ports right away)
+        self._initial_scan: Optional[threading.Thread] = None
         if not self.projects:
-            logger.info('No saved projects found, performing initial scan...')
-            try:
-                detected = self.scan_common_directories()
-                for project in detected:
-                    self.add_recent_project(project)
-                logger.info(f'Initial scan complete: {len(detected)} projects found')
-            except Exception as e:
-                logger.error(f'Initial scan failed: {e}')
+            logger.info('No saved projects found, starting initial scan in the background...')
+            self._scan_status['in_progress'] = True  # Reported before the thread gets going
+            self._initial_scan = threading.Thread(target=self._run_initial_scan, daemon=True, name='InitialProjectScan')
+            self._initial_scan.start()
         
         logger.info(f'Project manager initialized with {len(self.projects)} saved projects')
     
-    def _load_projects(self) -> List[Dict]:
-        """Load projects from config file"""
+    def _run_initial_scan(self):
+        """Seed recent projects from the scan roots, publishing each root as it completes"""
         try:
-            if self.projects_file.exists():
-                with open(self.projects_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get('projects', [])
+            detected = self.rescan_roots(self.scan_roots(), on_root=self._add_detected)
+            logger.info(f'Initial scan complete: {len(detected)} projects found')
         except Exception as e:
-            logger.error(f'Error loading projects: {e}')
+            logger.error(f'Initial scan failed: {e}')
+    
+    def _add_detected(self, root: str, projects: List[Dict]):
+        for project in projects:
+            self.add_recent_project(dict(project))
+    
+    def scan_status(self) -> Dict:
+        """Progress of the current (or last) project scan
         
-        return []
+        Returns:
+            {'in_progress', 'roots_total', 'roots_scanned', 'projects_found'}
+        """
+        with self._scan_status_lock:
+            return dict(self._scan_status)
+    
+    def _load_projects(self) -> List[Dict]:
+        """Load projects from config file"""
+        return load_saved_projects(self.projects_file)
     
     def _save_projects(self):
-        """Save projects to config file"""
-        try:
-            data = {
-                'projects': self.projects,
-                'last_updated': datetime.now().isoformat()
-            }
-            with open(self.projects_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.error(f'Error saving projects: {e}')
+        """Schedule a save of projects to the config file
+        
+        Saves are write-behind: bursts (e.g. a bulk import) are coalesced into
+        one atomic write after a short debounce, or at flush()/shutdown.
+        """
+        self._writer.mark_dirty()
     
-    def scan_directory(self, directory: Path, max_depth: int = 3) -> List[Dict]:
-        """Scan directory for projects with package.json
+    def _write_projects(self):
+        """Write projects to config file (atomic temp file + rename)"""
+        data = {
+            'projects': self.projects,
+            'last_updated': datetime.now().isoformat()
+        }
+        atomic_write_text(self.projects_file, json.dumps(data, indent=2))
+    
+    def flush(self):
+        """Write any pending project and index changes now (call at shutdown)"""
+        self._writer.flush()
+        self._index_writer.flush()
+    
+    def scan_directory(self, directory: Path, max_depth: int = 3,
+                       on_project: Optional[Callable[[Dict], None]] = None,
+                       cancelled: Optional[Callable[[], bool]] = None) -> List[Dict]:
+        """Scan directory for projects (package.json, manage.py or app.py)
         
         Args:
             directory: Root directory to scan
             max_depth: Maximum depth to search
+            on_project: Called with each project as it is found
+            cancelled: Polled during the scan; once True it stops early
             
         Returns:
             List of detected projects
@@ -81,93 +202,66 @@ def scan_directory(self, directory: Path, max_depth: int = 3) -> List[Dict]:
         projects = []
         
         try:
-            directory = Path(directory)
-            if not directory.exists() or not directory.is_dir():
-                return projects
-            
-            # Recursive scan with depth limit
-            def scan_recursive(path: Path, depth: int = 0):
-                if depth > max_depth:
-                    return
-                
-                try:
-                    # Check for package.json
-                    package_json = path / 'package.json'
-                    if package_json.exists():
-                        project = self._analyze_project(path, package_json)
-                        if project:
-                            projects.append(project)
-                        return  # Don't scan subdirectories of detected projects
-                    
-                    # Scan subdirectories
-                    for item in path.iterdir():
-                        if item.is_dir() and not item.name.startswith('.') and item.name not in ['node_modules', 'dist', 'build', '__pycache__']:
-                            scan_recursive(item, depth + 1)
-                            
-                except PermissionError:
-                    pass  # Skip directories we can't access
-                except Exception as e:
-                    logger.debug(f'Error scanning {path}: {e}')
-            
-            scan_recursive(directory)
+            # Only directories/manifests that changed since the last scan are re-read
+            projects = self.index.scan(directory, max_depth, self._analyze_project,
+                                       self._excludes_for(str(Path(directory).absolute())),
+                                       on_project, cancelled)
+            self._index_writer.mark_dirty()
             
         except Exception as e:
             logger.error(f'Error scanning directory {directory}: {e}')
         
         return projects
     
-    def _analyze_project(self, path: Path, package_json: Path) -> Optional[Dict]:
+    def _excludes_for(self, root: str) -> ExcludeMatcher:
+        """Compiled exclusion globs for ``root`` (recompiled only when the globs change)"""
+        try:
+            globs = tuple(self.exclude_globs() or ())
+        except Exception as e:
+            logger.error(f'Error reading exclusion globs: {e}')
+            globs = tuple(DEFAULT_EXCLUDE_GLOBS)
+        cached = self._excludes.get(root)
+        if cached is None or cached[0] != globs:
+            cached = (globs, compile_excludes(root, globs))
+            self._excludes[root] = cached
+        return cached[1]
+    
+    def _excluded(self, root: str, path: str) -> bool:
+        """Whether the exclusion globs skip directory ``path`` under ``root`` (for the watcher)"""
+        return self._excludes_for(root).excluded(path)
+    
+    def _analyze_project(self, path: Path) -> Optional[Dict]:
         """Analyze project and extract metadata
         
         Args:
             path: Project directory
-            package_json: Path to package.json
             
         Returns:
             Project metadata dict or None
         """
         try:
-            with open(package_json, 'r', encoding='utf-8') as f:
-                pkg = json.load(f)
-            
-            # Detect framework
-            framework = 'Unknown'
-            dev_server_port = None
-            
-            deps = {**pkg.get('dependencies', {}), **pkg.get('devDependencies', {})}
-            
-            if 'vite' in deps:
-                framework = 'Vite'
-                dev_server_port = 5173
-            elif 'react-scripts' in deps or '@vitejs/plugin-react' in deps:
-                framework = 'React'
-                dev_server_port = 3000
-            elif 'next' in deps:
-                framework = 'Next.js'
-                dev_server_port = 3000
-            elif 'vue' in deps:
-                framework = 'Vue'
-                dev_server_port = 8080
-            elif '@angular/core' in deps:
-                framework = 'Angular'
-                dev_server_port = 4200
-            elif 'svelte' in deps:
-                framework = 'Svelte'
-                dev_server_port = 5173
+            # Same rule table as the bridge's auto-detect; package.json is
+            # parsed once per change, shared with the tray and bridge
+            detection = detect_project(path)
+            info = detection.manifest
+            if detection.rule is None or (detection.is_node and info.error):
+                logger.debug(f'Error analyzing project at {path}: {info.error or "no project marker"}')
+                return None
             
             # Check for dev script
-            scripts = pkg.get('scripts', {})
-            has_dev_script = 'dev' in scripts or 'start' in scripts or 'serve' in scripts
+            scripts = info.scripts
+            has_dev_script = 'dev' in scripts or 'start' in scripts or 'serve' in scripts or not detection.is_node
             
             return {
-                'name': pkg.get('name', path.name),
+                'name': info.name or path.name,
                 'path': str(path.absolute()),
-                'framework': framework,
-                'version': pkg.get('version', '0.0.0'),
-                'description': pkg.get('description', ''),
-                'dev_port': dev_server_port,
+                'framework': detection.framework,
+                'version': info.version,
+                'description': info.description,
+                'dev_port': detection.dev_port,
                 'has_dev_script': has_dev_script,
                 'scripts': list(scripts.keys()),
+                'command': detection.command,
                 'last_detected': datetime.now().isoformat()
             }
             
@@ -175,15 +269,8 @@ def _analyze_project(self, path: Path, package_json: Path) -> Optional[Dict]:
             logger.debug(f'Error analyzing project at {path}: {e}')
             return None
     
-    def scan_common_directories(self) -> List[Dict]:
-        """Scan common development directories for projects
-        
-        Returns:
-            List of detected projects
-        """
-        all_projects = []
-        
-        # Common dev directories
+    def scan_roots(self) -> List[str]:
+        """Existing project roots: common dev directories plus watched_directories"""
         common_dirs = [
             Path('D:/Projects'),
             Path(os.path.expanduser('~/Documents/Projects')),
@@ -193,33 +280,194 @@ def scan_common_directories(self) -> List[Dict]:
             Path('C:/Projects'),
             Path('C:/Dev'),
         ]
+        try:
+            watched = [Path(os.path.expanduser(d)) for d in self.watched_directories() or []]
+        except Exception as e:
+            logger.error(f'Error reading watched directories: {e}')
+            watched = []
+        
+        roots = []
+        for directory in common_dirs + watched:
+            root = str(directory.absolute())
+            if root not in roots and directory.is_dir():
+                roots.append(root)
+        return roots
+    
+    def scan_common_directories(self) -> List[Dict]:
+        """Scan common development directories for projects
+        
+        Returns:
+            List of detected projects
+        """
+        return self.rescan_roots(self.scan_roots())
+    
+    def scan_projects(self, max_age: float = SCAN_RESULT_TTL) -> List[Dict]:
+        """Scan common directories, shared with concurrent callers
+        
+        Args:
+            max_age: Reuse a scan that finished less than this many seconds ago
+            
+        Returns:
+            List of detected projects
+        """
+        return self._scan_flight.do('projects', self.scan_common_directories, max_age)
+    
+    def rescan_roots(self, roots: List[str],
+                     on_root: Optional[Callable[[str, List[Dict]], None]] = None,
+                     on_project: Optional[Callable[[str, Dict], None]] = None,
+                     cancelled: Optional[Callable[[], bool]] = None) -> List[Dict]:
+        """Rescan project roots (incrementally) and update the catalog
         
-        for directory in common_dirs:
-            if directory.exists():
-                logger.info(f'Scanning {directory} for projects...')
-                projects = self.scan_directory(directory, max_depth=2)
-                all_projects.extend(projects)
-                logger.info(f'Found {len(projects)} projects in {directory}')
+        Args:
+            roots: Root directories to rescan
+            on_root: Called with (root, projects) as each root completes
+            on_project: Called with (root, project) as each project is found
+            cancelled: Polled during the scan; once True the scan stops, and
+                the root it was in is left as it was in the catalog
+            
+        Returns:
+            Projects found under those roots
+        """
+        cancelled = cancelled or (lambda: False)
+        all_projects = []
+        # Every configured root, not just those rescanned, can nest inside one
+        all_roots = list(dict.fromkeys([*roots, *self.scan_roots()]))
+        
+        with self._rescan_lock:
+            with self._scan_status_lock:
+                self._scan_status = {'in_progress': True, 'roots_total': len(roots), 'roots_scanned': 0, 'projects_found': 0}
+            try:
+                for directory in roots:
+                    if cancelled():
+                        logger.info('Project scan cancelled')
+                        break
+                    logger.info(f'Scanning {directory} for projects...')
+                    projects = self.scan_directory(
+                        Path(directory), max_depth=SCAN_DEPTH, cancelled=cancelled,
+                        on_project=(lambda project, root=directory: on_project(root, project)) if on_project else None
+                    )
+                    if cancelled():
+                        logger.info(f'Project scan cancelled in {directory}')
+                        break
+                    self._update_catalog(directory, projects, all_roots)
+                    all_projects.extend(projects)
+                    logger.info(f'Found {len(projects)} projects in {directory}')
+                    
+                    with self._scan_status_lock:
+                        self._scan_status['roots_scanned'] += 1
+                        self._scan_status['projects_found'] += len(projects)
+                    if on_root:
+                        on_root(directory, projects)
+            finally:
+                with self._scan_status_lock:
+                    self._scan_status['in_progress'] = False
         
         return all_projects
     
+    def _update_catalog(self, root: str, projects: List[Dict], roots: Iterable[str] = ()):
+        """Replace the catalog entries under ``root`` and refresh matching recent projects
+        
+        Args:
+            root: Root that was just scanned
+            projects: Projects the scan found
+            roots: All project roots; entries under a root nested inside
+                ``root`` belong to that root's scan and are left alone
+        """
+        nested = [other for other in roots if other != root and is_under(other, root)]
+        
+        def vanished(path: str) -> bool:
+            return not os.path.isdir(path)
+        
+        def reachable(path: str) -> bool:
+            # A vanished directory is gone whichever scan found it. Otherwise a
+            # nested root's own scan decides about its entries; anything else
+            # this walk didn't find (now excluded or gitignored too) is no longer
+            # detected.
+            return vanished(path) or not any(is_under(path, other) for other in nested)
+        
+        added, removed = self.store.replace_under(root, projects, SCAN_DEPTH, reachable, vanished)
+        self._catalog_changed()
+        for path in removed:
+            logger.info(f'Project removed: {path}')
+            self.search_index.remove(path)
+        for project in projects:
+            self.search_index.add(project['path'], project.get('name', ''))
+        for path in added:
+            logger.info(f'Project detected: {path}')
+        
+        # Vanished projects drop out of the recent list, changed metadata shows up in it
+        recent_changed = self._refresh_recent()
+        if added or removed or recent_changed:
+            self._publish({'root': root, 'added': added, 'removed': removed, 'recent_changed': recent_changed})
+    
+    def _recent(self) -> List[Dict]:
+        """Most recently used projects whose directory still exists"""
+        # Fetch extra to make up for vanished ones (e.g. on an unmounted drive,
+        # which the store keeps)
+        recent = self.store.recent(2 * RECENT_LIMIT)
+        return [project for project in recent if os.path.isdir(project.get('path', ''))][:RECENT_LIMIT]
+    
+    def _refresh_recent(self) -> bool:
+        recent = self._recent()
+        if _comparable(recent) == _comparable(self.projects):
+            return False
+        self.projects = recent
+        self._save_projects()
+        return True
+    
+    def subscribe(self, listener: Callable[[Dict], None]) -> Callable[[], None]:
+        """Call ``listener(change)`` whenever the catalog or the recent list changes
+        
+        ``change`` is {'root', 'added', 'removed', 'recent_changed'} (root is
+        None when a project was opened). Listeners run on the scanning or
+        watcher thread and must not block.
+        
+        Returns:
+            A function that unsubscribes the listener
+        """
+        with self._listeners_lock:
+            self._listeners.append(listener)
+        
+        def unsubscribe():
+            with self._listeners_lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+        
+        return unsubscribe
+    
+    def _publish(self, change: Dict):
+        with self._listeners_lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(change)
+            except Exception as e:
+                logger.error(f'Project change listener failed: {e}', exc_info=True)
+    
+    def start_watching(self):
+        """Keep the catalog live: watch the project roots for changes"""
+        self.watcher.start()
+    
+    def stop_watching(self):
+        """Stop watching project roots"""
+        self.watcher.stop()
+    
     def add_recent_project(self, project: Dict):
         """Add or update a recently used project
         
         Args:
             project: Project metadata dict
         """
-        # Remove if already exists
-        self.projects = [p for p in self.projects if p.get('path') != project.get('path')]
-        
-        # Add to front (most recent)
-        project['last_used'] = datetime.now().isoformat()
-        self.projects.insert(0, project)
-        
-        # Keep only last 20
-        self.projects = self.projects[:20]
+        # Most recent first; older entries stay in the store, just not in the recent list
+        path = project.get('path', '')
+        known = bool(self.store.get([path]))
+        project['last_used'] = self.store.touch(project)
+        self._catalog_changed()
+        self.search_index.add(path, project.get('name', ''))
+        self.projects = self._recent()
         
         self._save_projects()
+        self._publish({'root': None, 'added': [] if known else [path], 'removed': [], 'recent_changed': True})
     
     def get_suggestions(self, include_scan: bool = False) -> Dict:
         """Get project suggestions
@@ -230,27 +478,113 @@ def get_suggestions(self, include_scan: bool = False) -> Dict:
         Returns:
             Dict with recent and detected projects
         """
+        detected = self.store.detected()
+        
         result = {
             'recent': self.projects,
-            'detected': []
+            'detected': detected  # Kept live by the watcher
         }
         
         if include_scan:
-            result['detected'] = self.scan_common_directories()
+            result['detected'] = self.scan_projects()
         
         return result
     
-    def search_projects(self, query: str) -> List[Dict]:
-        """Search projects by name or path
+    def search_projects(self, query: str, limit: int = 20) -> List[Dict]:
+        """Fuzzy search over all known projects' names and paths
         
         Args:
-            query: Search query
+            query: Search query (short queries match word prefixes)
+            limit: Maximum number of results
+            
+        Returns:
+            Matching projects, best match first, each with a 'score'
+        """
+        hits = self.search_index.search(query, limit)
+        scores = {hit.path: hit.score for hit in hits}
+        return [{**project, 'score': scores[project['path']]}
+                for project in self.store.get([hit.path for hit in hits])]
+    
+    def find_projects(self, name: Optional[str] = None, framework: Optional[str] = None,
+                      dev_port: Optional[int] = None) -> List[Dict]:
+        """Known projects matching all given fields (indexed lookup)
+        
+        Args:
+            name: Project name (case-insensitive)
+            framework: Framework, e.g. 'Vite'
+            dev_port: Configured dev server port
             
         Returns:
             Matching projects
         """
-        query = query.lower()
-        return [
-            p for p in self.projects
-            if query in p.get('name', '').lower() or query in p.get('path', '').lower()
-        ]
+        return self.store.find(name=name, framework=framework, dev_port=dev_port)
+    
+    def find_running_servers(self, ports: Iterable[int]) -> Dict[int, Dict]:
+        """Find which of ``ports`` are listening and which project owns each
+        
+        Args:
+            ports: Ports to check
+            
+        Returns:
+            {port: {'pid', 'cwd', 'cmdline', 'project'}}; project is None for
+            servers that don't belong to a known project
+        """
+        projects = self._known_projects()
+        with self._attributor_lock:
+            return self._attributor.running_servers(ports, projects)
+    
+    def _discovery_ports(self) -> Set[int]:
+        """Common dev server ports plus every known project's dev port"""
+        ports = set(DEV_SERVER_PORTS)
+        ports.update(p['dev_port'] for p in self._known_projects() if isinstance(p.get('dev_port'), int))
+        return ports
+    
+    def _known_projects(self) -> List[Dict]:
+        """Every catalog entry, read from the store only after it changed"""
+        with self._known_lock:
+            known, generation = self._known, self._known_generation
+        if known is None:
+            known = self.store.all()
+            with self._known_lock:
+                if generation == self._known_generation:
+                    self._known = known
+        return known
+    
+    def _catalog_changed(self):
+        with self._known_lock:
+            self._known = None
+            self._known_generation += 1
+    
+    def start_discovery(self, interval: Optional[Callable[[], float]] = None):
+        """Start background server discovery
+        
+        Args:
+            interval: Returns the refresh interval in seconds (e.g. the
+                scan_interval preference); re-read every cycle
+        """
+        if interval is not None:
+            self.discovery.interval = interval
+        self.discovery.start()
+    
+    def stop_discovery(self):
+        """Stop background server discovery"""
+        self.discovery.stop()
+    
+    def get_discovery_snapshot(self) -> DiscoverySnapshot:
+        """Latest discovery snapshot (never probes)"""
+        return self.discovery.snapshot
+    
+    def get_detected_servers(self) -> List[Dict]:
+        """Running dev servers from the latest discovery snapshot (never probes)"""
+        return [server.to_dict() for server in self.discovery.snapshot.servers]
+    
+    def scan_running_servers(self, max_age: float = SCAN_RESULT_TTL) -> List[Dict]:
+        """Force a discovery refresh (coalesced with concurrent callers)
+        
+        Args:
+            max_age: Reuse a refresh that finished less than this many seconds ago
+            
+        Returns:
+            Running dev servers from the fresh snapshot
+        """
+        return [server.to_dict() for server in self.discovery.refresh(max_age).servers]
@@ -0,0 +1,181 @@
+"""Declarative project type detection.
+
+What kind of project a directory holds, how to start it and on which port
+is decided by the rule tables below. Every rule is evaluated against one
+``os.scandir`` listing of the directory (entry types come from the listing,
+so no stat per rule); only a Node project's package.json is read, through
+the shared manifest cache.
+
+Used by the project scanner (ProjectManager), the walker (which marker
+files make a directory a project), the project watcher, the tray and the
+bridge's auto-detect, so they all agree on what a project is.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+from core.manifest_cache import ProjectManifest, read_manifest
+
+logger = logging.getLogger(__name__)
+
+NODE_MANIFEST = 'package.json'
+
+
+class ProjectRule(NamedTuple):
+    marker: str  # File whose presence triggers the rule
+    project_type: str
+    framework: Optional[str]  # None: from package.json dependencies
+    port: Optional[int]  # None: from package.json
+    command: Optional[str]  # '{python}' is the venv's interpreter; None: from package.json scripts
+    scan: bool  # Marks a project when scanning project roots
+
+
+# First matching rule wins. Python markers come first: a Django app with a
+# package.json for its frontend assets is still started with runserver.
+PROJECT_RULES: Tuple[ProjectRule, ...] = (
+    ProjectRule('manage.py', 'Django', 'Django', 8000, '{python} manage.py runserver', True),
+    ProjectRule('app.py', 'Python (Flask/FastAPI)', 'Flask/FastAPI', 5000, '{python} app.py', True),
+    # Too common outside web apps to mark a project on its own when scanning
+    ProjectRule('main.py', 'Python (Flask/FastAPI)', 'Flask/FastAPI', 5000, '{python} main.py', False),
+    ProjectRule(NODE_MANIFEST, 'Node.js', None, None, None, True),
+)
+
+# First present decides the package manager
+LOCKFILES: Tuple[Tuple[str, str], ...] = (
+    ('yarn.lock', 'yarn'),
+    ('pnpm-lock.yaml', 'pnpm'),
+    ('package-lock.json', 'npm'),
+)
+
+# First present is the project's virtualenv
+VENV_DIRS: Tuple[str, ...] = ('.venv', 'venv', 'env')
+
+# Unknown project defaults (what auto-detect has always suggested)
+DEFAULT_COMMAND = 'npm run dev'
+DEFAULT_PORT = 3000
+
+
+# --- Compiled once ------------------------------------------------------
+
+def _ranks(names) -> Dict[str, int]:
+    return {name: rank for rank, name in enumerate(names)}
+
+
+_RULE_RANK = _ranks(rule.marker for rule in PROJECT_RULES)
+_LOCKFILE_RANK = _ranks(name for name, _ in LOCKFILES)
+_LOCKFILE_MANAGER = dict(LOCKFILES)
+_VENV_RANK = _ranks(VENV_DIRS)
+
+# Files that make a directory a project when scanning
+PROJECT_MARKERS: FrozenSet[str] = frozenset(rule.marker for rule in PROJECT_RULES if rule.scan)
+
+# Every file name some rule looks at (changes to these can change a detection)
+RULE_FILES: FrozenSet[str] = frozenset(_RULE_RANK) | frozenset(_LOCKFILE_RANK)
+
+
+class DirContents(NamedTuple):
+    files: FrozenSet[str]
+    dirs: FrozenSet[str]
+
+
+def read_dir_contents(path) -> DirContents:
+    """File and directory names in ``path`` from a single scandir."""
+    files, dirs = set(), set()
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        dirs.add(entry.name)
+                    elif entry.is_file():
+                        files.add(entry.name)
+                except OSError:
+                    continue
+    except OSError as e:
+        logger.debug(f'Cannot list {path}: {e}')
+    return DirContents(frozenset(files), frozenset(dirs))
+
+
+def _first(names: FrozenSet[str], ranks: Dict[str, int]) -> Optional[str]:
+    hits = names & ranks.keys()
+    return min(hits, key=ranks.__getitem__) if hits else None
+
+
+# --- Detection ------------------------------------------------------------
+
+class Detection(NamedTuple):
+    rule: Optional[ProjectRule]  # None: not a recognized project
+    project_type: str
+    framework: str
+    command: str
+    dev_port: Optional[int]  # None when nothing says which port
+    venv: Optional[str]
+    lockfile: Optional[str]  # 'yarn', 'pnpm', 'npm' or None
+    manifest: ProjectManifest
+
+    @property
+    def is_node(self) -> bool:
+        return self.rule is not None and self.rule.marker == NODE_MANIFEST
+
+    @property
+    def package_manager(self) -> str:
+        return self.lockfile or 'npm'
+
+
+def _python(venv: Optional[str]) -> str:
+    if not venv:
+        return 'python'
+    if sys.platform.startswith('win'):
+        return f'{venv}\\Scripts\\python.exe'
+    return f'{venv}/bin/python'
+
+
+def _node(manifest: ProjectManifest, lockfile: Optional[str]) -> Tuple[str, str, Optional[int]]:
+    """(project type, command, dev port) from package.json scripts and dependencies"""
+    scripts = manifest.scripts
+    project_type, command, port = 'Unknown', DEFAULT_COMMAND, manifest.dev_port
+    if 'dev' in scripts:
+        project_type, command = 'Node.js (npm)', 'npm run dev'
+        if 'vite' in scripts['dev'].lower():
+            project_type, port = 'Vite', 5173
+    elif 'start' in scripts:
+        project_type, command = 'Node.js (npm)', 'npm start'
+
+    if lockfile in ('yarn', 'pnpm'):
+        project_type = project_type.replace('npm', lockfile)
+        command = command.replace('npm', lockfile)
+    return project_type, command, port
+
+
+def detect_project(path, contents: Optional[DirContents] = None) -> Detection:
+    """Evaluate the rule tables against ``path``.
+
+    Args:
+        path: Project directory
+        contents: Its listing, if the caller already has one
+
+    Returns:
+        Detection; ``rule`` is None if no rule matched
+    """
+    if contents is None:
+        contents = read_dir_contents(path)
+
+    marker = _first(contents.files, _RULE_RANK)
+    rule = PROJECT_RULES[_RULE_RANK[marker]] if marker else None
+    lockfile_name = _first(contents.files, _LOCKFILE_RANK)
+    lockfile = _LOCKFILE_MANAGER[lockfile_name] if lockfile_name else None
+    venv = _first(contents.dirs, _VENV_RANK)
+    manifest = read_manifest(path) if NODE_MANIFEST in contents.files else ProjectManifest(False)
+
+    if rule is None:
+        return Detection(None, 'Unknown', 'Unknown', DEFAULT_COMMAND, None, venv, lockfile, manifest)
+
+    if rule.marker == NODE_MANIFEST:
+        project_type, command, port = _node(manifest, lockfile)
+        return Detection(rule, project_type, manifest.framework, command, port, venv, lockfile, manifest)
+
+    return Detection(rule, rule.project_type, rule.framework, rule.command.format(python=_python(venv)),
+                     rule.port, venv, lockfile, manifest)
@@ -0,0 +1,142 @@
+"""Fuzzy, search-as-you-type project lookup.
+
+An in-memory trigram index over project names and paths, updated
+incrementally as projects are detected, opened or removed. A query is
+answered from the posting lists of its trigrams instead of scanning every
+project: candidates sharing enough trigrams with the query are then ranked,
+substring and word-prefix matches first, so typos ("higlight") and partial
+words still find the project.
+
+Queries shorter than three characters are word-prefix queries, served from
+separate one- and two-character word-start keys.
+"""
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, NamedTuple, Set, Tuple
+
+# Share of the query's trigrams a candidate must contain to count as a match
+MIN_SIMILARITY = 0.5
+
+_WORD = re.compile(r'[^\W_]+')
+_PREFIX = '\0'  # Marks word-start keys; never appears in names or paths
+
+# Only the last few path components are indexed: the leading ones
+# (/home/user/Projects) are shared by every project and would make every
+# posting list as long as the catalog
+PATH_COMPONENTS = 3
+
+
+class SearchHit(NamedTuple):
+    path: str
+    score: float
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _keys(text: str) -> Set[str]:
+    """Trigrams of ``text`` plus the one/two-character start of each word"""
+    keys = _trigrams(text)
+    for word in _WORD.findall(text):
+        keys.add(_PREFIX + word[:1])
+        keys.add(_PREFIX + word[:2])
+    return keys
+
+
+def _path_tail(path: str) -> str:
+    parts = re.split(r'[\\/]', path.rstrip('\\/'))
+    return '/'.join(parts[-PATH_COMPONENTS:])
+
+
+def _words(text: str) -> str:
+    """' word1 word2 ...': a word prefix match is then one substring test"""
+    return ' ' + ' '.join(_WORD.findall(text))
+
+
+class ProjectSearchIndex:
+    """Trigram index of {path: name}; thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._docs: Dict[str, Tuple[str, str, str, Set[str]]] = {}  # path -> name, path, name words (lowered), keys
+        self._postings: Dict[str, Set[str]] = {}  # key -> paths
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, path: str, name: str):
+        """Index (or re-index) a project."""
+        name_l, path_l = (name or '').lower(), path.lower()
+        with self._lock:
+            doc = self._docs.get(path)
+            if doc and doc[0] == name_l:
+                return
+            if doc:
+                self._unlink(path, doc[3])
+            keys = _keys(name_l) | _keys(_path_tail(path_l))
+            self._docs[path] = (name_l, path_l, _words(name_l), keys)
+            for key in keys:
+                self._postings.setdefault(key, set()).add(path)
+
+    def remove(self, path: str):
+        """Drop a project from the index."""
+        with self._lock:
+            doc = self._docs.pop(path, None)
+            if doc:
+                self._unlink(path, doc[3])
+
+    def _unlink(self, path: str, keys: Set[str]):
+        for key in keys:
+            paths = self._postings.get(key)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self._postings[key]
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """Ranked matches for ``query``, best first.
+
+        Scores: +1 per exact name, +1 for the query in the name, +0.5 for a
+        word of the name starting with it, +0.25 for the query in the path,
+        plus the share of its trigrams the project contains (fuzziness).
+        Only the last PATH_COMPONENTS components of a path are searched.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        with self._lock:
+            if len(query) < 3:
+                candidates = {path: 1.0 for path in self._postings.get(_PREFIX + query, ())}
+            else:
+                grams = _trigrams(query)
+                counts = Counter()
+                for gram in grams:
+                    counts.update(self._postings.get(gram, ()))
+                candidates = {
+                    path: hits / len(grams) for path, hits in counts.items()
+                    if hits / len(grams) >= MIN_SIMILARITY
+                }
+            docs = {path: self._docs[path] for path in candidates}
+
+        query_words = _words(query)
+        ranked = []
+        for path, similarity in candidates.items():
+            name_l, path_l, name_words, _ = docs[path]
+            score = similarity
+            if name_l == query:
+                score += 1.0
+            if query in name_l:
+                score += 1.0
+            if query_words in name_words:
+                score += 0.5
+            if query in path_l:
+                score += 0.25
+            ranked.append((-score, name_l, path))
+
+        return [SearchHit(path, round(-score, 3)) for score, _, path in heapq.nsmallest(limit, ranked)]
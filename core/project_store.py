@@ -0,0 +1,377 @@
+"""Project catalog storage.
+
+Every project the manager knows about - detected under the scan roots or
+opened by the user - lives in one store, with its last-used time. Recent
+projects are a query on that store (most recently used first) rather than
+a separately capped list, so nothing detected is thrown away.
+
+``SQLiteProjectStore`` keeps the catalog on disk, indexed on path, name,
+framework, dev_port and last use, so lookups stay fast and memory stays flat
+with hundreds of repositories. ``MemoryProjectStore`` has the same interface
+and is used when sqlite3 is unavailable (some embedded Python builds) or the
+database can't be opened.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.project_walker import is_under
+
+try:
+    import sqlite3
+    HAS_SQLITE = True
+except ImportError:
+    HAS_SQLITE = False
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# Columns queried directly; everything else stays in the JSON blob
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    path      TEXT PRIMARY KEY,
+    name      TEXT NOT NULL DEFAULT '',
+    framework TEXT,
+    dev_port  INTEGER,
+    detected  INTEGER NOT NULL DEFAULT 0,
+    last_used TEXT,
+    data      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS projects_name ON projects (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS projects_framework ON projects (framework);
+CREATE INDEX IF NOT EXISTS projects_dev_port ON projects (dev_port);
+CREATE INDEX IF NOT EXISTS projects_last_used ON projects (last_used);
+"""
+
+
+def _depth(path: str, root: str) -> int:
+    """Levels below ``root`` (0 for root itself); ``path`` must be under it"""
+    if path == root:
+        return 0
+    return path[len(os.path.join(root, '')):].rstrip(os.sep).count(os.sep) + 1
+
+
+def _gone(path: str, root: str, max_depth: Optional[int],
+          reachable: Optional[Callable[[str], bool]]) -> bool:
+    """Whether a walk of ``root`` would have found ``path`` if it still existed"""
+    if not is_under(path, root):
+        return False
+    if max_depth is not None and _depth(path, root) > max_depth:
+        return False
+    return reachable is None or reachable(path)
+
+
+def _fields(project: Dict) -> Tuple[str, str, Optional[str], Optional[int]]:
+    dev_port = project.get('dev_port')
+    return (
+        str(project.get('path', '')),
+        str(project.get('name') or ''),
+        project.get('framework'),
+        dev_port if isinstance(dev_port, int) else None
+    )
+
+
+def _data(project: Dict) -> Dict:
+    return {k: v for k, v in project.items() if k != 'last_used'}
+
+
+class ProjectStore(ABC):
+    """Catalog of known projects, keyed by path."""
+
+    @abstractmethod
+    def replace_under(self, root: str, projects: List[Dict], max_depth: Optional[int] = None,
+                      reachable: Optional[Callable[[str], bool]] = None,
+                      vanished: Optional[Callable[[str], bool]] = None) -> Tuple[List[str], List[str]]:
+        """Make ``projects`` the detected projects under ``root``.
+
+        Metadata of ``projects`` is refreshed, keeping their last-used time.
+        A previously detected project the walk could have reached (within
+        ``max_depth`` of root and, if given, ``reachable(path)``) but didn't
+        find is no longer detected: it is removed, unless the user opened it
+        and it isn't ``vanished(path)`` from disk. Any other entry it could
+        have reached that vanished is removed too. Projects the walk couldn't
+        reach (deeper, or under a nested root) are left alone.
+
+        Returns:
+            (added paths, removed paths)
+        """
+
+    @abstractmethod
+    def touch(self, project: Dict) -> str:
+        """Insert or update ``project`` and mark it used now. Returns the timestamp."""
+
+    @abstractmethod
+    def import_recent(self, projects: List[Dict]):
+        """Add previously saved recent projects, keeping their last-used times."""
+
+    @abstractmethod
+    def recent(self, limit: int) -> List[Dict]:
+        """The ``limit`` most recently used projects, most recent first."""
+
+    @abstractmethod
+    def detected(self) -> List[Dict]:
+        """Projects found by scanning the project roots."""
+
+    @abstractmethod
+    def all(self) -> List[Dict]:
+        """Every known project, ordered by path."""
+
+    @abstractmethod
+    def get(self, paths: List[str]) -> List[Dict]:
+        """Projects at ``paths`` (in that order; unknown paths are skipped)."""
+
+    @abstractmethod
+    def find(self, name: Optional[str] = None, framework: Optional[str] = None,
+             dev_port: Optional[int] = None) -> List[Dict]:
+        """Projects matching all given fields (name case-insensitively)."""
+
+    @abstractmethod
+    def dev_ports(self) -> Set[int]:
+        """Distinct configured dev ports."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of known projects."""
+
+    def close(self):
+        """Release resources."""
+
+
+class MemoryProjectStore(ProjectStore):
+    """In-memory store: {path: [project, last_used, detected]}."""
+
+    def __init__(self):
+        self._projects: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _row(entry: list) -> Dict:
+        project, last_used, _ = entry
+        return {**project, 'last_used': last_used} if last_used else dict(project)
+
+    def replace_under(self, root, projects, max_depth=None, reachable=None, vanished=None):
+        found = {str(p.get('path', '')): p for p in projects}
+        with self._lock:
+            missing = [
+                path for path, entry in self._projects.items()
+                if path not in found and _gone(path, root, max_depth, reachable)
+            ]
+            removed = [path for path in missing
+                       if (self._projects[path][2] and not self._projects[path][1]) or (vanished and vanished(path))]
+            missing = [path for path in missing if self._projects[path][2]]
+            for path in missing:
+                self._projects[path][2] = False
+            for path in removed:
+                del self._projects[path]
+            added = []
+            for path, project in found.items():
+                entry = self._projects.get(path)
+                if entry is None:
+                    added.append(path)
+                    self._projects[path] = [_data(project), None, True]
+                else:
+                    entry[0], entry[2] = _data(project), True
+        return added, removed
+
+    def touch(self, project):
+        now = datetime.now().isoformat()
+        path = str(project.get('path', ''))
+        with self._lock:
+            entry = self._projects.get(path)
+            self._projects[path] = [_data(project), now, entry[2] if entry else False]
+        return now
+
+    def import_recent(self, projects):
+        with self._lock:
+            for project in projects:
+                path = str(project.get('path', ''))
+                if path not in self._projects:
+                    self._projects[path] = [_data(project), project.get('last_used'), False]
+
+    def recent(self, limit):
+        with self._lock:
+            entries = [e for e in self._projects.values() if e[1]]
+            entries.sort(key=lambda e: e[1], reverse=True)
+            return [self._row(e) for e in entries[:limit]]
+
+    def detected(self):
+        with self._lock:
+            return [self._row(e) for _, e in sorted(self._projects.items()) if e[2]]
+
+    def all(self):
+        with self._lock:
+            return [self._row(e) for _, e in sorted(self._projects.items())]
+
+    def get(self, paths):
+        with self._lock:
+            return [self._row(self._projects[path]) for path in paths if path in self._projects]
+
+    def find(self, name=None, framework=None, dev_port=None):
+        def matches(project: Dict) -> bool:
+            _, project_name, project_framework, project_port = _fields(project)
+            return ((name is None or project_name.lower() == name.lower())
+                    and (framework is None or project_framework == framework)
+                    and (dev_port is None or project_port == dev_port))
+
+        with self._lock:
+            return [self._row(e) for _, e in sorted(self._projects.items()) if matches(e[0])]
+
+    def dev_ports(self):
+        with self._lock:
+            return {_fields(e[0])[3] for e in self._projects.values()} - {None}
+
+    def count(self):
+        with self._lock:
+            return len(self._projects)
+
+
+class SQLiteProjectStore(ProjectStore):
+    """SQLite-backed store (one connection shared by all threads, behind a lock)."""
+
+    def __init__(self, db_file: Path):
+        self.db_file = Path(db_file)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        try:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            if self._conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                self._conn.execute('DROP TABLE IF EXISTS projects')
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+            self._conn.commit()
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+
+    @staticmethod
+    def _row(data: str, last_used: Optional[str]) -> Dict:
+        project = json.loads(data)
+        if last_used:
+            project['last_used'] = last_used
+        return project
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(sql, tuple(params)).fetchall()
+        return [self._row(data, last_used) for data, last_used in rows]
+
+    @staticmethod
+    def _subtree(root: str) -> Tuple[str, str, str]:
+        """(root, low, high) such that paths under root are root or in [low, high)"""
+        prefix = os.path.join(root, '')
+        return root, prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+    def replace_under(self, root, projects, max_depth=None, reachable=None, vanished=None):
+        found = {str(p.get('path', '')): p for p in projects}
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                'SELECT path, detected, last_used FROM projects WHERE path = ? OR (path >= ? AND path < ?)',
+                self._subtree(root)
+            ).fetchall()
+            existing = {path for path, _, _ in rows}
+            missing = [
+                (path, detected, last_used) for path, detected, last_used in rows
+                if path not in found and _gone(path, root, max_depth, reachable)
+            ]
+            removed = sorted(path for path, detected, last_used in missing
+                             if (detected and not last_used) or (vanished and vanished(path)))
+            self._conn.executemany('DELETE FROM projects WHERE path = ?', [(p,) for p in removed])
+            self._conn.executemany('UPDATE projects SET detected = 0 WHERE path = ?',
+                                   [(path,) for path, detected, _ in missing if detected and path not in removed])
+            self._conn.executemany(
+                'INSERT INTO projects (path, name, framework, dev_port, detected, data) '
+                'VALUES (?, ?, ?, ?, 1, ?) '
+                'ON CONFLICT (path) DO UPDATE SET name = excluded.name, framework = excluded.framework, '
+                'dev_port = excluded.dev_port, detected = 1, data = excluded.data',
+                [(*_fields(p), json.dumps(_data(p))) for p in found.values()]
+            )
+        return sorted(found.keys() - existing), removed
+
+    def touch(self, project):
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO projects (path, name, framework, dev_port, last_used, data) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (path) DO UPDATE SET name = excluded.name, framework = excluded.framework, '
+                'dev_port = excluded.dev_port, last_used = excluded.last_used, data = excluded.data',
+                (*_fields(project), now, json.dumps(_data(project)))
+            )
+        return now
+
+    def import_recent(self, projects):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO projects (path, name, framework, dev_port, last_used, data) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(*_fields(p), p.get('last_used'), json.dumps(_data(p))) for p in projects]
+            )
+
+    def recent(self, limit):
+        return self._query(
+            'SELECT data, last_used FROM projects WHERE last_used IS NOT NULL '
+            'ORDER BY last_used DESC LIMIT ?', (limit,)
+        )
+
+    def detected(self):
+        return self._query('SELECT data, last_used FROM projects WHERE detected = 1 ORDER BY path')
+
+    def all(self):
+        return self._query('SELECT data, last_used FROM projects ORDER BY path')
+
+    def get(self, paths):
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(paths), 500):
+                chunk = paths[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT path, data, last_used FROM projects WHERE path IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                found.update((path, (data, last_used)) for path, data, last_used in rows)
+        return [self._row(*found[path]) for path in paths if path in found]
+
+    def find(self, name=None, framework=None, dev_port=None):
+        clauses, params = [], []
+        for clause, value in (('name = ? COLLATE NOCASE', name), ('framework = ?', framework),
+                              ('dev_port = ?', dev_port)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ''
+        return self._query(f'SELECT data, last_used FROM projects {where}ORDER BY path', params)
+
+    def dev_ports(self):
+        with self._lock:
+            rows = self._conn.execute('SELECT DISTINCT dev_port FROM projects WHERE dev_port IS NOT NULL').fetchall()
+        return {port for (port,) in rows}
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM projects').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_project_store(db_file: Path) -> ProjectStore:
+    """SQLite store at ``db_file``, or an in-memory store if SQLite is unavailable."""
+    if HAS_SQLITE:
+        try:
+            return SQLiteProjectStore(db_file)
+        except sqlite3.Error as e:
+            logger.warning(f'Cannot open project database {db_file} ({e}); keeping the catalog in memory')
+    else:
+        logger.info('sqlite3 not available; keeping the project catalog in memory')
+    return MemoryProjectStore()
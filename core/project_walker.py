@@ -0,0 +1,196 @@
+"""Project directory walker.
+
+Finds directories containing a project marker (package.json, manage.py,
+app.py - see core.project_rules) with ``os.scandir``,
+using the entry types cached by the directory listing instead of a stat per
+entry. The walk runs inline: on a local disk listings are CPU-bound and
+worker threads only add contention (see scripts/bench_project_walker.py).
+Once listings prove slow (network mount, FUSE, spinning disk) the rest of
+the tree is handed to a bounded set of worker threads that list sibling
+subtrees concurrently. Directories are deduplicated by (st_dev, st_ino), so
+symlink loops and trees reachable by several paths are walked once.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import stat
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from core.project_rules import PROJECT_MARKERS
+from core.scan_exclusions import GITIGNORE, ExcludeMatcher
+
+logger = logging.getLogger(__name__)
+
+# Never descended into
+SKIP_DIRS = frozenset({'node_modules', 'dist', 'build', '__pycache__'})
+
+# Threads for a walk whose listings wait on I/O, so this need not track the CPU count
+DEFAULT_WORKERS = 8
+
+# The walk switches to worker threads after SLOW_STREAK listings in a row
+# each took longer than SLOW_LISTING seconds (one alone may be a hiccup)
+SLOW_LISTING = 0.002
+SLOW_STREAK = 3
+
+DirKey = Tuple[int, int]  # (st_dev, st_ino)
+
+# (is project, [(subdir path, key), ...], has .gitignore) for one directory
+Listing = Tuple[bool, List[Tuple[str, DirKey]], bool]
+
+# lister(path, descend) -> Listing; lets callers serve listings from a cache
+Lister = Callable[[str, bool], Listing]
+
+
+def is_under(path: str, root: str) -> bool:
+    """Whether ``path`` is ``root`` or inside it (both absolute and normalized)"""
+    return path == root or path.startswith(os.path.join(root, ''))
+
+
+def _dir_stat(entry: os.DirEntry) -> os.stat_result:
+    st = entry.stat()  # Follows symlinks
+    if st.st_ino == 0:
+        st = os.stat(entry.path)  # Windows scandir doesn't fill st_ino/st_dev
+    return st
+
+
+def list_dir(path: str, descend: bool, markers: FrozenSet[str] = PROJECT_MARKERS,
+             skip_dirs: FrozenSet[str] = SKIP_DIRS,
+             stats: Optional[Dict[str, os.stat_result]] = None) -> Listing:
+    """One directory listing: (has a marker file, [(subdir path, key), ...], has .gitignore).
+
+    The subdirectories' stats (taken for their keys anyway) are added to
+    ``stats`` if given, so listing them next needn't stat them again.
+    """
+    subdirs = []
+    has_gitignore = False
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name
+                if name in markers:
+                    if entry.is_file():
+                        return True, [], False  # Projects are not searched for nested projects
+                elif name == GITIGNORE:
+                    has_gitignore = descend
+                elif descend and not name.startswith('.') and name not in skip_dirs and entry.is_dir():
+                    subdirs.append(entry)
+    except OSError as e:
+        logger.debug(f'Cannot list {path}: {e}')
+        return False, [], False
+
+    keyed = []
+    for entry in subdirs:
+        try:
+            st = _dir_stat(entry)
+        except OSError:
+            continue  # Broken symlink or vanished directory
+        keyed.append((entry.path, (st.st_dev, st.st_ino)))
+        if stats is not None:
+            stats[entry.path] = st
+    return False, keyed, has_gitignore
+
+
+def excluded_subdirs(path: str, subdirs: List[Tuple[str, DirKey]], has_gitignore: bool,
+                     excludes: ExcludeMatcher) -> Tuple[List[Tuple[str, DirKey]], ExcludeMatcher]:
+    """Drop excluded ``subdirs`` of ``path`` before they are listed.
+
+    Returns:
+        (remaining subdirs, matcher for their subtrees - extended with
+        path/.gitignore if there is one)
+    """
+    if has_gitignore:
+        excludes = excludes.with_gitignore(path)
+    return [(subdir, key) for subdir, key in subdirs if not excludes.excluded(subdir)], excludes
+
+
+def find_project_dirs(root, max_depth: int = 3, max_workers: int = DEFAULT_WORKERS,
+                      markers: FrozenSet[str] = PROJECT_MARKERS, skip_dirs: FrozenSet[str] = SKIP_DIRS,
+                      lister: Optional[Lister] = None, excludes: Optional[ExcludeMatcher] = None,
+                      cancelled: Optional[Callable[[], bool]] = None) -> List[str]:
+    """Find directories under ``root`` that contain one of ``markers``.
+
+    Args:
+        root: Directory to walk
+        max_depth: Deepest level (root = 0) checked for a marker
+        max_workers: Directory listings run concurrently once they prove
+            slow (see SLOW_LISTING; 1 always walks inline)
+        markers: File names that mark a project
+        skip_dirs: Directory names never descended into (dot-dirs are always skipped)
+        lister: Replaces the plain scandir listing (markers/skip_dirs are then
+            the lister's responsibility)
+        excludes: Exclusion globs for this root; .gitignore files are added
+            to it as the walk descends
+        cancelled: Polled before each listing; once True the walk stops
+            (and returns what it found so far)
+
+    Returns:
+        Sorted absolute paths of project directories
+    """
+    root = os.path.abspath(root)
+    try:
+        st = os.stat(root)
+    except OSError:
+        return []
+    if not stat.S_ISDIR(st.st_mode):
+        return []
+
+    if lister is None:
+        def lister(path: str, descend: bool) -> Listing:
+            return list_dir(path, descend, markers, skip_dirs)
+
+    excludes = excludes or ExcludeMatcher()
+    seen = {(st.st_dev, st.st_ino)}
+    found: List[str] = []
+    work: queue.Queue = queue.Queue()
+    lock = threading.Lock()
+
+    def visit(path: str, depth: int, excludes: ExcludeMatcher):
+        if cancelled and cancelled():
+            return
+        is_project, subdirs, has_gitignore = lister(path, depth < max_depth)
+        if is_project:
+            found.append(path)
+            return
+        subdirs, excludes = excluded_subdirs(path, subdirs, has_gitignore, excludes)
+        with lock:
+            fresh = [subdir for subdir, key in subdirs if key not in seen and not seen.add(key)]
+        for subdir in fresh:
+            work.put((subdir, depth + 1, excludes))
+
+    def worker():
+        while True:
+            item = work.get()
+            try:
+                if item is None:
+                    return
+                visit(*item)
+            except Exception as e:
+                logger.debug(f'Error walking {item[0]}: {e}')
+            finally:
+                work.task_done()
+
+    # Inline until listings are slow; then the workers take over the queue
+    work.put((root, 0, excludes))
+    streak = 0
+    while not work.empty() and not (streak >= SLOW_STREAK and max_workers > 1):
+        started = time.perf_counter()
+        visit(*work.get_nowait())
+        work.task_done()
+        streak = streak + 1 if time.perf_counter() - started >= SLOW_LISTING else 0
+    if work.empty():
+        return sorted(found)
+
+    threads = [threading.Thread(target=worker, daemon=True, name=f'ProjectWalker-{i}') for i in range(max_workers)]
+    for thread in threads:
+        thread.start()
+    work.join()
+    for _ in threads:
+        work.put(None)
+    for thread in threads:
+        thread.join()
+
+    return sorted(found)
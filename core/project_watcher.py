@@ -0,0 +1,322 @@
+"""Live project discovery with Linux inotify.
+
+Watches the project roots (down to the scan depth) and reports a root as
+changed when a project manifest (or a .gitignore) appears, changes or
+disappears, or when a directory that could hold one is created, moved or
+deleted. Bursts of events (``npm install``, ``git checkout``) are debounced
+into one callback per root. node_modules, build output and dot-directories
+are never watched.
+
+inotify is used through ctypes, so there are no extra dependencies. Where
+it is unavailable, or the kernel's watch limit runs out, the watcher falls
+back to asking for a periodic (incremental, hence cheap) rescan instead.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.project_rules import RULE_FILES
+from core.project_walker import SKIP_DIRS
+from core.scan_exclusions import GITIGNORE, gitignore_cache
+
+logger = logging.getLogger(__name__)
+
+# Files whose appearance/change/removal can change what a directory is (or,
+# for .gitignore, which of its subdirectories are scanned)
+MANIFESTS = RULE_FILES | {GITIGNORE}
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+class Inotify:
+    """Minimal ctypes binding for inotify_init1 / inotify_add_watch / inotify_rm_watch."""
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, 'inotify is only available on Linux')
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self._rm_watch.restype = ctypes.c_int
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), path)
+        return wd
+
+    def rm_watch(self, wd: int):
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """Pending events as (wd, mask, name); empty if none are queued."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class ProjectWatcher:
+    """Calls ``on_change(roots)`` when project roots change on disk."""
+
+    def __init__(self, roots: Callable[[], Iterable[str]], on_change: Callable[[List[str]], None],
+                 max_depth: int = 2, debounce: float = 1.0, max_delay: float = 10.0,
+                 fallback_interval: float = 60.0, excluded: Optional[Callable[[str, str], bool]] = None):
+        """
+        Args:
+            roots: Returns the directories to watch (re-read periodically)
+            on_change: Called from the watcher thread with roots needing a rescan
+            max_depth: Deepest level (root = 0) at which projects are detected
+            debounce: Quiet period after the last event before reporting
+            max_delay: Report at the latest this long after the first event of a burst
+            fallback_interval: Rescan period when inotify is unavailable or exhausted
+            excluded: ``excluded(root, path)`` -> True for directories not to watch
+                (the scan's exclusion globs)
+        """
+        self._roots = roots
+        self._on_change = on_change
+        self.max_depth = max_depth
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.fallback_interval = fallback_interval
+        self._excluded = excluded or (lambda root, path: False)
+
+        self._inotify: Optional[Inotify] = None
+        # wd -> {root: (path, depth)}; nested roots share the kernel's watch
+        self._watches: Dict[int, Dict[str, Tuple[str, int]]] = {}
+        self._watched_roots: Set[str] = set()
+        self._exhausted = False
+        self._dirty: Dict[str, float] = {}  # root -> time of first unreported event
+        self._last_event = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def live(self) -> bool:
+        """True while every root is fully covered by inotify watches."""
+        return self._inotify is not None and not self._exhausted
+
+    # --- Watches --------------------------------------------------------
+
+    def _watch_tree(self, root: str, path: str, depth: int):
+        if self._exhausted:
+            return
+        try:
+            wd = self._inotify.add_watch(path, WATCH_MASK)
+        except OSError as e:
+            if e.errno in (errno.ENOSPC, errno.ENOMEM):
+                self._exhausted = True
+                logger.warning(
+                    f'inotify watch limit reached at {path}; falling back to rescans every '
+                    f'{self.fallback_interval:.0f}s (raise fs.inotify.max_user_watches to fix)'
+                )
+            else:
+                logger.debug(f'Cannot watch {path}: {e}')
+            return
+        self._watches.setdefault(wd, {})[root] = (path, depth)
+
+        if depth >= self.max_depth:
+            return
+        try:
+            with os.scandir(path) as entries:
+                subdirs = [
+                    entry.path for entry in entries
+                    if not entry.name.startswith('.') and entry.name not in SKIP_DIRS
+                    and entry.is_dir(follow_symlinks=False) and not self._excluded(root, entry.path)
+                ]
+        except OSError:
+            return
+        for subdir in subdirs:
+            self._watch_tree(root, subdir, depth + 1)
+
+    def _unwatch(self, predicate: Callable[[str, str], bool]):
+        for wd, owners in list(self._watches.items()):
+            for root, (path, _) in list(owners.items()):
+                if predicate(root, path):
+                    del owners[root]
+            if not owners:
+                self._inotify.rm_watch(wd)
+                del self._watches[wd]
+
+    def _sync_roots(self) -> Set[str]:
+        """Start/stop watching roots added to or removed from the configuration."""
+        roots = {os.path.abspath(root) for root in self._roots() if os.path.isdir(root)}
+        if self._inotify is not None:
+            for root in self._watched_roots - roots:
+                self._unwatch(lambda r, _p, root=root: r == root)
+            for root in sorted(roots - self._watched_roots):
+                self._watch_tree(root, root, 0)
+        added = roots - self._watched_roots
+        self._watched_roots = roots
+        return added
+
+    # --- Events ---------------------------------------------------------
+
+    def _mark(self, root: str, now: float):
+        self._dirty.setdefault(root, now)
+        self._last_event = now
+
+    def _handle(self, wd: int, mask: int, name: str, now: float):
+        if mask & IN_Q_OVERFLOW:
+            for root in self._watched_roots:
+                self._mark(root, now)
+            return
+
+        owners = self._watches.get(wd)
+        if owners is None:
+            return
+        if mask & IN_IGNORED:
+            del self._watches[wd]
+            return
+
+        for root, (path, depth) in list(owners.items()):
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                self._mark(root, now)
+            elif mask & IN_ISDIR:
+                if name.startswith('.') or name in SKIP_DIRS:
+                    continue
+                child = os.path.join(path, name)
+                if self._excluded(root, child):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO) and depth < self.max_depth:
+                    self._watch_tree(root, child, depth + 1)
+                elif mask & IN_MOVED_FROM:
+                    prefix = child + os.sep
+                    self._unwatch(lambda r, p, root=root: r == root and (p == child or p.startswith(prefix)))
+                self._mark(root, now)
+            elif name in MANIFESTS:
+                if name == GITIGNORE:
+                    gitignore_cache.forget(path)  # The rescan must see the new rules
+                self._mark(root, now)
+
+    def _flush(self, now: float):
+        """Report dirty roots once the burst has settled (or waited too long)."""
+        if not self._dirty:
+            return
+        quiet = now - self._last_event >= self.debounce
+        overdue = now - min(self._dirty.values()) >= self.max_delay
+        if quiet or overdue:
+            roots = sorted(self._dirty)
+            self._dirty.clear()
+            self._notify(roots)
+
+    def _notify(self, roots: List[str]):
+        try:
+            self._on_change(roots)
+        except Exception as e:
+            logger.error(f'Project watcher callback failed: {e}', exc_info=True)
+
+    # --- Thread ---------------------------------------------------------
+
+    def _run(self):
+        try:
+            self._inotify = Inotify()
+        except (OSError, AttributeError) as e:
+            logger.info(f'inotify unavailable ({e}); rescanning project roots every {self.fallback_interval:.0f}s')
+
+        # Initial scan so the catalog reflects the roots from the start
+        self._sync_roots()
+        self._notify(sorted(self._watched_roots))
+        next_rescan = time.monotonic() + self.fallback_interval
+        next_roots_check = time.monotonic() + 5.0
+
+        while not self._stop.is_set():
+            if self._inotify is not None:
+                readable, _, _ = select.select([self._inotify], [], [], 0.5)
+                now = time.monotonic()
+                if readable:
+                    for wd, mask, name in self._inotify.read_events():
+                        self._handle(wd, mask, name, now)
+            else:
+                self._stop.wait(0.5)
+                now = time.monotonic()
+
+            if now >= next_roots_check:
+                for root in self._sync_roots():
+                    self._mark(root, now)
+                next_roots_check = now + 5.0
+
+            if not self.live and now >= next_rescan:
+                self._notify(sorted(self._watched_roots))
+                next_rescan = now + self.fallback_interval
+
+            self._flush(now)
+
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._watches.clear()
+        self._watched_roots.clear()
+        self._exhausted = False
+
+    def start(self):
+        """Start watching in a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='ProjectWatcher')
+        self._thread.start()
+        logger.info('Project watcher started')
+
+    def stop(self):
+        """Stop watching."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        logger.info('Project watcher stopped')
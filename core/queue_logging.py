@@ -0,0 +1,138 @@
+"""Queue-backed structured logging.
+
+Callers only append records to a bounded in-memory queue; a background
+listener thread formats them and writes to the real handlers. A flood of
+log calls therefore never blocks the caller (e.g. an asyncio event loop)
+on disk I/O - records beyond the queue bound are dropped and counted.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterable, Optional
+
+# Pass as ``extra=SAMPLED`` for noisy per-message records
+SAMPLED = {'sampled': True}
+
+
+class LogStats:
+    """Thread-safe counters describing what happened to log records."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.sampled_out = 0
+
+    def incr(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'enqueued': self.enqueued,
+                'dropped': self.dropped,
+                'sampled_out': self.sampled_out
+            }
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks and never formats on the caller's thread."""
+
+    def __init__(self, log_queue: queue.Queue, stats: LogStats):
+        super().__init__(log_queue)
+        self.stats = stats
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting (including %-args and tracebacks) happens in the listener
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            self.stats.incr('enqueued')
+        except queue.Full:
+            self.stats.incr('dropped')
+
+
+class SamplingFilter(logging.Filter):
+    """Keep 1 in ``rate`` records marked ``sampled`` unless DEBUG is enabled."""
+
+    def __init__(self, rate: int, stats: LogStats):
+        super().__init__()
+        self.rate = max(1, rate)
+        self.stats = stats
+        self._seen = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, 'sampled', False) or self.rate == 1:
+            return True
+        if logging.getLogger(record.name).isEnabledFor(logging.DEBUG):
+            return True
+        self._seen += 1
+        if self._seen % self.rate == 1:
+            return True
+        self.stats.incr('sampled_out')
+        return False
+
+
+class StructuredFormatter(logging.Formatter):
+    """``time LEVEL logger: message key=value ...`` with fields from ``extra={'fields': {...}}``."""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value!r}' for key, value in fields.items())
+        return line
+
+
+def setup_queue_logging(name: str, handlers: Optional[Iterable[logging.Handler]] = None,
+                        level: int = logging.INFO, queue_size: int = 10000,
+                        sample_rate: int = 100) -> LogStats:
+    """Route logger ``name`` through a bounded queue to ``handlers``.
+
+    Args:
+        name: Logger to configure (its records stop propagating to the root)
+        handlers: Handlers the listener thread writes to (default: root's handlers)
+        level: Logger level
+        queue_size: Records buffered before new ones are dropped
+        sample_rate: Keep 1 in N records logged with ``extra=SAMPLED``
+
+    Returns:
+        Counters for enqueued, dropped and sampled-out records
+    """
+    stats = LogStats()
+    handlers = list(handlers) if handlers is not None else list(logging.getLogger().handlers)
+    for handler in handlers:
+        if handler.formatter is None:
+            handler.setFormatter(StructuredFormatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    queue_handler = DroppingQueueHandler(log_queue, stats)
+    queue_handler.addFilter(SamplingFilter(sample_rate, stats))
+
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.handlers = [queue_handler]
+    logger.propagate = False
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+    def flush_on_exit():
+        try:
+            listener.stop()
+        except queue.Full:
+            pass  # Listener is hopelessly behind; don't hang the exit
+
+    atexit.register(flush_on_exit)
+
+    return stats
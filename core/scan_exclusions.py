@@ -0,0 +1,206 @@
+"""Directory exclusion for project scans.
+
+Exclusion globs (the ``scan_exclude_globs`` preference) and ``.gitignore``
+files found along the walk are compiled into matchers that are checked
+before a subdirectory is queued, so excluded subtrees are never listed.
+
+Patterns follow .gitignore syntax: a pattern without a slash matches a name
+at any depth, one with a leading or inner slash is anchored to the directory
+of the file it came from (the scan root for preference globs), ``**``
+matches across directories, a trailing slash matches directories only (the
+walker only ever asks about directories) and ``!`` re-includes. A deeper
+.gitignore takes precedence over its parents, and within one file the last
+matching pattern wins.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+GITIGNORE = '.gitignore'
+
+# Default for the scan_exclude_globs preference: generated, vendored and
+# environment trees that never hold a project worth listing. (node_modules,
+# dist, build, __pycache__ and dot-directories are always skipped.)
+DEFAULT_EXCLUDE_GLOBS = [
+    'target', 'vendor', 'venv', 'env', 'site-packages', 'bower_components', 'coverage',
+]
+
+_CLASS = re.compile(r'\[!?\]?[^\]]*\]')
+
+
+def _translate(pattern: str) -> str:
+    """Regex for a slash-separated gitignore glob ('*' and '?' stop at '/')"""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+            out.append('/.*')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        elif pattern[i] == '[' and _CLASS.match(pattern, i):
+            cls = _CLASS.match(pattern, i).group()
+            body = cls[1:-1]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append('[' + body.replace('\\', '\\\\') + ']')
+            i += len(cls)
+        else:
+            if pattern[i] == '\\' and i + 1 < len(pattern):
+                i += 1
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(out)
+
+
+class IgnoreRules:
+    """Compiled patterns of one .gitignore (or the preference globs), relative to ``base``."""
+
+    def __init__(self, base: str, patterns: Iterable[str]):
+        self.base = base.rstrip('/\\')
+        self._prefix = len(self.base) + 1
+        # (negate, anchored, regex) in file order
+        self._rules: List[Tuple[bool, bool, Pattern]] = []
+        self._names = set()  # Plain names (no wildcards, slash or negation)
+        self._globs: List[Tuple[bool, bool, Pattern]] = []  # Rules other than plain names
+        has_negation = False
+
+        for line in patterns:
+            line = line.rstrip('\n\r')
+            if line.endswith(' ') and not line.endswith('\\ '):
+                line = line.rstrip(' ')
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+                has_negation = True
+            elif line.startswith('\\'):
+                line = line[1:]
+            line = line.rstrip('/')
+            if not line:
+                continue
+
+            anchored = '/' in line
+            line = line.lstrip('/')
+            regex = re.compile(_translate(line) + r'\Z')
+            if not negate and not anchored and not any(c in line for c in '*?[\\'):
+                self._names.add(line)
+            else:
+                self._globs.append((negate, anchored, regex))
+            self._rules.append((negate, anchored, regex))
+
+        # Without negations order doesn't matter: one alternation per kind
+        self._fast: Optional[Tuple[Optional[Pattern], Optional[Pattern]]] = None
+        if not has_negation:
+            names = [r.pattern for _, anchored, r in self._globs if not anchored]
+            paths = [r.pattern for _, anchored, r in self._globs if anchored]
+            self._fast = (
+                re.compile('|'.join(f'(?:{p})' for p in names)) if names else None,
+                re.compile('|'.join(f'(?:{p})' for p in paths)) if paths else None,
+            )
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def match(self, path: str) -> Optional[bool]:
+        """True if ``path`` (a directory under base) is ignored, False if
+        re-included, None if no pattern applies"""
+        rel = path[self._prefix:].replace('\\', '/')
+        name = rel.rsplit('/', 1)[-1]
+
+        if self._fast is not None:
+            if name in self._names:
+                return True
+            names, paths = self._fast
+            if (names and names.match(name)) or (paths and paths.match(rel)):
+                return True
+            return None
+
+        for negate, anchored, regex in reversed(self._rules):
+            if regex.match(rel if anchored else name):
+                return not negate
+        return None
+
+
+class ExcludeMatcher:
+    """Chain of IgnoreRules from the scan root down to the current directory."""
+
+    def __init__(self, rules: Tuple[IgnoreRules, ...] = ()):
+        self._rules = rules
+
+    def excluded(self, path: str) -> bool:
+        """Whether the directory ``path`` should be skipped (deepest rules decide first)"""
+        for rules in reversed(self._rules):
+            result = rules.match(path)
+            if result is not None:
+                return result
+        return False
+
+    def with_gitignore(self, directory: str) -> 'ExcludeMatcher':
+        """This matcher extended with ``directory``/.gitignore (if it has any patterns)"""
+        rules = gitignore_cache.load(directory)
+        return ExcludeMatcher(self._rules + (rules,)) if rules else self
+
+
+def compile_excludes(root: str, globs: Iterable[str]) -> ExcludeMatcher:
+    """Matcher for a scan of ``root`` with the given exclusion globs"""
+    rules = IgnoreRules(root, globs)
+    return ExcludeMatcher((rules,) if rules else ())
+
+
+class GitignoreCache:
+    """Compiled .gitignore files, re-read only when their (mtime, size) changes."""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int], IgnoreRules]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, directory: str) -> Optional[IgnoreRules]:
+        path = os.path.join(directory, GITIGNORE)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry and entry[0] == key:
+            return entry[1]
+
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                rules = IgnoreRules(directory, f)
+        except OSError as e:
+            logger.debug(f'Cannot read {path}: {e}')
+            return None
+        with self._lock:
+            self._entries[path] = (key, rules)
+        return rules
+
+    def forget(self, directory: str):
+        """Drop ``directory``/.gitignore, so the next load re-reads it even if
+        it changed within one mtime tick"""
+        with self._lock:
+            self._entries.pop(os.path.join(directory, GITIGNORE), None)
+
+
+# Shared by all scans in this process
+gitignore_cache = GitignoreCache()
@@ -0,0 +1,286 @@
+"""Background dev server discovery.
+
+One daemon thread periodically finds listening dev servers (attributed to
+their projects) and publishes an immutable snapshot. The health server,
+dashboard, tray and in-process bridge all read that snapshot instead of
+probing ports themselves. Forced refreshes are single-flight: callers that
+arrive while a refresh is running wait for it and share its result.
+
+Between full refreshes the thread re-reads the kernel listener table (cheap
+on Linux) every second and refreshes as soon as it changes. Successive
+snapshots are diffed into server_up / server_down events for subscribers.
+
+A server that belongs to no known project is fingerprinted over HTTP once
+(per port and owning PID) to name its framework; later refreshes reuse that.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from core.listeners import read_proc_listeners
+from core.port_scanner import detect_framework, scan_ports
+from core.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Seconds between listener-table checks (only where /proc/net is available)
+WATCH_INTERVAL = 1.0
+
+SERVER_UP = 'server_up'
+SERVER_DOWN = 'server_down'
+
+
+class DiscoveredServer(NamedTuple):
+    port: int
+    pid: Optional[int]
+    name: str
+    path: Optional[str]
+    framework: str
+
+    def to_dict(self) -> dict:
+        return {
+            'port': self.port,
+            'pid': self.pid,
+            'name': self.name,
+            'path': self.path,
+            'framework': self.framework,
+            'status': 'running',
+            'url': f'http://localhost:{self.port}',
+            'title': f'{self.name} - Port {self.port}'
+        }
+
+
+class DiscoverySnapshot(NamedTuple):
+    servers: Tuple[DiscoveredServer, ...]
+    timestamp: float  # time.time() when the scan finished
+    generation: int   # Incremented on every refresh
+    watched_ports: Tuple[int, ...] = ()  # Ports the scan checked
+
+    @property
+    def ports(self) -> frozenset:
+        return frozenset(server.port for server in self.servers)
+
+    def get(self, port: int) -> Optional[DiscoveredServer]:
+        for server in self.servers:
+            if server.port == port:
+                return server
+        return None
+
+
+class ServerEvent(NamedTuple):
+    kind: str  # SERVER_UP or SERVER_DOWN
+    server: DiscoveredServer
+    timestamp: float
+
+    def to_dict(self) -> dict:
+        return {'event': self.kind, 'timestamp': self.timestamp, **self.server.to_dict()}
+
+
+ServerListener = Callable[[ServerEvent], None]
+
+
+def diff_snapshots(old: 'DiscoverySnapshot', new: 'DiscoverySnapshot') -> List[ServerEvent]:
+    """Events turning ``old`` into ``new``; a port whose owning PID changed is down then up."""
+    before = {(server.port, server.pid): server for server in old.servers}
+    after = {(server.port, server.pid): server for server in new.servers}
+    events = [ServerEvent(SERVER_DOWN, server, new.timestamp) for key, server in before.items() if key not in after]
+    events += [ServerEvent(SERVER_UP, server, new.timestamp) for key, server in after.items() if key not in before]
+    return events
+
+
+EMPTY_SNAPSHOT = DiscoverySnapshot(servers=(), timestamp=0.0, generation=0)
+
+# Discovery running in this process, if any (lets an in-process bridge share it)
+_active: Optional['ServerDiscovery'] = None
+
+
+def active_discovery() -> Optional['ServerDiscovery']:
+    """The running ServerDiscovery in this process, or None."""
+    return _active
+
+
+class ServerDiscovery:
+    """Keeps a periodically refreshed snapshot of running dev servers."""
+
+    def __init__(self, find_servers: Callable[[Iterable[int]], Dict[int, dict]],
+                 ports: Callable[[], Iterable[int]], interval: Callable[[], float]):
+        """
+        Args:
+            find_servers: Attributes listening ports ({port: {'pid', 'project', ...}})
+            ports: Returns the ports to watch (re-read on every refresh)
+            interval: Returns the refresh interval in seconds (re-read every cycle)
+        """
+        self._find_servers = find_servers
+        self._ports = ports
+        self.interval = interval
+        self._snapshot = EMPTY_SNAPSHOT
+        self._flight = SingleFlight()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[ServerListener] = []
+        self._listeners_lock = threading.Lock()
+        # (port, pid) -> framework from an HTTP fingerprint, for servers without a project
+        self._fingerprints: Dict[Tuple[int, Optional[int]], str] = {}
+
+    @property
+    def snapshot(self) -> DiscoverySnapshot:
+        """Latest snapshot (never blocks, never probes)."""
+        return self._snapshot
+
+    def _scan(self, ports: Set[int]) -> Tuple[DiscoveredServer, ...]:
+        servers = []
+        attributed = self._find_servers(ports)
+        fingerprints = self._fingerprint({
+            (port, server.get('pid')) for port, server in attributed.items() if not server.get('project')
+        })
+        for port in sorted(attributed):
+            pid = attributed[port].get('pid')
+            project = attributed[port].get('project')
+            if project:
+                name = project.get('name') or f'Server on :{port}'
+                path = project.get('path')
+                framework = project.get('framework') or detect_framework(port, '', '', '')
+            else:
+                framework = fingerprints.get((port, pid)) or detect_framework(port, '', '', '')
+                name = framework if framework != 'Unknown' else f'Server on :{port}'
+                path = None
+            servers.append(DiscoveredServer(port, pid, name, path, framework))
+        return tuple(servers)
+
+    def _fingerprint(self, keys: Set[Tuple[int, Optional[int]]]) -> Dict[Tuple[int, Optional[int]], str]:
+        """Frameworks of the servers ``keys`` ((port, pid)); only new ones are probed"""
+        fresh = {port: pid for port, pid in keys if (port, pid) not in self._fingerprints}
+        if fresh:
+            try:
+                for server in asyncio.run(scan_ports(sorted(fresh))):
+                    self._fingerprints[(server['port'], fresh[server['port']])] = server['framework']
+            except Exception as e:
+                logger.debug(f'Fingerprinting ports {sorted(fresh)} failed: {e}')
+        # Servers that went away (or changed hands) are forgotten
+        self._fingerprints = {key: value for key, value in self._fingerprints.items() if key in keys}
+        return self._fingerprints
+
+    def refresh(self, max_age: float = 0.0) -> DiscoverySnapshot:
+        """Rescan now and return the new snapshot.
+
+        Concurrent callers are coalesced: if a refresh is already running,
+        wait for it and return its snapshot rather than starting another.
+
+        Args:
+            max_age: Return the last refreshed snapshot without rescanning
+                if it is younger than this (absorbs bursts of forced rescans)
+        """
+        return self._flight.do('refresh', self._refresh, max_age)
+
+    def _refresh(self) -> DiscoverySnapshot:
+        previous = self._snapshot
+        try:
+            ports = set(self._ports())
+            servers = self._scan(ports)
+        except Exception as e:
+            logger.error(f'Server discovery failed: {e}', exc_info=True)
+            return previous
+        snapshot = self._snapshot = DiscoverySnapshot(servers, time.time(), previous.generation + 1, tuple(sorted(ports)))
+
+        # The first scan is the baseline, not a burst of "up" events
+        if previous.generation > 0:
+            self._publish(diff_snapshots(previous, snapshot))
+
+        return snapshot
+
+    def subscribe(self, listener: ServerListener) -> Callable[[], None]:
+        """Call ``listener(event)`` for every server_up / server_down.
+
+        Listeners run on the discovery thread (or a forced refresh's caller)
+        and must not block; hand work off to your own loop or thread.
+
+        Returns:
+            A function that unsubscribes the listener
+        """
+        with self._listeners_lock:
+            self._listeners.append(listener)
+
+        def unsubscribe():
+            with self._listeners_lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def _publish(self, events: List[ServerEvent]):
+        if not events:
+            return
+        with self._listeners_lock:
+            listeners = list(self._listeners)
+        for event in events:
+            logger.info(f'{event.kind}: {event.server.name} on port {event.server.port} (PID {event.server.pid})')
+            for listener in listeners:
+                try:
+                    listener(event)
+                except Exception as e:
+                    logger.error(f'Server event listener failed: {e}', exc_info=True)
+
+    def wake(self):
+        """Ask the background thread to refresh early (non-blocking)."""
+        self._wake.set()
+
+    def _listener_signature(self) -> Optional[FrozenSet[Tuple[int, int]]]:
+        """(port, inode) of watched listening sockets, or None without /proc/net."""
+        listeners = read_proc_listeners()
+        if listeners is None:
+            return None
+        ports = set(self._ports())
+        return frozenset((listener.port, listener.inode) for listener in listeners if listener.port in ports)
+
+    def _run(self):
+        signature = None
+        next_refresh = 0.0
+        while not self._stop.is_set():
+            current = self._listener_signature()
+            if self._wake.is_set() or time.monotonic() >= next_refresh or current != signature:
+                self._wake.clear()
+                self.refresh()
+                signature = current
+                try:
+                    interval = max(1.0, float(self.interval()))
+                except (TypeError, ValueError):
+                    interval = 60.0
+                next_refresh = time.monotonic() + interval
+
+            # Poll the listener table between refreshes when it is cheap to read
+            remaining = max(0.0, next_refresh - time.monotonic())
+            self._wake.wait(min(WATCH_INTERVAL, remaining) if current is not None else remaining)
+
+    def start(self, share: bool = True):
+        """Start the background refresh thread.
+
+        Args:
+            share: Register as this process's ``active_discovery()`` (false
+                for a watcher that only feeds its owner's events)
+        """
+        global _active
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='ServerDiscovery')
+        self._thread.start()
+        if share:
+            _active = self
+        logger.info('Server discovery started')
+
+    def stop(self):
+        """Stop the background refresh thread."""
+        global _active
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if _active is self:
+            _active = None
+        logger.info('Server discovery stopped')
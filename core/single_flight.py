@@ -0,0 +1,122 @@
+"""Single-flight execution with a short result TTL.
+
+Concurrent callers asking for the same key share one execution of the
+expensive function and all receive its result (or its exception). With
+``max_age``, a result that finished that recently is handed out without
+running again, which absorbs bursts of repeated requests. Scan cost then
+grows with the number of distinct requests, not the number of clients.
+
+``SingleFlight`` is for threads, ``AsyncSingleFlight`` for one asyncio loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe single-flight group."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}  # key -> (finished at, value)
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], max_age: float = 0.0) -> Any:
+        """Result of ``fn()``, shared with concurrent callers of ``key``.
+
+        Args:
+            key: Identifies the work; callers with equal keys share it
+            fn: Does the work (run by the first caller only)
+            max_age: Reuse a result that finished less than this many seconds ago
+        """
+        with self._lock:
+            if max_age > 0:
+                cached = self._results.get(key)
+                if cached and time.monotonic() - cached[0] < max_age:
+                    self.shared += 1
+                    return cached[1]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None:
+                    self._results[key] = (time.monotonic(), call.value)
+            call.done.set()
+        return call.value
+
+    def forget(self, key: Hashable):
+        """Drop the cached result for ``key`` (the next call runs ``fn``)."""
+        with self._lock:
+            self._results.pop(key, None)
+
+
+class AsyncSingleFlight:
+    """Single-flight group for coroutines on one event loop.
+
+    The shared execution runs as its own task, so a caller that is cancelled
+    (e.g. its client disconnected) doesn't cancel it for the others.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+        self.executions = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], max_age: float = 0.0) -> Any:
+        """Result of ``await fn()``, shared with concurrent callers of ``key``."""
+        if max_age > 0:
+            cached = self._results.get(key)
+            if cached and time.monotonic() - cached[0] < max_age:
+                self.shared += 1
+                return cached[1]
+
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self.executions += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Future):
+        self._tasks.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._results[key] = (time.monotonic(), task.result())
+
+    def forget(self, key: Hashable):
+        """Drop the cached result for ``key``."""
+        self._results.pop(key, None)
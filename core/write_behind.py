@@ -0,0 +1,133 @@
+"""Atomic, coalesced file writes.
+
+``atomic_write_text`` writes to a temp file in the same directory, fsyncs
+it and renames it over the target, so readers (and a crash) only ever see
+the old or the new content. ``WriteBehind`` coalesces bursts of "this
+changed" notifications into one such write after a quiet period, bounded
+by a maximum delay, and flushes whatever is pending at shutdown.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write_text(path, text: str, encoding: str = 'utf-8'):
+    """Replace ``path`` with ``text`` atomically (temp file + fsync + rename)."""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    # Persist the rename itself (not possible/needed on Windows)
+    if hasattr(os, 'O_DIRECTORY'):
+        try:
+            dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+
+class WriteBehind:
+    """Debounced writer: ``mark_dirty()`` is cheap, ``write()`` runs once per burst."""
+
+    def __init__(self, write: Callable[[], None], delay: float = 1.0, max_delay: float = 5.0,
+                 name: str = 'WriteBehind'):
+        """
+        Args:
+            write: Persists the current state (called on the writer thread or at flush)
+            delay: Quiet period after the last change before writing
+            max_delay: Write at the latest this long after the first unwritten change
+            name: Thread name (for logs)
+        """
+        self._write = write
+        self.delay = delay
+        self.max_delay = max_delay
+        self.name = name
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dirty_since: Optional[float] = None
+        self._last_change = 0.0
+        self._closed = False
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.writes = 0
+        atexit.register(self.close)
+
+    def mark_dirty(self):
+        """Note that state changed; it will be written after the debounce."""
+        with self._cond:
+            now = time.monotonic()
+            if self._dirty_since is None:
+                self._dirty_since = now
+            self._last_change = now
+            closed = self._closed
+            if not closed:
+                if self._running:
+                    self._cond.notify()
+                else:
+                    self._running = True
+                    self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+                    self._thread.start()
+        if closed:
+            self.flush()  # After close() writes are no longer deferred
+
+    def _run(self):
+        with self._cond:
+            try:
+                while not self._closed and self._dirty_since is not None:
+                    now = time.monotonic()
+                    due = min(self._last_change + self.delay, self._dirty_since + self.max_delay)
+                    if now < due:
+                        self._cond.wait(due - now)
+                        continue
+                    self._cond.release()
+                    try:
+                        self.flush()
+                    finally:
+                        self._cond.acquire()
+            finally:
+                self._running = False
+
+    def flush(self):
+        """Write now if anything is pending."""
+        with self._write_lock:
+            with self._cond:
+                if self._dirty_since is None:
+                    return
+                self._dirty_since = None
+            try:
+                self._write()
+                self.writes += 1
+            except Exception as e:
+                logger.error(f'{self.name}: write failed: {e}', exc_info=True)
+
+    def close(self):
+        """Flush pending changes and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
@@ -27,9 +27,26 @@ a = Analysis(
         ('core/bridge_controller.py', 'core'),
         ('core/tcp_server.py', 'core'),
         ('core/notifier.py', 'core'),
+        ('core/event_stream.py', 'core'),
         ('core/health_server.py', 'core'),
+        ('core/health_snapshot.py', 'core'),
         ('core/bridge_monitor.py', 'core'),
         ('core/project_manager.py', 'core'),
+        ('core/port_scanner.py', 'core'),
+        ('core/listeners.py', 'core'),
+        ('core/process_attribution.py', 'core'),
+        ('core/server_discovery.py', 'core'),
+        ('core/single_flight.py', 'core'),
+        ('core/project_rules.py', 'core'),
+        ('core/scan_exclusions.py', 'core'),
+        ('core/project_walker.py', 'core'),
+        ('core/project_index.py', 'core'),
+        ('core/project_watcher.py', 'core'),
+        ('core/manifest_cache.py', 'core'),
+        ('core/write_behind.py', 'core'),
+        ('core/project_store.py', 'core'),
+        ('core/project_search.py', 'core'),
+        ('core/queue_logging.py', 'core'),
         ('bridge.py', '.'),
         ('web_dashboard.py', '.'),
         ('dashboard/index.html', 'dashboard'),
@@ -83,9 +100,26 @@ a = Analysis(
         'core.bridge_controller',
         'core.tcp_server',
         'core.notifier',
+        'core.event_stream',
         'core.health_server',
+        'core.health_snapshot',
         'core.bridge_monitor',
         'core.project_manager',
+        'core.port_scanner',
+        'core.listeners',
+        'core.process_attribution',
+        'core.server_discovery',
+        'core.single_flight',
+        'core.project_rules',
+        'core.scan_exclusions',
+        'core.project_walker',
+        'core.project_index',
+        'core.project_watcher',
+        'core.manifest_cache',
+        'core.write_behind',
+        'core.project_store',
+        'core.project_search',
+        'core.queue_logging',
         'web_dashboard',
     ] + jinja2_hiddenimports + markupsafe_hiddenimports,  # Add collected Jinja2 and MarkupSafe imports
     hookspath=[],
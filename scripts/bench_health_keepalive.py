@@ -0,0 +1,115 @@
+"""Benchmark health server polling with and without HTTP keep-alive.
+
+Starts a HealthCheckServer on a free local port and has a few clients poll
+/ping and /health the way the popup does, first opening a new connection
+per request (what every poll cost before keep-alive) and then reusing one
+persistent connection per client.
+
+Reports request latency and the CPU time spent per request. Clients and
+server share this process, so the CPU figure covers both ends of the
+connection (connect, accept, teardown and the thread hand-offs).
+
+Usage:
+    python scripts/bench_health_keepalive.py [--clients 4] [--requests 2000] [--interval-ms 0]
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.health_server import HealthCheckServer  # noqa: E402
+
+PATHS = ('/ping', '/health')
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def poll(port: int, requests: int, interval: float, keep_alive: bool, latencies: list):
+    """One polling client; appends each request's latency in seconds"""
+    conn = None
+    for i in range(requests):
+        start = time.perf_counter()
+        if conn is None:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        conn.request('GET', PATHS[i % len(PATHS)])
+        response = conn.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f'{PATHS[i % len(PATHS)]} returned {response.status}')
+        if not keep_alive or response.will_close:
+            conn.close()
+            conn = None
+        latencies.append(time.perf_counter() - start)
+        if interval:
+            time.sleep(interval)
+    if conn is not None:
+        conn.close()
+
+
+def run(port: int, clients: int, requests: int, interval: float, keep_alive: bool) -> dict:
+    latencies = []
+    threads = [
+        threading.Thread(target=poll, args=(port, requests, interval, keep_alive, latencies))
+        for _ in range(clients)
+    ]
+    cpu, wall = time.process_time(), time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+
+    latencies.sort()
+    total = len(latencies)
+    return {
+        'requests': total,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[int(total * 0.99) - 1] * 1000,
+        'cpu_us': cpu / total * 1e6,
+        'rps': total / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=2000, help='requests per client')
+    parser.add_argument('--interval-ms', type=float, default=0.0, help='pause between a client\'s polls')
+    args = parser.parse_args()
+
+    port = free_port()
+    server = HealthCheckServer(port=port)
+    server.start()
+    try:
+        interval = args.interval_ms / 1000
+        run(port, args.clients, 50, 0, True)  # Warm up
+        results = {
+            'new connection': run(port, args.clients, args.requests, interval, False),
+            'keep-alive': run(port, args.clients, args.requests, interval, True),
+        }
+    finally:
+        server.stop()
+
+    print(f'{args.clients} clients x {args.requests} requests ({", ".join(PATHS)})')
+    print(f'{"":16} {"p50 ms":>8} {"p99 ms":>8} {"CPU us/req":>11} {"req/s":>8}')
+    for name, r in results.items():
+        print(f'{name:16} {r["p50_ms"]:8.3f} {r["p99_ms"]:8.3f} {r["cpu_us"]:11.1f} {r["rps"]:8.0f}')
+    before, after = results['new connection'], results['keep-alive']
+    print(f'keep-alive saves {1 - after["p50_ms"] / before["p50_ms"]:.0%} median latency '
+          f'and {1 - after["cpu_us"] / before["cpu_us"]:.0%} CPU per request')
+
+
+if __name__ == '__main__':
+    main()
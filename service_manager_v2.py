@@ -23,6 +23,7 @@
 from core.health_server import HealthCheckServer
 from core.bridge_monitor import BridgeMonitor
 from core.project_manager import ProjectManager
+from core.scan_exclusions import DEFAULT_EXCLUDE_GLOBS
 from core.preferences import PreferencesManager
 
 # Optional: Dashboard manager (removed from release, kept for development)
@@ -95,7 +96,10 @@ def __init__(self, control_port: int = 5054, bridge_port: int = 5055, health_por
         self.server = TCPControlServer(port=control_port)
         self.health_server = HealthCheckServer(port=health_port, service_manager=self)
         self.notifier = NotificationManager()
-        self.project_manager = ProjectManager()
+        self.project_manager = ProjectManager(
+            watched_directories=lambda: self.preferences.get('watched_directories', []),
+            exclude_globs=lambda: self.preferences.get('scan_exclude_globs', DEFAULT_EXCLUDE_GLOBS)
+        )
         self.dashboard = DashboardManager(self)  # Web dashboard
         self.monitor = None  # Bridge monitor (created after initialization)
         self.tray = None
@@ -126,12 +130,14 @@ def __init__(self, control_port: int = 5054, bridge_port: int = 5055, health_por
     def _on_bridge_crash(self):
         """Called when bridge crashes"""
         logger.error('🔥 Bridge crashed')
+        self.health_server.bridge_event('crashed')
         # Skip notification to avoid win10toast errors
         # self.notifier.notify('HighlightAssist', '⚠️  Bridge crashed - attempting recovery...')
     
     def _on_bridge_recovery(self):
         """Called when bridge recovers"""
         logger.info('✅ Bridge recovered successfully')
+        self.health_server.bridge_event('recovered')
         # Skip notification to avoid win10toast errors
         # self.notifier.notify('HighlightAssist', '✅ Bridge recovered successfully')
     
@@ -187,6 +193,12 @@ def _delayed_shutdown(self):
     def run(self):
         """Start service manager (blocks until interrupted)."""
         try:
+            # Start shared server discovery (health server, dashboard and tray read its snapshot)
+            self.project_manager.start_discovery(lambda: self.preferences.get('scan_interval', 60))
+            
+            # Keep the project catalog live as projects appear/change on disk
+            self.project_manager.start_watching()
+            
             # Start health check server first
             self.health_server.start()
             
@@ -261,6 +273,14 @@ def shutdown(self):
         except Exception as e:
             logger.error(f'Error stopping monitor: {e}')
         
+        try:
+            # Stop server discovery and the project watcher
+            self.project_manager.stop_discovery()
+            self.project_manager.stop_watching()
+            self.project_manager.flush()
+        except Exception as e:
+            logger.error(f'Error stopping project manager services: {e}')
+        
         try:
             # Stop health server
             if self.health_server:
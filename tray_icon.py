@@ -6,6 +6,9 @@
 from pathlib import Path
 from typing import Optional
 
+from core.listeners import listening_ports
+from core.project_rules import detect_project
+
 try:
     import pystray
     from PIL import Image, ImageDraw, ImageFont
@@ -141,11 +144,19 @@ def create_menu(self) -> pystray.Menu:
             )
         )
     
+    def _on_server_event(self, event):
+        """Server up/down from discovery - refresh the servers menu"""
+        if self.icon:
+            self.icon.update_menu()
+    
+    def _wake_discovery(self):
+        """Ask server discovery to refresh early (e.g. after starting/stopping a server)"""
+        if self.service_manager and hasattr(self.service_manager, 'project_manager'):
+            self.service_manager.project_manager.discovery.wake()
+    
     def _build_servers_menu(self) -> list:
         """Build unified servers menu with start/stop for all projects and running servers"""
         try:
-            import socket
-            
             items = []
             
             # === SECTION 1: RUNNING SERVERS (with stop option) ===
@@ -174,36 +185,23 @@ def _build_servers_menu(self) -> list:
                     'managed': True
                 }
             
-            # Scan for external servers with longer timeout (try both IPv4 and IPv6)
+            # Read the shared discovery snapshot (servers attributed to projects
+            # by owning process); probe directly only without a project manager
+            if self.service_manager and hasattr(self.service_manager, 'project_manager'):
+                discovered = {s['port']: s for s in self.service_manager.project_manager.get_detected_servers()}
+            else:
+                discovered = {
+                    port: {'name': f"Server on :{port}", 'path': None}
+                    for port in listening_ports(set(common_ports) | set(detected_servers))
+                }
+            
             def is_port_open(p):
-                # Try IPv4 first
-                try:
-                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                        s.settimeout(0.5)  # Increased from 0.2s
-                        result = s.connect_ex(('127.0.0.1', p))
-                        if result == 0:
-                            return True
-                except:
-                    pass
-                
-                # Try IPv6 if IPv4 failed
-                try:
-                    with socket.socket(socket.AF_INET6, socket.SOCK_STREAM) as s:
-                        s.settimeout(0.5)
-                        result = s.connect_ex(('::1', p))
-                        return result == 0
-                except:
-                    return False
+                return p in discovered
             
-            for port in common_ports:
-                if port not in detected_servers and is_port_open(port):
-                    # Found external server - try to match to project
-                    server_name = f"Server on :{port}"
-                    if self.service_manager and hasattr(self.service_manager, 'project_manager'):
-                        for project in self.service_manager.project_manager.projects:
-                            if project.get('dev_port') == port:
-                                server_name = project.get('name', server_name)
-                                break
+            for port in sorted(discovered):
+                if port not in detected_servers:
+                    # Found external server - named after its project when known
+                    server_name = discovered[port]['name']
                     
                     detected_servers[port] = {
                         'name': server_name,
@@ -227,6 +225,7 @@ def is_port_open(p):
                     elif managed:
                         self.running_servers[port]['status'] = 'starting'
                         status_icon = '🟡'  # Yellow circle
+                        self._wake_discovery()  # Pick it up as soon as it binds
                     else:
                         status_icon = '🟢'  # Green circle for external servers
                     
@@ -247,8 +246,13 @@ def make_open_handler(p):
             if self.service_manager and hasattr(self.service_manager, 'project_manager'):
                 projects = self.service_manager.project_manager.projects[:10]
                 
-                # Filter out projects that are already running
-                stopped_projects = [p for p in projects if p.get('dev_port') and p.get('dev_port') not in detected_servers]
+                # Filter out projects that are already running (by owning process, so
+                # two projects configured for the same port are told apart)
+                running_paths = {s['path'] for s in discovered.values() if s['path']}
+                stopped_projects = [
+                    p for p in projects
+                    if p.get('dev_port') and p.get('path') not in running_paths and p.get('dev_port') not in self.running_servers
+                ]
                 
                 if stopped_projects:
                     items.append(pystray.MenuItem('═══ START SERVER ═══', lambda i, it: None, enabled=False))
@@ -315,23 +319,11 @@ def _on_scan_all_ports(self, icon, item):
             
             def comprehensive_scan():
                 try:
-                    import socket
                     import logging
                     logger = logging.getLogger(__name__)
                     
-                    found_servers = []
-                    
-                    # Scan comprehensive range
-                    for port in range(3000, 9001):
-                        try:
-                            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                                s.settimeout(0.3)  # Faster timeout for bulk scan
-                                result = s.connect_ex(('localhost', port))
-                                if result == 0:
-                                    found_servers.append(port)
-                                    logger.info(f'Found server on port {port}')
-                        except Exception as e:
-                            pass  # Ignore individual port errors
+                    # Scan comprehensive range (one /proc read on Linux, concurrent probes elsewhere)
+                    found_servers = listening_ports(range(3000, 9001))
                     
                     if found_servers:
                         ports_str = ', '.join([f':{p}' for p in found_servers])
@@ -507,6 +499,7 @@ def _on_stop_server(self, port: int, name: str):
                 
                 # Remove from tracking
                 del self.running_servers[port]
+                self._wake_discovery()
                 
                 self.notifier.notify('HighlightAssist', f'{name} stopped')
                 logger.info(f'{name} stopped successfully')
@@ -556,7 +549,6 @@ def _on_open_project(self, project: dict):
             import subprocess
             import webbrowser
             import threading
-            import json
             import logging
             from pathlib import Path
             
@@ -601,41 +593,44 @@ def start_server():
                 try:
                     project_path = Path(path)
                     
-                    # Read package.json to find dev script
-                    package_json = project_path / 'package.json'
-                    if not package_json.exists():
-                        logger.error(f'No package.json found in {path}')
-                        self.notifier.notify('HighlightAssist', f'Error: No package.json in {name}')
-                        return
-                    
-                    with open(package_json, 'r', encoding='utf-8') as f:
-                        pkg = json.load(f)
-                    
-                    scripts = pkg.get('scripts', {})
-                    
-                    # Find the right script (prefer 'dev', fallback to 'start')
-                    dev_script = None
-                    if 'dev' in scripts:
-                        dev_script = 'dev'
-                    elif 'start' in scripts:
-                        dev_script = 'start'
-                    else:
-                        logger.error(f'No dev/start script in {name}')
-                        self.notifier.notify('HighlightAssist', f'Error: No dev script in {name}')
+                    # Same rule table as the scanner and the bridge's auto-detect
+                    detection = detect_project(project_path)
+                    if detection.rule is None:
+                        logger.error(f'No package.json, manage.py or app.py found in {path}')
+                        self.notifier.notify('HighlightAssist', f'Error: No project found in {name}')
                         return
                     
-                    # Check for package manager (prefer npm, then yarn, then pnpm)
-                    package_manager = 'npm'
-                    if (project_path / 'yarn.lock').exists():
-                        package_manager = 'yarn'
-                    elif (project_path / 'pnpm-lock.yaml').exists():
-                        package_manager = 'pnpm'
-                    
-                    # Build command
-                    if package_manager == 'yarn':
-                        cmd = ['yarn', dev_script]
+                    if not detection.is_node:
+                        # Python project: the rule's start command (venv interpreter if present)
+                        cmd = detection.command.split()
                     else:
-                        cmd = [package_manager, 'run', dev_script]
+                        manifest = detection.manifest
+                        if manifest.error:
+                            logger.error(f'Invalid package.json in {path}: {manifest.error}')
+                            self.notifier.notify('HighlightAssist', f'Error: Invalid package.json in {name}')
+                            return
+                        
+                        scripts = manifest.scripts
+                        
+                        # Find the right script (prefer 'dev', fallback to 'start')
+                        dev_script = None
+                        if 'dev' in scripts:
+                            dev_script = 'dev'
+                        elif 'start' in scripts:
+                            dev_script = 'start'
+                        else:
+                            logger.error(f'No dev/start script in {name}')
+                            self.notifier.notify('HighlightAssist', f'Error: No dev script in {name}')
+                            return
+                        
+                        # Package manager from the lockfile (yarn, then pnpm, else npm)
+                        package_manager = detection.package_manager
+                        
+                        # Build command
+                        if package_manager == 'yarn':
+                            cmd = ['yarn', dev_script]
+                        else:
+                            cmd = [package_manager, 'run', dev_script]
                     
                     logger.info(f'Starting {name} with: {" ".join(cmd)} in {path}')
                     self.notifier.notify('HighlightAssist', f'Starting {name}...')
@@ -918,6 +913,10 @@ def run(self):
             menu=self.create_menu()
         )
         
+        # Rebuild the menu the moment a dev server starts or stops
+        if self.service_manager and hasattr(self.service_manager, 'project_manager'):
+            self.service_manager.project_manager.discovery.subscribe(self._on_server_event)
+        
         self._running = True
         status = "Bridge running" if self.bridge.is_running else "Bridge stopped"
         print(f"System tray icon started - {status}")
@@ -16,6 +16,8 @@
 import socket
 import time
 
+from core.listeners import listening_ports
+
 # Optional dependencies - graceful degradation
 try:
     import psutil
@@ -247,29 +249,21 @@ def _get_auto_start_status(self) -> bool:
     
     def _get_running_servers(self) -> List[dict]:
         """Get list of running dev servers"""
-        servers = []
-        common_ports = [3000, 3001, 3002, 4200, 5000, 5173, 8000, 8080, 9000]
-        
-        for port in common_ports:
-            if self._is_port_open(port):
-                server_info = {
-                    "port": port,
-                    "name": f"Server on :{port}",
-                    "url": f"http://localhost:{port}",
-                    "status": "running"
-                }
-                
-                # Try to match to known project
-                if project_manager:
-                    for project in project_manager.projects:
-                        if project.get('dev_port') == port:
-                            server_info['name'] = project.get('name', server_info['name'])
-                            server_info['path'] = project.get('path', '')
-                            break
-                
-                servers.append(server_info)
+        # Read the shared discovery snapshot - no probing per request
+        if project_manager:
+            return project_manager.get_detected_servers()
         
-        return servers
+        common_ports = [3000, 3001, 3002, 4200, 5000, 5173, 8000, 8080, 9000]
+        return [
+            {
+                "port": port,
+                "name": f"Server on :{port}",
+                "url": f"http://localhost:{port}",
+                "status": "running",
+                "pid": None
+            }
+            for port in listening_ports(common_ports)
+        ]
     
     def _get_recent_projects(self) -> List[dict]:
         """Get recent projects"""
@@ -277,25 +271,6 @@ def _get_recent_projects(self) -> List[dict]:
             return project_manager.projects[:10]
         return []
     
-    def _is_port_open(self, port: int) -> bool:
-        """Check if port is open (IPv4 or IPv6)"""
-        # Try IPv4
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(0.3)
-                if s.connect_ex(('127.0.0.1', port)) == 0:
-                    return True
-        except:
-            pass
-        
-        # Try IPv6
-        try:
-            with socket.socket(socket.AF_INET6, socket.SOCK_STREAM) as s:
-                s.settimeout(0.3)
-                return s.connect_ex(('::1', port)) == 0
-        except:
-            return False
-    
     async def start(self):
         """Start the dashboard server (or skip if already running)"""
         # Find available port (may return None if dashboard already running)
@@ -373,15 +348,24 @@ async def toggle_autostart(request: Request):
     
     return JSONResponse({"success": False, "message": "Service manager not available"}, status_code=500)
 
+@app.get("/api/projects/search")
+async def search_projects(q: str = "", limit: int = 20):
+    """Fuzzy project search (search-as-you-type)"""
+    if project_manager:
+        projects = project_manager.search_projects(q, max(1, min(limit, 200)))
+        return JSONResponse({"query": q, "projects": projects, "total": len(projects)})
+    
+    return JSONResponse({"success": False, "message": "Project manager not available"}, status_code=500)
+
 @app.post("/api/project/start/{port}")
 async def start_project(port: int):
     """Start a project on given port"""
     if project_manager:
-        # Find project by port
-        for project in project_manager.projects:
-            if project.get('dev_port') == port:
-                # This would trigger the project start logic
-                return JSONResponse({"success": True, "message": f"Starting {project.get('name')}"})
+        # Find project by port (indexed lookup over every known project)
+        matches = project_manager.find_projects(dev_port=port)
+        if matches:
+            # This would trigger the project start logic
+            return JSONResponse({"success": True, "message": f"Starting {matches[0].get('name')}"})
         
         return JSONResponse({"success": False, "message": "Project not found"}, status_code=404)
     